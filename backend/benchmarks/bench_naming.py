@@ -0,0 +1,54 @@
+"""
+Benchmark: shot-list filename generation.
+
+Generates and validates pulls filenames (with handle-widened frame ranges) for a synthetic
+shot list, end to end from CSV and NDJSON files and for in-memory rows, in one process and
+on a process pool.
+
+Usage: python benchmarks/bench_naming.py [--shots 200000] [--workers N]
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shots", type=int, default=200000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    import orjson
+    from services.naming import read_shot_list, write_names
+    from services.warmup import synthetic_spec
+
+    rows = [{"showId": "AAA", "episode": f"{101 + i // 20000}", "sequence": f"{i // 500:03d}", "shotId": f"{i % 500 * 10:04d}",
+             "plate": "PL", "identifier": "01", "version": f"v{i % 7 + 1:03d}", "frameIn": 1001, "frameOut": 1001 + i % 240}
+            for i in range(args.shots)]
+    spec = synthetic_spec()
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path, ndjson_path = Path(directory, "shots.csv"), Path(directory, "shots.ndjson")
+        with csv_path.open("w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        ndjson_path.write_bytes(b"\n".join(orjson.dumps(row) for row in rows))
+
+        print(f"{'source':<28} {'workers':>7} {'names/s':>12}")
+        for label, source in (("in-memory rows", lambda: rows),
+                              ("CSV file -> NDJSON out", lambda: read_shot_list(csv_path)),
+                              ("NDJSON file -> NDJSON out", lambda: read_shot_list(ndjson_path))):
+            for workers in sorted({1, args.workers}):
+                started = time.perf_counter()
+                write_names(spec, "vfxPulls", source(), io.BytesIO(), as_json=True, workers=workers)
+                print(f"{label:<28} {workers:>7} {args.shots / (time.perf_counter() - started):>12,.0f}")
+
+if __name__ == "__main__":
+    main()
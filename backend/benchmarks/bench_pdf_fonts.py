@@ -0,0 +1,77 @@
+"""
+Benchmark: brand font cost in PDF exports.
+
+Measures parsing each TTF, then compares rendering the warm-up spec with the shared
+per-process fonts (with and without the subset cache) against parsing the fonts again
+for every export.
+
+Usage: python benchmarks/bench_pdf_fonts.py [--font-dir DIR] [--repeat 10]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def measure(action, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--font-dir", help="TTF directory (defaults to EXPORT_FONT_DIR / backend/fonts)")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    if args.font_dir:
+        os.environ["EXPORT_FONT_DIR"] = args.font_dir
+
+    from reportlab.pdfbase.ttfonts import TTFont
+    from constants import FONT_CONFIG
+    from services import fonts
+    from services.export_service import ExportService
+    from services.warmup import synthetic_spec
+
+    font_set = fonts.register_fonts()
+    if font_set == fonts.HELVETICA:
+        sys.exit(f"No {FONT_CONFIG['family']} fonts in {fonts.font_directory()} - pass --font-dir")
+
+    loaded = fonts.font_stats()["fonts"]
+    print(f"{'face':<24} {'parse (ms)':>10}")
+    for name, info in loaded.items():
+        print(f"{name:<24} {measure(lambda: TTFont(name, info['path']), args.repeat) * 1000:>10.1f}")
+
+    service = ExportService()
+    document = service.normalize(synthetic_spec())
+    render = lambda: service.render_pdf(document)
+    render()
+
+    faces = [fonts._parsed[info["path"]].face for info in loaded.values()]
+    caches = [face.makeSubset for face in faces]
+    shared = measure(render, args.repeat)
+
+    for face, cache in zip(faces, caches):
+        face.makeSubset = cache._make_subset
+    uncached = measure(render, args.repeat)
+
+    def parse_per_export():
+        for name, info in loaded.items():
+            fonts.pdfmetrics.registerFont(TTFont(name, info["path"]))
+        render()
+    per_export = measure(parse_per_export, args.repeat)
+
+    for face, cache in zip(faces, caches):
+        face.makeSubset = cache
+    print()
+    print(f"{'export path':<36} {'median (ms)':>11}")
+    print(f"{'shared fonts + subset cache':<36} {shared * 1000:>11.1f}")
+    print(f"{'shared fonts, no subset cache':<36} {uncached * 1000:>11.1f}")
+    print(f"{'fonts parsed per export':<36} {per_export * 1000:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: listing stored specs through the API response path.
+
+Compares the previous path (build VFXSpec models in the service, then let FastAPI
+re-validate them against response_model and encode with the stdlib JSON encoder)
+with the ORJSON fast path (raw Mongo documents serialized directly).
+
+Usage: python benchmarks/bench_spec_listing.py [--sizes 50 500] [--repeat 5]
+"""
+import argparse
+import asyncio
+import copy
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from models.vfx_spec import VFXSpec
+
+# A realistic stored document: full sections plus a ~40KB letterhead logo
+LOGO = {"dataUrl": "data:image/png;base64," + "iVBORw0KGgo" * 3600, "width": 256, "height": 128}
+
+def make_document() -> dict:
+    now = datetime.utcnow()
+    return VFXSpec(
+        id=str(uuid.uuid4()),
+        name="Benchmark Spec",
+        letterheadInfo={"userCompanyName": "Studio", "email": "vfx@studio.com", "logo": LOGO},
+        projectInfo={"projectTitle": "Benchmark", "client": "Client", "director": "Director", "vfxVendor": "Vendor"},
+        cameraFormats=[{"id": i, "cameraId": f"Camera {i}", "sourceCamera": "Arri Alexa 35", "codec": "Arri Raw (HDE)"}
+                       for i in range(1, 5)],
+        vfxPulls={"fileFormat": "OpenEXR (.exr)", "compression": "PIZ", "frameHandles": 8, "framePadding": "####"},
+        mediaReview={"container": "mov", "videoCodec": "ProRes 422 HQ"},
+        vfxDeliveries={"showId": "SHOW", "task": "comp", "version": "v001"},
+        createdAt=now,
+        updatedAt=now
+    ).model_dump()
+
+async def previous_path(documents: List[dict]) -> bytes:
+    specs = [VFXSpec(**copy.copy(document)) for document in documents]
+    field = create_response_field(name="response", type_=List[VFXSpec])
+    content = await serialize_response(field=field, response_content=specs)
+    return JSONResponse(content).body
+
+async def fast_path(documents: List[dict]) -> bytes:
+    return ORJSONResponse(documents).body
+
+async def measure(path, documents: List[dict], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await path(documents)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'specs':>6} {'previous (ms)':>14} {'orjson (ms)':>12} {'speedup':>8}")
+    for size in args.sizes:
+        documents = [make_document() for _ in range(size)]
+        previous = await measure(previous_path, documents, args.repeat)
+        fast = await measure(fast_path, documents, args.repeat)
+        print(f"{size:>6} {previous * 1000:>14.1f} {fast * 1000:>12.1f} {previous / fast:>7.1f}x")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,328 @@
+import os
+import sys
+import asyncio
+import json
+from pathlib import Path
+from typing import List, Optional
+import typer
+from dotenv import load_dotenv
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Configuration
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+app = typer.Typer(help="VFX Specs Exchange command-line tools (run from backend/: python cli.py --help)")
+
+@app.callback()
+def main():
+    """VFX Specs Exchange command-line tools"""
+
+def _database():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    return client, client[os.environ['DB_NAME']]
+
+@app.command("revalidate-templates")
+def revalidate_templates(
+    batch_size: int = typer.Option(200, min=1, help="Templates fetched from MongoDB per round trip"),
+    json_output: bool = typer.Option(False, "--json", help="Print failures as JSON lines")
+):
+    """Validate every stored template against the spec schema and report the ones that fail."""
+    from services.template_inheritance import revalidate_templates as scan
+
+    async def run():
+        client, db = _database()
+        checked, failures = 0, []
+        try:
+            async for template, errors in scan(db.templates, batch_size):
+                checked += 1
+                if errors:
+                    failures.append((template, errors))
+                    if json_output:
+                        typer.echo(json.dumps({"id": template['id'], "name": template.get('name'), "errors": errors}))
+                    else:
+                        typer.secho(f"FAIL {template['id']} ({template.get('name')})", fg=typer.colors.RED)
+                        for error in errors:
+                            typer.echo(f"     {error}")
+                if checked % batch_size == 0 and not json_output:
+                    typer.echo(f"... {checked} templates checked", err=True)
+        finally:
+            client.close()
+        return checked, failures
+
+    checked, failures = asyncio.run(run())
+    if not json_output:
+        typer.echo(f"{checked} templates checked, {len(failures)} invalid")
+    raise typer.Exit(1 if failures else 0)
+
+@app.command("export")
+def export(
+    sources: List[str] = typer.Argument(None, help="Spec JSON files, directories of them or glob patterns"),
+    mongo: bool = typer.Option(False, "--mongo", help="Export specs stored in MongoDB instead of files"),
+    query: str = typer.Option("{}", "--filter", help="MongoDB query selecting the specs to export (with --mongo)"),
+    limit: int = typer.Option(0, min=0, help="Export at most this many stored specs (with --mongo, 0 = all)"),
+    formats: List[str] = typer.Option(["pdf", "docx"], "--format", "-f", help="Output format, repeatable"),
+    profile: Optional[str] = typer.Option(None, help="Export profile (defaults to the standard profile)"),
+    out: Path = typer.Option(Path("exports"), "--out", "-o", help="Output directory"),
+    workers: int = typer.Option(0, min=0, help="Render processes (0 = one per CPU core)"),
+    skip_existing: bool = typer.Option(False, "--skip-existing", help="Don't re-render specs whose content was already exported to the output directory"),
+    deterministic: Optional[bool] = typer.Option(None, "--deterministic/--no-deterministic",
+                                                 help="Date exports by the spec instead of the clock, for byte-identical "
+                                                      "output (defaults to EXPORT_DETERMINISTIC)"),
+    json_output: bool = typer.Option(False, "--json", help="Print per-spec results and the summary as JSON lines")
+):
+    """Render PDF/DOCX exports for many specs at once across all CPU cores."""
+    from services.export_pool import ExportPool
+    from services.export_service import ExportService, deterministic_from_env
+    from services.batch_export import BatchExporter, expand_sources, read_spec_documents, read_spec_files
+
+    if mongo == bool(sources):
+        raise typer.BadParameter("Pass spec files/directories/globs or --mongo (but not both)")
+    try:
+        mongo_query = json.loads(query)
+    except ValueError as e:
+        raise typer.BadParameter(f"--filter is not valid JSON: {e}")
+
+    export_service = ExportService(deterministic=deterministic_from_env() if deterministic is None else deterministic)
+    export_pool = ExportPool(workers or None)
+    try:
+        exporter = BatchExporter(export_service, export_pool, out, formats, profile, overwrite=not skip_existing)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+    def report(source, paths, error):
+        if json_output:
+            typer.echo(json.dumps({"source": source, "files": [str(path) for path in paths], "error": error}))
+        elif error:
+            typer.secho(f"FAIL {source}: {error}", fg=typer.colors.RED)
+        else:
+            typer.echo(f"ok   {source} -> {', '.join(path.name for path in paths) or 'up to date'}")
+
+    async def run():
+        client = None
+        if mongo:
+            client, db = _database()
+            specs = read_spec_documents(db.vfx_specs, mongo_query, limit)
+        else:
+            specs = read_spec_files(expand_sources(sources))
+        try:
+            return await exporter.run(specs, report)
+        finally:
+            if client:
+                client.close()
+
+    export_pool.start()
+    try:
+        result = asyncio.run(run())
+    finally:
+        export_pool.shutdown()
+
+    summary = result.summary()
+    if json_output:
+        typer.echo(json.dumps({"summary": summary}))
+    else:
+        rate = f"{summary['specsPerSecond']} specs/s, {summary['megabytesPerSecond']} MB/s" if result.seconds else ""
+        typer.echo(f"{summary['specs']} specs exported ({summary['files']} files, {summary['bytes'] / 1e6:.1f} MB), "
+                   f"{summary['failed']} failed in {summary['seconds']}s with {export_pool.max_workers} workers"
+                   + (f" - {rate}" if rate else ""))
+    raise typer.Exit(1 if result.failures else 0)
+
+@app.command("watch")
+def watch(
+    directory: Path = typer.Argument(..., exists=True, file_okay=False, help="Directory pipeline tools drop spec JSON into"),
+    out: Path = typer.Option(None, "--out", "-o", help="Output directory (defaults to <directory>/exports)"),
+    formats: List[str] = typer.Option(None, "--format", "-f", help="Output format, repeatable (defaults to pdf)"),
+    profile: Optional[str] = typer.Option(None, help="Export profile (defaults to the standard profile)"),
+    workers: int = typer.Option(0, min=0, help="Render processes (0 = one per CPU core)"),
+    debounce: float = typer.Option(None, min=0, help="Seconds a file must stay unchanged before it is rendered"),
+    poll_interval: float = typer.Option(None, min=0.1, help="Seconds between directory scans when polling"),
+    polling: bool = typer.Option(False, "--polling", help="Poll even when inotify is available (e.g. network mounts)"),
+    deterministic: Optional[bool] = typer.Option(None, "--deterministic/--no-deterministic",
+                                                 help="Date exports by the spec instead of the clock, for byte-identical "
+                                                      "output (defaults to EXPORT_DETERMINISTIC)")
+):
+    """Render spec JSON files as they are dropped into (or change in) a directory, until interrupted."""
+    import logging
+    import signal
+    from constants import WATCH_CONFIG
+    from services.export_pool import ExportPool
+    from services.export_service import ExportService, deterministic_from_env
+    from services.watch_folder import WatchFolder
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    export_service = ExportService(deterministic=deterministic_from_env() if deterministic is None else deterministic)
+    export_pool = ExportPool(workers or None)
+
+    async def run():
+        try:
+            watcher = WatchFolder(
+                export_service, export_pool, directory, out or directory / "exports", formats, profile,
+                debounce=WATCH_CONFIG["debounce_seconds"] if debounce is None else debounce,
+                poll_interval=poll_interval or WATCH_CONFIG["poll_interval"], use_inotify=not polling)
+        except ValueError as e:
+            raise typer.BadParameter(str(e))
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, watcher.stop)
+        await watcher.run()
+        return watcher.stats
+
+    export_pool.start()
+    try:
+        stats = asyncio.run(run())
+    finally:
+        export_pool.shutdown()
+    typer.echo(f"Stopped: {stats['rendered']} rendered, {stats['unchanged']} unchanged, {stats['failed']} failed")
+
+def _load_spec(spec_file: Optional[Path], spec_id: Optional[str]) -> dict:
+    """Spec from a JSON file or, by id, from MongoDB"""
+    if bool(spec_file) == bool(spec_id):
+        raise typer.BadParameter("Pass --spec FILE or --spec-id ID")
+    if spec_file:
+        return json.loads(spec_file.read_text())
+
+    async def fetch():
+        client, db = _database()
+        try:
+            return await db.vfx_specs.find_one({"id": spec_id}, {"_id": 0})
+        finally:
+            client.close()
+
+    spec = asyncio.run(fetch())
+    if spec is None:
+        raise typer.BadParameter(f"VFX spec {spec_id} not found")
+    return spec
+
+@app.command("names")
+def names(
+    shot_list: Path = typer.Argument(..., exists=True, dir_okay=False, help="Shot list: CSV with a header row, or NDJSON (.ndjson/.jsonl)"),
+    spec_file: Optional[Path] = typer.Option(None, "--spec", exists=True, dir_okay=False, help="Spec JSON file"),
+    spec_id: Optional[str] = typer.Option(None, "--spec-id", help="Stored spec id (instead of --spec)"),
+    section: str = typer.Option("pulls", help="Naming convention: pulls or deliveries"),
+    json_output: bool = typer.Option(False, "--json", help="NDJSON results (filename, printf pattern, frame range, errors)"),
+    invalid_only: bool = typer.Option(False, "--invalid-only", help="Only print rows that fail validation"),
+    workers: int = typer.Option(1, min=0, help="Processes generating names (0 = one per CPU core); pays off for large shot lists")
+):
+    """Generate and validate pulls/deliveries filenames for every shot in a shot list, streamed to stdout."""
+    from services.naming import read_shot_list, write_names
+
+    spec = _load_spec(spec_file, spec_id)
+    try:
+        _, invalid = write_names(spec, {"pulls": "vfxPulls", "deliveries": "vfxDeliveries"}.get(section, section),
+                                 read_shot_list(shot_list), sys.stdout.buffer, json_output, invalid_only,
+                                 workers or os.cpu_count() or 1)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    sys.stdout.buffer.flush()
+    if invalid:
+        typer.echo(f"{invalid} invalid rows", err=True)
+    raise typer.Exit(1 if invalid else 0)
+
+@app.command("check-names")
+def check_names(
+    directories: List[Path] = typer.Argument(None, help="Directories of delivered files, scanned recursively"),
+    file_list: Optional[Path] = typer.Option(None, "--list", help="Text file with one delivered path per line ('-' reads stdin)"),
+    spec_file: Optional[Path] = typer.Option(None, "--spec", exists=True, dir_okay=False, help="Spec JSON file"),
+    spec_id: Optional[str] = typer.Option(None, "--spec-id", help="Stored spec id (instead of --spec)"),
+    section: str = typer.Option("deliveries", help="Naming convention: deliveries or pulls"),
+    extension: Optional[str] = typer.Option(None, help="Expected file extension (defaults to the spec's pulls file format)"),
+    workers: int = typer.Option(None, min=1, help="Threads listing directories (defaults to NAME_CONFORMANCE_CONFIG)"),
+    json_output: bool = typer.Option(False, "--json", help="Print mismatches and sequences as JSON lines"),
+    report_file: Optional[Path] = typer.Option(None, "--report", help="Also write the full report as JSON")
+):
+    """Check delivered filenames against a spec's naming convention and find gaps in frame sequences."""
+    from constants import NAME_CONFORMANCE_CONFIG
+    from services.name_conformance import ConformanceCheck, FilenameParser, group_paths, scan_tree
+
+    if not directories and not file_list:
+        raise typer.BadParameter("Pass directories to scan and/or --list FILE")
+    spec = _load_spec(spec_file, spec_id)
+    try:
+        check = ConformanceCheck(FilenameParser(spec, {"pulls": "vfxPulls", "deliveries": "vfxDeliveries"}.get(section, section),
+                                                extension))
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+    def batches():
+        for directory in directories or []:
+            yield from scan_tree(directory, workers or NAME_CONFORMANCE_CONFIG["scan_workers"])
+        if file_list:
+            with (sys.stdin if str(file_list) == '-' else file_list.open()) as f:
+                yield from group_paths(f)
+
+    for directory, names in batches():
+        for mismatch in check.check(directory, names):
+            if json_output:
+                typer.echo(json.dumps(mismatch))
+            else:
+                typer.echo(f"{mismatch['path']}\t{'; '.join(mismatch['errors'])}")
+
+    report = check.report()
+    for sequence in report["sequences"]:
+        if json_output:
+            typer.echo(json.dumps({"sequence": sequence}))
+        else:
+            line = f"{os.path.join(sequence['directory'], sequence['pattern'])} {sequence['first']}-{sequence['last']} ({sequence['frames']} frames)"
+            if sequence["missing"]:
+                gaps = ', '.join(f"{first}-{last}" if first != last else str(first) for first, last in sequence["gaps"])
+                line += f" MISSING {sequence['missing']}: {gaps}" + (" ..." if sequence["gapCount"] > len(sequence["gaps"]) else "")
+            typer.echo(line)
+    if report_file:
+        report_file.write_text(json.dumps(report, indent=2))
+    typer.echo(f"{report['checked']} files checked, {report['mismatched']} not matching the naming, "
+               f"{len(report['sequences'])} sequences ({report['incompleteSequences']} with missing frames)", err=True)
+    raise typer.Exit(1 if report["mismatched"] or report["incompleteSequences"] else 0)
+
+@app.command("scan-plates")
+def scan_plates(
+    paths: List[Path] = typer.Argument(..., exists=True, help="EXR/DPX files or directories of them (scanned recursively)"),
+    spec_file: Optional[Path] = typer.Option(None, "--spec", exists=True, dir_okay=False, help="Spec JSON file"),
+    spec_id: Optional[str] = typer.Option(None, "--spec-id", help="Stored spec id (instead of --spec)"),
+    workers: int = typer.Option(None, min=1, help="Threads reading headers (defaults to PLATE_SCAN_CONFIG)"),
+    pdf: Optional[Path] = typer.Option(None, "--pdf", help="Write the conformance report as PDF"),
+    profile: Optional[str] = typer.Option(None, help="Export profile for --pdf"),
+    json_output: bool = typer.Option(False, "--json", help="Print failing plates and the summary as JSON lines"),
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Only print the summary")
+):
+    """Check plate headers (EXR/DPX, no pixel decode) against a spec's pulls format, resolution,
+    compression, bit depth and color space."""
+    import time
+    from constants import PLATE_SCAN_CONFIG
+    from services.plate_scanner import PlateConformance, plate_files, scan_headers
+
+    spec = _load_spec(spec_file, spec_id)
+    workers = workers or PLATE_SCAN_CONFIG["workers"]
+    conformance = PlateConformance(spec)
+    started = time.perf_counter()
+    for header in scan_headers(plate_files(paths, workers), workers):
+        issues = conformance.add(header)
+        if issues and not quiet:
+            if json_output:
+                typer.echo(json.dumps({"path": header.path, "issues": [
+                    {"check": check, "expected": expected, "found": found} for check, expected, found in issues]}))
+            else:
+                typer.echo(f"{header.path}\t" + "; ".join(f"{check}: expected {expected}, found {found}"
+                                                         for check, expected, found in issues))
+    seconds = time.perf_counter() - started
+
+    summary = conformance.summary()
+    if json_output:
+        typer.echo(json.dumps({"summary": {**summary, "seconds": round(seconds, 3)}}))
+    else:
+        for issue in summary["issues"]:
+            typer.echo(f"{issue['files']:>8} x {issue['check']}: expected {issue['expected']}, found {issue['found']}", err=True)
+        typer.echo(f"{summary['scanned']} plates scanned in {seconds:.2f}s, {summary['failed']} not conforming", err=True)
+    if pdf:
+        from services.export_service import ExportService
+        try:
+            pdf.write_bytes(ExportService().render_report_pdf(conformance.report(seconds), profile))
+        except ValueError as e:
+            raise typer.BadParameter(str(e))
+        typer.echo(f"Report written to {pdf}", err=True)
+    raise typer.Exit(1 if summary["failed"] else 0)
+
+if __name__ == "__main__":
+    app()
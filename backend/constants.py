@@ -250,4 +250,260 @@ APP_CONFIG = {
     "target_logo_height": 128,
     "supported_image_formats": ["PNG", "JPEG", "JPG", "GIF", "WEBP"],
     "export_formats": ["PDF", "DOCX"]
-}
\ No newline at end of file
+}
+# Export profiles - selectable per export request
+# page_compression: Flate-compress PDF page streams
+# image_dpi: downsample logos to this resolution at their printed size (None keeps the upload as-is)
+# image_format: "JPEG" (DCT, lossy) or "PNG" (Flate, lossless) for embedded logos
+EXPORT_PROFILES = {
+    "screen": {
+        "description": "Small files for email distribution and on-screen review",
+        "page_compression": True,
+        "image_dpi": 96,
+        "image_format": "JPEG",
+        "jpeg_quality": 70
+    },
+    "print": {
+        "description": "Balanced output suitable for office printing",
+        "page_compression": True,
+        "image_dpi": 300,
+        "image_format": "JPEG",
+        "jpeg_quality": 90
+    },
+    "archive": {
+        "description": "Lossless output for contractual archiving",
+        "page_compression": True,
+        "image_dpi": None,
+        "image_format": "PNG",
+        "jpeg_quality": None
+    }
+}
+
+DEFAULT_EXPORT_PROFILE = "print"
+
+# HTTP compression (see middleware/compression.py)
+# encodings: server preference order; br and zstd are used only when brotli/zstandard are installed
+# content_types: compressible response types (prefix match) - PDFs, DOCX and ZIP bundles are
+#   already compressed containers and are never recompressed
+# route_levels: per path-prefix levels, first match wins
+# max_request_body: cap on decompressed request bodies (guards against decompression bombs)
+# offload_size: response bodies (or streamed chunks) at least this large are compressed on a worker
+#   thread instead of the event loop
+COMPRESSION_CONFIG = {
+    "minimum_size": 1024,
+    "encodings": ["zstd", "br", "gzip"],
+    "content_types": ["application/json", "application/x-ndjson", "text/", "application/javascript", "image/svg+xml"],
+    "default_levels": {"gzip": 6, "br": 5, "zstd": 3},
+    "route_levels": {
+        # Templates and spec lists are repetitive text served to every form load - worth the extra CPU
+        "/api/templates": {"gzip": 9, "br": 9, "zstd": 12},
+        "/api/vfx-specs": {"gzip": 6, "br": 7, "zstd": 6}
+    },
+    "max_request_body": 32 * 1024 * 1024,
+    "offload_size": 16 * 1024
+}
+
+# Read caches in VFXSpecService (see services/cache.py)
+# ttl: seconds an entry may be served before it is re-read from Mongo
+# poll_interval: seconds between change checks when Mongo change streams are unavailable
+CACHE_CONFIG = {
+    "specs": {"max_size": 512, "ttl": 60},
+    "templates": {"max_size": 256, "ttl": 300},
+    "poll_interval": 5
+}
+
+# Spec search (GET /api/vfx-specs/search)
+# SEARCH_TEXT_FIELDS: fields in the text index, with their relevance weights
+# SEARCH_FACETS: facet name (query parameter) -> document path of an enumerated field
+SEARCH_TEXT_FIELDS = {
+    "projectInfo.projectTitle": 10,
+    "projectInfo.projectCodeName": 8,
+    "projectInfo.client": 5,
+    "projectInfo.vfxVendor": 5,
+    "projectInfo.additionalNotes": 1
+}
+
+SEARCH_FACETS = {
+    "projectFormat": "projectInfo.projectFormat",
+    "projectFrameRate": "projectInfo.projectFrameRate",
+    "colorScience": "projectInfo.colorScience",
+    "sourceCamera": "cameraFormats.sourceCamera",
+    "codec": "cameraFormats.codec",
+    "fileFormat": "vfxPulls.fileFormat"
+}
+
+SEARCH_MAX_LIMIT = 200
+
+# Usage analytics (GET /api/analytics/usage)
+# ANALYTICS_DIMENSIONS: dimension name -> document path; "unwind" names the array the path lives in
+ANALYTICS_DIMENSIONS = {
+    "sourceCamera": {"path": "cameraFormats.sourceCamera", "unwind": "cameraFormats"},
+    "codec": {"path": "cameraFormats.codec", "unwind": "cameraFormats"},
+    "sensorMode": {"path": "cameraFormats.sensorMode", "unwind": "cameraFormats"},
+    "cameraColorSpace": {"path": "cameraFormats.colorSpace", "unwind": "cameraFormats"},
+    "colorScience": {"path": "projectInfo.colorScience"},
+    "projectFrameRate": {"path": "projectInfo.projectFrameRate"},
+    "projectFormat": {"path": "projectInfo.projectFormat"},
+    "pullFileFormat": {"path": "vfxPulls.fileFormat"},
+    "pullCompression": {"path": "vfxPulls.compression"},
+    "pullColorSpace": {"path": "vfxPulls.colorSpace"},
+    "reviewContainer": {"path": "mediaReview.container"},
+    "reviewVideoCodec": {"path": "mediaReview.videoCodec"},
+    "reviewColorSpace": {"path": "mediaReview.colorSpace"}
+}
+
+ANALYTICS_CONFIG = {
+    "cache_size": 64,
+    "cache_ttl": 30
+}
+
+# Spec revision history (see services/revision_service.py)
+# snapshot_every: store a full copy every N revisions so reconstruction applies at most N-1 diffs
+# max_revisions: revisions kept per spec (None = unlimited)
+# max_age_days: revisions older than this are pruned, the latest revision is always kept (None = forever)
+# keep_after_delete: keep a spec's history after the spec itself is deleted
+REVISION_CONFIG = {
+    "snapshot_every": 10,
+    "max_revisions": 200,
+    "max_age_days": None,
+    "keep_after_delete": True
+}
+
+# Template inheritance: deepest parent chain a template may have
+TEMPLATE_MAX_DEPTH = 16
+
+# Reproducible exports: in deterministic mode identical specs render to byte-identical PDF/DOCX files
+# deterministic: opt-in; date documents with the spec's own timestamp (updatedAt, then createdAt, then
+#   the project date) instead of the clock, labelled as the spec's date (EXPORT_DETERMINISTIC overrides)
+# fallback_timestamp: date for payloads carrying none of those; SOURCE_DATE_EPOCH overrides
+EXPORT_DETERMINISM = {
+    "deterministic": False,
+    "fallback_timestamp": "2000-01-01T00:00:00"
+}
+
+# Brand fonts for PDF exports (see services/fonts.py)
+# directory: where the TTFs live, relative to backend/ (EXPORT_FONT_DIR overrides); without the
+#   regular and bold faces PDFs fall back to Helvetica
+# subset_cache_size: embedded font subsets kept per face and reused by exports using the same characters
+FONT_CONFIG = {
+    "family": "Roboto",
+    "directory": "fonts",
+    "faces": {
+        "regular": "Roboto-Regular.ttf",
+        "bold": "Roboto-Bold.ttf",
+        "italic": "Roboto-Italic.ttf",
+        "bold_italic": "Roboto-BoldItalic.ttf"
+    },
+    "subset_cache_size": 64
+}
+
+# Readiness probe (GET /api/ready)
+# mongo_timeout: seconds to wait for a MongoDB ping before reporting not ready
+READINESS_CONFIG = {
+    "mongo_timeout": 2.0
+}
+
+# Batch exports (python cli.py export, see services/batch_export.py)
+# index_file: spec content hash -> output file of every export in an output directory, so
+#   --skip-existing recognizes specs already exported under an earlier (timestamped) name
+BATCH_EXPORT_CONFIG = {
+    "index_file": ".vfxspec-export-index.json"
+}
+
+# Watch-folder daemon (python cli.py watch, see services/watch_folder.py)
+# debounce_seconds: a spec file is rendered once its size and mtime stayed unchanged this long, so
+#   files still being written are never picked up half-way
+# poll_interval: seconds between directory scans when inotify isn't available
+# index_file / status_suffix: processed-content index and per-spec status sidecars in the output directory
+# index_save_interval: seconds between index writes while files are still being rendered (it is also
+#   written whenever the folder goes idle and on shutdown)
+WATCH_CONFIG = {
+    "debounce_seconds": 1.0,
+    "poll_interval": 2.0,
+    "formats": ["pdf"],
+    "index_file": ".vfxspec-watch-index.json",
+    "index_save_interval": 5.0,
+    "status_suffix": ".status.json"
+}
+
+# Pulls/deliveries file naming conventions (see services/naming.py)
+# parts: filename tokens joined by "_" in order; a token concatenates its fields (plate + identifier
+#   -> PL01); optional tokens that are empty are dropped along with their separator
+# defaults: values used by ExportService.generate_filename when a spec leaves a field empty
+# fixed: fields that must equal the spec's value in delivered filenames (the rest vary per shot)
+# NAMING_FIELD_PATTERNS: what each field may contain; "_" and "." separate tokens and are never allowed
+NAMING_CONVENTIONS = {
+    "vfxPulls": {
+        "parts": [["showId"], ["episode"], ["sequence"], ["scene"], ["shotId"], ["plate", "identifier"], ["version"]],
+        "optional": ["sequence", "scene", "identifier"],
+        "fixed": ["showId"],
+        "defaults": {"showId": "AAA", "episode": "101", "sequence": "001", "scene": "001", "shotId": "0010",
+                     "plate": "PL", "identifier": "01", "version": "v001"}
+    },
+    "vfxDeliveries": {
+        "parts": [["showId"], ["episode"], ["sequence"], ["scene"], ["shotId"], ["task"], ["vendorCodeName"], ["version"]],
+        "optional": ["sequence", "scene"],
+        "fixed": ["showId", "vendorCodeName"],
+        "defaults": {"showId": "AAA", "episode": "101", "sequence": "001", "scene": "001", "shotId": "0010",
+                     "task": "comp", "vendorCodeName": "VEND", "version": "v001"}
+    }
+}
+
+NAMING_FIELD_PATTERNS = {
+    "version": r"v\d{2,4}",
+    # Letters only, so a plate and its identifier can be told apart again (PL01 -> PL + 01)
+    "plate": r"[A-Za-z]+",
+    "default": r"[A-Za-z0-9-]+"
+}
+
+# Shot-list column aliases -> spec field names
+SHOT_LIST_COLUMNS = {
+    "show": "showId",
+    "shot": "shotId",
+    "vendor": "vendorCodeName",
+    "frame_in": "frameIn",
+    "cut_in": "frameIn",
+    "cutIn": "frameIn",
+    "frame_out": "frameOut",
+    "cut_out": "frameOut",
+    "cutOut": "frameOut"
+}
+
+# File extension by fileFormat substring (first match wins, exr otherwise)
+FILE_FORMAT_EXTENSIONS = [
+    (".exr", "exr"), (".tiff", "tiff"), (".png", "png"), (".jpg", "jpg"), (".dpx", "dpx"), (".cin", "cin")
+]
+
+# Delivered-filename checks (python cli.py check-names, see services/name_conformance.py)
+# scan_workers: threads listing directories in parallel
+# max_reported_gaps: missing frame ranges listed per sequence (all of them are counted)
+NAME_CONFORMANCE_CONFIG = {
+    "scan_workers": 16,
+    "max_reported_gaps": 50
+}
+
+# Plate header scanner (python cli.py scan-plates, see services/plate_scanner.py)
+# workers: threads reading headers (opening and mapping files is I/O bound, and slow on network storage)
+# max_header_bytes: give up on an EXR header that runs longer than this (corrupt or not an image)
+# max_issue_examples: files named per issue in the report (all of them are counted)
+PLATE_SCAN_CONFIG = {
+    "workers": 32,
+    "extensions": [".exr", ".dpx"],
+    "max_header_bytes": 1 << 20,
+    "max_issue_examples": 5
+}
+
+# Spec color space option -> primaries recorded in plate headers (EXR chromaticities, DPX colorimetric)
+PLATE_COLOR_PRIMARIES = {
+    "ACES2065-1": "ACES AP0",
+    "ACEScg": "ACES AP1",
+    "ACEScct": "ACES AP1",
+    "ACEScc": "ACES AP1",
+    "sRGB": "Rec. 709",
+    "Rec709": "Rec. 709",
+    "Rec. 709": "Rec. 709",
+    "Rec1886": "Rec. 709",
+    "Rec2020": "Rec. 2020",
+    "Rec. 2020": "Rec. 2020",
+    "P3-D65": "P3-D65"
+}
@@ -0,0 +1 @@
+# Middleware package for VFX Specs Exchange
\ No newline at end of file
@@ -0,0 +1,296 @@
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import zlib
+import logging
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Compressors: compress() buffers, flush() emits everything buffered so far as a decodable block
+# (for streamed chunks), finish() ends the stream
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+class _BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+class _ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+COMPRESSORS = {"gzip": _GzipCompressor}
+if brotli is not None:
+    COMPRESSORS["br"] = _BrotliCompressor
+if zstandard is not None:
+    COMPRESSORS["zstd"] = _ZstdCompressor
+
+class RequestBodyTooLarge(Exception):
+    pass
+
+def decompress_body(body: bytes, encoding: str, max_size: int) -> bytes:
+    """Decompress a request body, refusing to inflate past max_size bytes"""
+    if encoding == "gzip":
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        data = decompressor.decompress(body, max_size + 1)
+        if not decompressor.eof and len(data) <= max_size:
+            raise zlib.error("truncated gzip stream")
+    elif encoding in ("br", "zstd"):
+        # Neither has an output cap per call; feed small slices so an oversized body stops early
+        if encoding == "br":
+            decompressor = brotli.Decompressor()
+            process, finished = decompressor.process, decompressor.is_finished
+        else:
+            decompressor = zstandard.ZstdDecompressor().decompressobj()
+            process, finished = decompressor.decompress, lambda: decompressor.eof
+        data = b""
+        for start in range(0, len(body), 4096):
+            data += process(body[start:start + 4096])
+            if len(data) > max_size:
+                break
+        if not finished() and len(data) <= max_size:
+            raise ValueError(f"truncated {encoding} stream")
+    else:
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+    if len(data) > max_size:
+        raise RequestBodyTooLarge()
+    return data
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse Accept-Encoding into {encoding: q}"""
+    accepted = {}
+    for item in header.split(','):
+        parts = [part.strip() for part in item.split(';')]
+        if not parts[0]:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith('q='):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        accepted[parts[0].lower()] = q
+    return accepted
+
+class CompressionMiddleware:
+    """Negotiated gzip/Brotli/zstd response compression plus compressed request bodies.
+
+    Responses are compressed only when they are at least minimum_size bytes, their content type is
+    on the allowlist and they do not already carry a Content-Encoding. Levels can be tuned per route
+    prefix. Requests sent with Content-Encoding gzip/br/zstd are inflated before they reach the app.
+    """
+
+    def __init__(self, app: ASGIApp, config: Dict[str, Any]):
+        self.app = app
+        self.minimum_size = config["minimum_size"]
+        self.encodings = [encoding for encoding in config["encodings"] if encoding in COMPRESSORS]
+        missing = [encoding for encoding in config["encodings"] if encoding not in COMPRESSORS]
+        if missing:
+            logger.warning(f"Compression module missing for {', '.join(missing)} (pip install brotli zstandard); "
+                           f"these encodings are neither sent nor accepted")
+        self.content_types = tuple(config["content_types"])
+        self.default_levels = config["default_levels"]
+        self.route_levels = sorted(config["route_levels"].items(), key=lambda item: -len(item[0]))
+        self.max_request_body = config["max_request_body"]
+        self.offload_size = config["offload_size"]
+        logger.info(f"Response compression enabled: {', '.join(self.encodings)}")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        request_encoding = headers.get("content-encoding", "").strip().lower()
+        if request_encoding and request_encoding != "identity":
+            inflated = await self._inflate_request(scope, receive, send, request_encoding)
+            if inflated is None:
+                return
+            scope, receive = inflated
+
+        encoding = self._negotiate(headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self, encoding, self._level(scope["path"], encoding), send)
+        await self.app(scope, receive, responder.send)
+
+    def _negotiate(self, header: str) -> Optional[str]:
+        accepted = parse_accept_encoding(header)
+        for encoding in self.encodings:
+            if accepted.get(encoding, accepted.get("*", 0)) > 0:
+                return encoding
+        return None
+
+    def _level(self, path: str, encoding: str) -> int:
+        for prefix, levels in self.route_levels:
+            if path.startswith(prefix) and encoding in levels:
+                return levels[encoding]
+        return self.default_levels[encoding]
+
+    def compressible(self, headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").lower()
+        return content_type.startswith(self.content_types)
+
+    async def _inflate_request(self, scope: Scope, receive: Receive, send: Send,
+                               encoding: str) -> Optional[Tuple[Scope, Receive]]:
+        """Read and decompress the whole request body, or send 4xx and return None"""
+        if encoding not in COMPRESSORS:
+            await PlainTextResponse(f"Unsupported Content-Encoding: {encoding}", status_code=415)(scope, receive, send)
+            return None
+
+        chunks: List[bytes] = []
+        received = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            chunk = message.get("body", b"")
+            received += len(chunk)
+            if received > self.max_request_body:
+                await PlainTextResponse("Request body too large", status_code=413)(scope, receive, send)
+                return None
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+
+        try:
+            body = decompress_body(b"".join(chunks), encoding, self.max_request_body)
+        except RequestBodyTooLarge:
+            await PlainTextResponse("Request body too large", status_code=413)(scope, receive, send)
+            return None
+        except Exception as e:
+            logger.warning(f"Rejected {encoding} request body: {str(e)}")
+            await PlainTextResponse("Malformed compressed request body", status_code=400)(scope, receive, send)
+            return None
+
+        scope = {**scope, "headers": list(scope["headers"])}
+        request_headers = MutableHeaders(scope=scope)
+        del request_headers["content-encoding"]
+        request_headers["content-length"] = str(len(body))
+
+        delivered = False
+
+        async def inflated_receive() -> Message:
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return scope, inflated_receive
+
+class _CompressingResponder:
+    """Wraps send() for one response, deciding on compression from its start message and first body"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, level: int, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.level = level
+        self._send = send
+        self._start: Optional[Message] = None
+        self._compressor = None
+        self._passthrough = False
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._start is not None:
+            start, self._start = self._start, None
+            headers = MutableHeaders(raw=list(start["headers"]))
+            if not self.middleware.compressible(headers) or (not more_body and len(body) < self.middleware.minimum_size):
+                self._passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self._compressor = COMPRESSORS[self.encoding](self.level)
+            start = {**start, "headers": headers.raw}
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            # The compressed bytes are a different representation: a strong validator no longer holds
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            if not more_body:
+                compressed = await self._compress(body, True)
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+            # Streaming response: length is unknown up front
+            del headers["Content-Length"]
+            await self._send(start)
+
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        if not body and more_body:
+            return
+        data = await self._compress(body, not more_body)
+        if data or not more_body:
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _compress(self, body: bytes, last: bool) -> bytes:
+        # High levels on a large body take milliseconds of CPU: keep that off the event loop
+        if len(body) >= self.middleware.offload_size:
+            return await asyncio.to_thread(self._compress_sync, body, last)
+        return self._compress_sync(body, last)
+
+    def _compress_sync(self, body: bytes, last: bool) -> bytes:
+        # Streamed chunks (NDJSON progress, ...) are flushed so each reaches the client as it is sent
+        data = self._compressor.compress(body)
+        return data + (self._compressor.finish() if last else self._compressor.flush())
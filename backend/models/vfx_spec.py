@@ -3,6 +3,10 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import uuid
 
+def spec_field(label: str, group: str, default: Any = None) -> Any:
+    """Optional field with the label and document group used by the PDF/DOCX exporters"""
+    return Field(default, title=label, json_schema_extra={"group": group})
+
 class Logo(BaseModel):
     dataUrl: str
     width: int
@@ -16,78 +20,78 @@ class LetterheadInfo(BaseModel):
     logo: Optional[Logo] = None
 
 class ProjectInfo(BaseModel):
-    documentVersion: Optional[str] = "v1.0"
-    projectDate: Optional[str] = None
-    projectTitle: Optional[str] = None
-    projectCodeName: Optional[str] = None
-    projectFormat: Optional[str] = None
-    client: Optional[str] = None
-    clientLogo: Optional[Logo] = None
-    director: Optional[str] = None
-    dop: Optional[str] = None
-    productionCompany: Optional[str] = None
-    productionCompanyLogo: Optional[Logo] = None
-    postProductionSupervisor: Optional[str] = None
-    lab: Optional[str] = None
-    labLogo: Optional[Logo] = None
-    colorist: Optional[str] = None
-    vfxSupervisor: Optional[str] = None
-    vfxOnSetSupervisor: Optional[str] = None
-    vfxVendor: Optional[str] = None
-    vfxVendorLogo: Optional[Logo] = None
-    vendorCodeName: Optional[str] = None
-    vfxDocumentsLink: Optional[str] = None
-    projectFrameRate: Optional[str] = None
-    colorScience: Optional[str] = None
-    customColorScience: Optional[str] = None
+    documentVersion: Optional[str] = spec_field("Document Version", "basic", "v1.0")
+    projectDate: Optional[str] = spec_field("Project Date", "basic")
+    projectTitle: Optional[str] = spec_field("Project Title", "basic")
+    projectCodeName: Optional[str] = spec_field("Project Code Name", "basic")
+    projectFormat: Optional[str] = spec_field("Project Format", "basic")
+    client: Optional[str] = spec_field("Client", "client")
+    clientLogo: Optional[Logo] = spec_field("Client Logo", "client")
+    director: Optional[str] = spec_field("Director", "production")
+    dop: Optional[str] = spec_field("Director of Photography", "production")
+    productionCompany: Optional[str] = spec_field("Production Company", "production")
+    productionCompanyLogo: Optional[Logo] = spec_field("Production Company Logo", "production")
+    postProductionSupervisor: Optional[str] = spec_field("Post-Production Supervisor", "post")
+    lab: Optional[str] = spec_field("Lab", "post")
+    labLogo: Optional[Logo] = spec_field("Lab Logo", "post")
+    colorist: Optional[str] = spec_field("Colorist", "post")
+    vfxSupervisor: Optional[str] = spec_field("VFX Supervisor", "vfx")
+    vfxOnSetSupervisor: Optional[str] = spec_field("VFX On-Set Supervisor", "vfx")
+    vfxVendor: Optional[str] = spec_field("VFX Vendor", "vfx")
+    vfxVendorLogo: Optional[Logo] = spec_field("VFX Vendor Logo", "vfx")
+    vendorCodeName: Optional[str] = spec_field("Vendor Code Name", "vfx")
+    vfxDocumentsLink: Optional[str] = spec_field("VFX Documents Link", "links")
+    projectFrameRate: Optional[str] = spec_field("Project Frame Rate", "basic")
+    colorScience: Optional[str] = spec_field("Color Science", "basic")
+    customColorScience: Optional[str] = spec_field("Custom Color Science", "basic")
     additionalNotes: Optional[str] = None
 
 class CameraFormat(BaseModel):
     id: int
     cameraId: Optional[str] = None
-    sourceCamera: Optional[str] = None
-    codec: Optional[str] = None
-    sensorMode: Optional[str] = None
-    lensSqueezeeFactor: Optional[str] = None
-    colorSpace: Optional[str] = None
+    sourceCamera: Optional[str] = spec_field("Source Camera", "camera")
+    codec: Optional[str] = spec_field("Codec", "camera")
+    sensorMode: Optional[str] = spec_field("Sensor Mode", "camera")
+    lensSqueezeeFactor: Optional[str] = spec_field("Lens Squeeze Factor", "camera")
+    colorSpace: Optional[str] = spec_field("Color Space/Transfer Function", "camera")
 
 class VFXPulls(BaseModel):
-    fileFormat: Optional[str] = None
-    compression: Optional[str] = None
-    resolution: Optional[str] = None
-    colorSpace: Optional[str] = None
-    bitDepth: Optional[str] = None
-    frameHandles: Optional[int] = None
-    framePadding: Optional[str] = None
-    vfxLutsLink: Optional[str] = None
-    showId: Optional[str] = None
-    episode: Optional[str] = None
-    sequence: Optional[str] = None
-    scene: Optional[str] = None
-    shotId: Optional[str] = None
-    plate: Optional[str] = None
-    identifier: Optional[str] = None
-    version: Optional[str] = None
+    fileFormat: Optional[str] = spec_field("File Format", "technical")
+    compression: Optional[str] = spec_field("Compression", "technical")
+    resolution: Optional[str] = spec_field("Resolution", "technical")
+    colorSpace: Optional[str] = spec_field("Color Space", "technical")
+    bitDepth: Optional[str] = spec_field("Bit Depth", "technical")
+    frameHandles: Optional[int] = spec_field("Frame Handles", "technical")
+    framePadding: Optional[str] = spec_field("Frame Padding", "technical")
+    vfxLutsLink: Optional[str] = spec_field("VFX LUTs Link", "links")
+    showId: Optional[str] = spec_field("Show ID", "naming")
+    episode: Optional[str] = spec_field("Episode", "naming")
+    sequence: Optional[str] = spec_field("Sequence", "naming")
+    scene: Optional[str] = spec_field("Scene", "naming")
+    shotId: Optional[str] = spec_field("Shot ID", "naming")
+    plate: Optional[str] = spec_field("Plate", "naming")
+    identifier: Optional[str] = spec_field("Identifier", "naming")
+    version: Optional[str] = spec_field("Version", "naming")
 
 class MediaReview(BaseModel):
-    container: Optional[str] = None
-    videoCodec: Optional[str] = None
-    resolution: Optional[str] = None
-    aspectRatio: Optional[str] = None
-    letterboxing: Optional[str] = None
-    frameRate: Optional[str] = None
-    colorSpace: Optional[str] = None
-    slateOverlaysLink: Optional[str] = None
+    container: Optional[str] = spec_field("Container", "media")
+    videoCodec: Optional[str] = spec_field("Video Codec", "media")
+    resolution: Optional[str] = spec_field("Resolution", "media")
+    aspectRatio: Optional[str] = spec_field("Aspect Ratio", "media")
+    letterboxing: Optional[str] = spec_field("Letterboxing", "media")
+    frameRate: Optional[str] = spec_field("Frame Rate", "media")
+    colorSpace: Optional[str] = spec_field("Color Space", "media")
+    slateOverlaysLink: Optional[str] = spec_field("Slate & Overlays Link", "links")
 
 class VFXDeliveries(BaseModel):
-    showId: Optional[str] = None
-    episode: Optional[str] = None
-    sequence: Optional[str] = None
-    scene: Optional[str] = None
-    shotId: Optional[str] = None
-    task: Optional[str] = None
-    vendorCodeName: Optional[str] = None
-    version: Optional[str] = None
+    showId: Optional[str] = spec_field("Show ID", "deliveries")
+    episode: Optional[str] = spec_field("Episode", "deliveries")
+    sequence: Optional[str] = spec_field("Sequence", "deliveries")
+    scene: Optional[str] = spec_field("Scene", "deliveries")
+    shotId: Optional[str] = spec_field("Shot ID", "deliveries")
+    task: Optional[str] = spec_field("Task", "deliveries")
+    vendorCodeName: Optional[str] = spec_field("Vendor Code Name", "deliveries")
+    version: Optional[str] = spec_field("Version", "deliveries")
 
 class VFXSpec(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -98,6 +102,8 @@ class VFXSpec(BaseModel):
     vfxPulls: VFXPulls = Field(default_factory=VFXPulls)
     mediaReview: MediaReview = Field(default_factory=MediaReview)
     vfxDeliveries: VFXDeliveries = Field(default_factory=VFXDeliveries)
+    # Incremented by every update; numbers the spec's revision history
+    revision: int = 1
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
 
@@ -119,12 +125,43 @@ class VFXSpecUpdate(BaseModel):
     mediaReview: Optional[MediaReview] = None
     vfxDeliveries: Optional[VFXDeliveries] = None
 
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class SpecSearchResult(BaseModel):
+    results: List[VFXSpec]
+    total: int
+    facets: Dict[str, List[FacetCount]]
+
 class Template(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
+    # Only the overrides when the template extends a parent
     data: Dict[str, Any]
+    parentId: Optional[str] = None
+    version: int = 1
     createdAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
 
 class TemplateCreate(BaseModel):
     name: str
-    data: Dict[str, Any]
\ No newline at end of file
+    data: Dict[str, Any]
+    parentId: Optional[str] = None
+
+class TemplateUpdate(BaseModel):
+    name: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+    parentId: Optional[str] = None
+
+class MaterializedTemplate(BaseModel):
+    id: str
+    name: str
+    # Template ids from the root ancestor down to this template
+    chain: List[str]
+    data: Dict[str, Any]
+
+class ExportBundleRequest(BaseModel):
+    spec: Dict[str, Any]
+    formats: List[str] = Field(default_factory=lambda: ["pdf", "docx"])
+    profile: Optional[str] = None
@@ -3,25 +3,38 @@ import sys
 from pathlib import Path
 from typing import List, Optional
 from datetime import datetime
+import time
 
 # Add the backend directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from fastapi import FastAPI, APIRouter, HTTPException, File, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, APIRouter, HTTPException, File, UploadFile, Request, Query
+from fastapi.responses import StreamingResponse, Response, ORJSONResponse
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 import logging
 import io
 import base64
-from PIL import Image
+import zipfile
+import hashlib
+import asyncio
+import orjson
 
 # Import models and services
-from models.vfx_spec import VFXSpec, VFXSpecCreate, VFXSpecUpdate, Template, TemplateCreate
+from models.vfx_spec import VFXSpec, VFXSpecCreate, VFXSpecUpdate, Template, TemplateCreate, TemplateUpdate, MaterializedTemplate, ExportBundleRequest, SpecSearchResult
 from services.vfx_spec_service import VFXSpecService
-from services.export_service import ExportService
-from constants import DROPDOWN_OPTIONS
+from services.export_service import ExportService, SUPPORTED_FORMATS, deterministic_from_env
+from services.export_pool import ExportPool
+from services.artifact_store import ArtifactStore
+from services.prerender_service import PrerenderService
+from services.static_payload import StaticPayload
+from services.single_flight import SingleFlight, payload_digest
+from services.analytics_service import AnalyticsService
+from services.revision_service import RevisionService
+from services import spec_diff
+from middleware.compression import CompressionMiddleware
+from constants import DROPDOWN_OPTIONS, EXPORT_PROFILES, COMPRESSION_CONFIG, SEARCH_FACETS, SEARCH_MAX_LIMIT, ANALYTICS_DIMENSIONS, READINESS_CONFIG
 
 # Configuration
 ROOT_DIR = Path(__file__).parent
@@ -33,8 +46,21 @@ client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ['DB_NAME']]
 
 # Initialize services
-vfx_spec_service = VFXSpecService(db)
-export_service = ExportService()
+export_warmup = os.environ.get('EXPORT_WARMUP', 'true').lower() in ('1', 'true', 'yes')
+export_service = ExportService(deterministic=deterministic_from_env())
+export_pool = ExportPool(int(os.environ.get('EXPORT_WORKERS', 0)) or None, warm_up=export_warmup)
+prerender_service = PrerenderService(
+    export_service,
+    export_pool,
+    ArtifactStore(Path(os.environ.get('EXPORT_ARTIFACT_DIR', ROOT_DIR / 'export_artifacts'))),
+    enabled=os.environ.get('EXPORT_PRERENDER', 'false').lower() in ('1', 'true', 'yes')
+)
+revision_service = RevisionService(db)
+vfx_spec_service = VFXSpecService(db, prerender_service, revision_service)
+analytics_service = AnalyticsService(db)
+
+# Dropdown options never change at runtime: serialize, compress and hash them once
+dropdown_options_payload = StaticPayload(DROPDOWN_OPTIONS)
 
 # Create FastAPI app
 app = FastAPI(
@@ -55,11 +81,96 @@ async def create_vfx_spec(spec_data: VFXSpecCreate):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.post("/vfx-specs/from-template/{template_id}", response_model=VFXSpec)
+async def create_vfx_spec_from_template(template_id: str, overrides: Optional[dict] = None):
+    """Create a new VFX specification from a (materialized) template, with optional field overrides"""
+    try:
+        spec = await vfx_spec_service.create_spec_from_template(template_id, overrides)
+        if not spec:
+            raise HTTPException(status_code=404, detail="Template not found")
+        return spec
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @api_router.get("/vfx-specs", response_model=List[VFXSpec])
 async def get_all_vfx_specs(limit: int = 50):
     """Get all VFX specifications"""
     try:
-        return await vfx_spec_service.get_all_specs(limit)
+        # Stored documents are serialized directly - no model re-validation on the read path
+        return ORJSONResponse(await vfx_spec_service.get_all_spec_documents(limit))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _resolve_spec_ref(ref: str) -> dict:
+    """Load a spec by reference: "<id>" for the current version or "<id>@<revision>" for a past one"""
+    spec_id, _, revision = ref.partition('@')
+    if revision:
+        if not revision.isdigit():
+            raise HTTPException(status_code=400, detail=f"Invalid revision in '{ref}'")
+        spec_data = await revision_service.get_revision(spec_id, int(revision))
+    else:
+        spec_data = await vfx_spec_service.get_spec_document(spec_id)
+    if spec_data is None:
+        raise HTTPException(status_code=404, detail=f"VFX specification '{ref}' not found")
+    return spec_data
+
+def _describe_spec_ref(ref: str, spec_data: dict) -> str:
+    version = (spec_data.get('projectInfo') or {}).get('documentVersion')
+    return f"{version} ({ref})" if version else ref
+
+# Declared before /vfx-specs/{spec_id} so "diff" and "search" are not taken for an id
+@api_router.get("/vfx-specs/diff")
+async def diff_vfx_specs(a: str, b: str, format: str = Query("json", pattern="^(json|pdf)$"),
+                         profile: Optional[str] = None):
+    """Field-level changes from spec a to spec b (each "<id>" or "<id>@<revision>"), as JSON or a PDF summary"""
+    try:
+        export_profile = export_service.get_profile(profile)
+        started = time.perf_counter()
+        spec_a, spec_b = await asyncio.gather(_resolve_spec_ref(a), _resolve_spec_ref(b))
+        changes = spec_diff.diff_specs(spec_a, spec_b)
+        
+        if format == "pdf":
+            a_label, b_label = _describe_spec_ref(a, spec_a), _describe_spec_ref(b, spec_b)
+            project_title = (spec_b.get('projectInfo') or {}).get('projectTitle') or 'Untitled'
+            report = spec_diff.change_report(changes, a_label, b_label,
+                                             [("Project", project_title), ("From", a_label), ("To", b_label)])
+            if export_service.deterministic:
+                report.generated_at = max(export_service.timestamp(spec_a), export_service.timestamp(spec_b))
+                report.deterministic = True
+            content = await asyncio.to_thread(export_service.render_report_pdf, report, export_profile['name'])
+            filename = export_service.export_filename(spec_b, "pdf").replace("_VFX_Spec_", "_VFX_Spec_Changes_")
+            return Response(content=content, media_type="application/pdf",
+                            headers=_export_headers(filename, export_profile['name'], content, started))
+        
+        return ORJSONResponse({
+            "a": {"ref": a, "documentVersion": (spec_a.get('projectInfo') or {}).get('documentVersion')},
+            "b": {"ref": b, "documentVersion": (spec_b.get('projectInfo') or {}).get('documentVersion')},
+            "summary": spec_diff.summarize(changes),
+            "changes": changes
+        })
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@api_router.get("/vfx-specs/search", response_model=SpecSearchResult)
+async def search_vfx_specs(request: Request, q: Optional[str] = None,
+                           limit: int = Query(50, ge=1, le=SEARCH_MAX_LIMIT), skip: int = Query(0, ge=0)):
+    """Search specifications by text and facets.
+
+    Facet filters are repeatable query parameters named after SEARCH_FACETS, e.g.
+    ?q=nebula&sourceCamera=Arri%20Alexa%2035&codec=Arri%20Raw%20(HDE)
+    """
+    filters = {facet: request.query_params.getlist(facet) for facet in SEARCH_FACETS}
+    try:
+        return ORJSONResponse(await vfx_spec_service.search_specs(q, filters, limit, skip))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -67,10 +178,10 @@ async def get_all_vfx_specs(limit: int = 50):
 async def get_vfx_spec(spec_id: str):
     """Get a VFX specification by ID"""
     try:
-        spec = await vfx_spec_service.get_spec(spec_id)
+        spec = await vfx_spec_service.get_spec_document(spec_id)
         if not spec:
             raise HTTPException(status_code=404, detail="VFX specification not found")
-        return spec
+        return ORJSONResponse(spec)
     except HTTPException:
         raise
     except Exception as e:
@@ -102,12 +213,116 @@ async def delete_vfx_spec(spec_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/vfx-specs/{spec_id}/export.{export_format}")
+async def export_stored_vfx_spec(spec_id: str, export_format: str, profile: Optional[str] = None):
+    """Download a stored VFX specification, served from its pre-rendered artifact when up to date"""
+    try:
+        export_profile = export_service.get_profile(profile)
+        export_service.validate_formats([export_format])
+        started = time.perf_counter()
+        spec = await vfx_spec_service.get_spec(spec_id)
+        if not spec:
+            raise HTTPException(status_code=404, detail="VFX specification not found")
+        
+        content, prerendered = await prerender_service.get_or_render(spec, export_format, export_profile['name'])
+        headers = _export_headers(export_service.export_filename(spec.dict(), export_format), export_profile['name'], content, started)
+        headers["X-Export-Source"] = "prerendered" if prerendered else "on-demand"
+        return Response(content=content, media_type=EXPORT_MEDIA_TYPES[export_format], headers=headers)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Revision history endpoints
+@api_router.get("/vfx-specs/{spec_id}/revisions")
+async def get_vfx_spec_revisions(spec_id: str):
+    """List the revisions of a VFX specification, newest first"""
+    try:
+        revisions = await revision_service.list_revisions(spec_id)
+        if not revisions:
+            raise HTTPException(status_code=404, detail="No revisions found for this VFX specification")
+        return ORJSONResponse(revisions)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _get_revision_or_404(spec_id: str, revision: int) -> dict:
+    document = await revision_service.get_revision(spec_id, revision)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Revision not found")
+    return document
+
+@api_router.get("/vfx-specs/{spec_id}/revisions/{revision}", response_model=VFXSpec)
+async def get_vfx_spec_revision(spec_id: str, revision: int):
+    """Get a VFX specification as it was at a given revision"""
+    try:
+        return ORJSONResponse(await _get_revision_or_404(spec_id, revision))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/vfx-specs/{spec_id}/revisions/{revision}/export.{export_format}")
+async def export_vfx_spec_revision(spec_id: str, revision: int, export_format: str, profile: Optional[str] = None):
+    """Export a VFX specification as it was at a given revision"""
+    try:
+        export_profile = export_service.get_profile(profile)
+        export_service.validate_formats([export_format])
+        started = time.perf_counter()
+        spec_data = await _get_revision_or_404(spec_id, revision)
+        
+        content = (await _render_exports(spec_data, [export_format], export_profile['name']))[export_format]
+        headers = _export_headers(export_service.export_filename(spec_data, export_format), export_profile['name'], content, started)
+        headers["X-Spec-Revision"] = str(revision)
+        return Response(content=content, media_type=EXPORT_MEDIA_TYPES[export_format], headers=headers)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Template endpoints
 @api_router.post("/templates", response_model=Template)
 async def create_template(template_data: TemplateCreate):
     """Create a new template"""
     try:
         return await vfx_spec_service.create_template(template_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.put("/templates/{template_id}", response_model=Template)
+async def update_template(template_id: str, template_data: TemplateUpdate):
+    """Update a template (name, data overrides or parent template)"""
+    try:
+        template = await vfx_spec_service.update_template(template_id, template_data)
+        if not template:
+            raise HTTPException(status_code=404, detail="Template not found")
+        return template
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/templates/{template_id}/materialized", response_model=MaterializedTemplate)
+async def get_materialized_template(template_id: str):
+    """Get a template with its parent templates merged in"""
+    try:
+        template = await vfx_spec_service.materialize_template(template_id)
+        if not template:
+            raise HTTPException(status_code=404, detail="Template not found")
+        return ORJSONResponse(template)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -115,7 +330,7 @@ async def create_template(template_data: TemplateCreate):
 async def get_templates():
     """Get all templates"""
     try:
-        return await vfx_spec_service.get_templates()
+        return ORJSONResponse(await vfx_spec_service.get_template_documents())
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -123,10 +338,10 @@ async def get_templates():
 async def get_template(template_id: str):
     """Get a template by ID"""
     try:
-        template = await vfx_spec_service.get_template(template_id)
+        template = await vfx_spec_service.get_template_document(template_id)
         if not template:
             raise HTTPException(status_code=404, detail="Template not found")
-        return template
+        return ORJSONResponse(template)
     except HTTPException:
         raise
     except Exception as e:
@@ -142,43 +357,133 @@ async def delete_template(template_id: str):
         return {"message": "Template deleted successfully"}
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # Export endpoints
+EXPORT_MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+}
+
+# Identical exports requested at the same time (a shared link, a double click) share one render
+export_flight = SingleFlight()
+
+async def _render_exports(spec_data: dict, formats: List[str], profile: str) -> dict:
+    """Render a spec payload to the given formats on the worker pool, coalescing identical concurrent requests"""
+    async def render():
+        return await export_pool.render_many(export_service.normalize(spec_data), formats, profile)
+
+    return await export_flight.do((payload_digest(spec_data), tuple(formats), profile), render)
+
+def _export_headers(filename: str, profile: str, content: bytes, started: float) -> dict:
+    """Build download headers reporting the export profile, output size and render time"""
+    return {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "X-Export-Profile": profile,
+        "X-Export-Size": str(len(content)),
+        # Exports are reproducible, so equal content hashes mean equal documents
+        "ETag": f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"',
+        "X-Render-Time-Ms": f"{(time.perf_counter() - started) * 1000:.1f}"
+    }
+
+@api_router.get("/export/profiles")
+async def get_export_profiles():
+    """Get the available export profiles"""
+    return EXPORT_PROFILES
+
 @api_router.post("/export/pdf")
-async def export_to_pdf(spec_data: dict):
+async def export_to_pdf(spec_data: dict, profile: Optional[str] = None):
     """Export VFX specification to PDF"""
     try:
-        pdf_content = await export_service.export_to_pdf(spec_data)
+        export_profile = export_service.get_profile(profile)
+        started = time.perf_counter()
+        pdf_content = (await _render_exports(spec_data, ["pdf"], export_profile['name']))["pdf"]
         
-        # Create filename
-        project_title = spec_data.get('projectInfo', {}).get('projectTitle', 'VFX_Spec')
-        filename = f"{project_title.replace(' ', '_')}_VFX_Spec_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        filename = export_service.export_filename(spec_data, "pdf")
         
         return StreamingResponse(
             io.BytesIO(pdf_content),
             media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+            headers=_export_headers(filename, export_profile['name'], pdf_content, started)
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.post("/export/docx")
-async def export_to_docx(spec_data: dict):
+async def export_to_docx(spec_data: dict, profile: Optional[str] = None):
     """Export VFX specification to DOCX"""
     try:
-        docx_content = await export_service.export_to_docx(spec_data)
+        export_profile = export_service.get_profile(profile)
+        started = time.perf_counter()
+        docx_content = (await _render_exports(spec_data, ["docx"], export_profile['name']))["docx"]
         
-        # Create filename
-        project_title = spec_data.get('projectInfo', {}).get('projectTitle', 'VFX_Spec')
-        filename = f"{project_title.replace(' ', '_')}_VFX_Spec_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
+        filename = export_service.export_filename(spec_data, "docx")
         
         return StreamingResponse(
             io.BytesIO(docx_content),
             media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+            headers=_export_headers(filename, export_profile['name'], docx_content, started)
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.post("/export/bundle")
+async def export_bundle(bundle: ExportBundleRequest):
+    """Export one VFX specification to several formats at once, rendered in parallel and returned as a ZIP"""
+    try:
+        export_profile = export_service.get_profile(bundle.profile)
+        formats = list(dict.fromkeys(export_format.lower() for export_format in bundle.formats))
+        if not formats:
+            raise ValueError("At least one export format is required")
+        export_service.validate_formats(formats)
+        started = time.perf_counter()
+        
+        # Normalize and decode logos once, then render every format concurrently on the worker pool
+        contents = await _render_exports(bundle.spec, formats, export_profile['name'])
+        
+        archive = io.BytesIO()
+        date_time = max(export_service.timestamp(bundle.spec), datetime(1980, 1, 1)).timetuple()[:6]
+        # PDF and DOCX are already compressed, store them as-is
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as zip_file:
+            for export_format, content in contents.items():
+                zip_file.writestr(zipfile.ZipInfo(export_service.export_filename(bundle.spec, export_format), date_time), content)
+        zip_content = archive.getvalue()
+        
+        return Response(
+            content=zip_content,
+            media_type="application/zip",
+            headers=_export_headers(export_service.export_filename(bundle.spec, "zip"), export_profile['name'], zip_content, started)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.post("/export/profile-report")
+async def export_profile_report(spec_data: dict):
+    """Render a VFX specification with every export profile and report output size and render time"""
+    try:
+        report = []
+        document = export_service.normalize(spec_data)
+        # One render at a time on the worker pool: off the event loop, and the timings don't compete
+        for profile in EXPORT_PROFILES:
+            for export_format in SUPPORTED_FORMATS:
+                started = time.perf_counter()
+                content = await export_pool.render(document, export_format, profile)
+                report.append({
+                    "profile": profile,
+                    "format": export_format,
+                    "sizeBytes": len(content),
+                    "renderTimeMs": round((time.perf_counter() - started) * 1000, 1)
+                })
+        return report
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -193,6 +498,7 @@ async def process_logo(file: UploadFile = File(...)):
         # Read image
         image_data = await file.read()
         
+        from PIL import Image
         try:
             image = Image.open(io.BytesIO(image_data))
         except Exception:
@@ -232,18 +538,84 @@ async def process_logo(file: UploadFile = File(...)):
 
 # Dropdown options endpoint
 @api_router.get("/dropdown-options")
-async def get_dropdown_options():
-    """Get all dropdown options for the form"""
-    return DROPDOWN_OPTIONS
+async def get_dropdown_options(request: Request):
+    """Get all dropdown options for the form (X-Payload-Version names the cache-forever URL)"""
+    return dropdown_options_payload.respond(request)
+
+@api_router.get("/dropdown-options/{version}")
+async def get_versioned_dropdown_options(version: str, request: Request):
+    """Get dropdown options at a specific version, cacheable until the constants change"""
+    if version != dropdown_options_payload.version:
+        raise HTTPException(status_code=404, detail="Unknown dropdown options version")
+    return dropdown_options_payload.respond(request, StaticPayload.IMMUTABLE_CACHE_CONTROL)
+
+# Analytics endpoints
+@api_router.get("/analytics/usage")
+async def get_usage_analytics(dimension: Optional[List[str]] = Query(None), start: Optional[datetime] = None,
+                              end: Optional[datetime] = None, top: Optional[int] = Query(None, ge=1),
+                              format: str = Query("json", pattern="^(json|ndjson)$")):
+    """Which cameras, codecs, color spaces and formats are in use across specs created in [start, end).
+
+    format=ndjson streams one {"dimension", "value", "uses", "specs"} row per line.
+    """
+    dimensions = dimension or list(ANALYTICS_DIMENSIONS)
+    unknown = [name for name in dimensions if name not in ANALYTICS_DIMENSIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown dimensions: {', '.join(unknown)}. "
+                                                    f"Available: {', '.join(ANALYTICS_DIMENSIONS)}")
+    try:
+        if format == "ndjson":
+            rows = analytics_service.stream_usage(dimensions, start, end, top)
+            return StreamingResponse((orjson.dumps(row) + b"\n" async for row in rows),
+                                     media_type="application/x-ndjson")
+        return ORJSONResponse(await analytics_service.usage(dimensions, start, end, top))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Metrics endpoints
+@api_router.get("/metrics/cache")
+async def get_cache_metrics():
+    """Hit/miss metrics for the document read caches and the PDF section cache, plus export request coalescing"""
+    return {
+        **vfx_spec_service.cache_stats(),
+        "analytics": analytics_service.cache.stats(),
+        "pdf_sections": export_pool.section_cache_stats(),
+        "export_coalescing": {
+            "on_demand": export_flight.stats(),
+            "stored": prerender_service.in_flight.stats()
+        }
+    }
 
 # Health check endpoint
 @api_router.get("/")
 async def root():
     return {"message": "VFX Specs Exchange API is running", "version": "1.0.0"}
 
+# Readiness probe: unlike the liveness route above, 503 until exporters are warm and MongoDB answers
+@api_router.get("/ready")
+async def readiness():
+    checks = {
+        "exporters": not export_warmup or export_service.warmed_up,
+        "exportPool": not export_warmup or export_pool.ready
+    }
+    try:
+        await asyncio.wait_for(client.admin.command('ping'), timeout=READINESS_CONFIG["mongo_timeout"])
+        checks["mongo"] = True
+    except Exception as e:
+        logger.warning(f"Readiness check: MongoDB ping failed: {str(e)}")
+        checks["mongo"] = False
+    ready = all(checks.values())
+    return ORJSONResponse({
+        "ready": ready,
+        "checks": checks,
+        "exportWorkers": {"warm": export_pool.warm_workers, "total": export_pool.max_workers}
+    }, status_code=200 if ready else 503)
+
 # Include the router in the main app
 app.include_router(api_router)
 
+app.add_middleware(CompressionMiddleware, config=COMPRESSION_CONFIG)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -259,6 +631,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def start_export_pool():
+    export_pool.start()
+
+async def _warm_up_exports():
+    try:
+        await asyncio.gather(asyncio.to_thread(export_service.warmup), export_pool.warm_up())
+    except Exception as e:
+        # /api/ready keeps reporting not ready; exports still work, they just start cold
+        logger.error(f"Export warm-up failed: {str(e)}")
+
+@app.on_event("startup")
+async def warm_up_exporters():
+    # Renderers are imported lazily; warm them (here and in every pool worker) once the API is serving
+    if export_warmup:
+        app.state.export_warmup = asyncio.create_task(_warm_up_exports())
+
+@app.on_event("startup")
+async def ensure_indexes():
+    try:
+        await vfx_spec_service.ensure_indexes()
+    except Exception:
+        # Serving without indexes is slow, not broken
+        logger.warning("Continuing without MongoDB indexes")
+
+@app.on_event("startup")
+async def start_cache_invalidation():
+    vfx_spec_service.start_cache_invalidation()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    await vfx_spec_service.stop_cache_invalidation()
+    client.close()
+    export_pool.shutdown()
\ No newline at end of file
@@ -0,0 +1,88 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+from datetime import datetime
+import asyncio
+import logging
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from services.cache import TTLCache
+from constants import ANALYTICS_DIMENSIONS, ANALYTICS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class AnalyticsService:
+    """Server-side usage statistics over all stored specs"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection = db.vfx_specs
+        self.cache = TTLCache(ANALYTICS_CONFIG["cache_size"], ANALYTICS_CONFIG["cache_ttl"], name="analytics")
+
+    @staticmethod
+    def _date_match(start: Optional[datetime], end: Optional[datetime]) -> Dict[str, Any]:
+        created = {}
+        if start:
+            created["$gte"] = start
+        if end:
+            created["$lt"] = end
+        return {"createdAt": created} if created else {}
+
+    @staticmethod
+    def _pipeline(dimension: str, match: Dict[str, Any], top: Optional[int]) -> List[Dict[str, Any]]:
+        """Count how often each value of a dimension is used, and by how many specs"""
+        config = ANALYTICS_DIMENSIONS[dimension]
+        path = config["path"]
+        pipeline: List[Dict[str, Any]] = [{"$match": match}] if match else []
+        if config.get("unwind"):
+            pipeline.append({"$unwind": f"${config['unwind']}"})
+        pipeline += [
+            {"$match": {path: {"$nin": [None, ""]}}},
+            {"$group": {"_id": {"spec": "$_id", "value": f"${path}"}, "uses": {"$sum": 1}}},
+            {"$group": {"_id": "$_id.value", "uses": {"$sum": "$uses"}, "specs": {"$sum": 1}}},
+            {"$sort": {"uses": -1, "_id": 1}}
+        ]
+        if top:
+            pipeline.append({"$limit": top})
+        pipeline.append({"$project": {"_id": 0, "value": "$_id", "uses": 1, "specs": 1}})
+        return pipeline
+
+    async def usage(self, dimensions: List[str], start: Optional[datetime] = None,
+                    end: Optional[datetime] = None, top: Optional[int] = None) -> Dict[str, Any]:
+        """Usage counts per dimension, cached for a short TTL"""
+        key = (tuple(dimensions), start, end, top)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        match = self._date_match(start, end)
+        try:
+            counts = await asyncio.gather(
+                self.collection.count_documents(match),
+                *(self.collection.aggregate(self._pipeline(dimension, match, top)).to_list(length=None)
+                  for dimension in dimensions)
+            )
+        except Exception as e:
+            logger.error(f"Error computing usage analytics: {str(e)}")
+            raise
+
+        result = {
+            "start": start,
+            "end": end,
+            "specs": counts[0],
+            "generatedAt": datetime.utcnow(),
+            "dimensions": dict(zip(dimensions, counts[1:]))
+        }
+        self.cache.set(key, result)
+        return result
+
+    async def stream_usage(self, dimensions: List[str], start: Optional[datetime] = None,
+                           end: Optional[datetime] = None, top: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield one row per (dimension, value), straight from the aggregation cursors"""
+        cached = self.cache.get((tuple(dimensions), start, end, top))
+        if cached is not None:
+            for dimension, rows in cached["dimensions"].items():
+                for row in rows:
+                    yield {"dimension": dimension, **row}
+            return
+
+        match = self._date_match(start, end)
+        for dimension in dimensions:
+            async for row in self.collection.aggregate(self._pipeline(dimension, match, top)):
+                yield {"dimension": dimension, **row}
@@ -0,0 +1,76 @@
+from typing import Optional
+from datetime import datetime
+from pathlib import Path
+import os
+import tempfile
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ArtifactStore:
+    """Filesystem store for rendered exports, keyed by spec id + updatedAt + profile + format"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    @staticmethod
+    def _version(updated_at: datetime) -> str:
+        # MongoDB stores datetimes with millisecond precision, so the in-memory spec returned by a
+        # write and the document read back later must map to the same version
+        return f"{updated_at.strftime('%Y%m%dT%H%M%S')}{updated_at.microsecond // 1000:03d}"
+
+    def path(self, spec_id: str, updated_at: datetime, profile: str, export_format: str) -> Path:
+        return self.root / spec_id / f"{self._version(updated_at)}.{profile}.{export_format}"
+
+    def get(self, spec_id: str, updated_at: datetime, profile: str, export_format: str) -> Optional[bytes]:
+        """Return the stored artifact for this exact spec version, if any"""
+        try:
+            return self.path(spec_id, updated_at, profile, export_format).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, spec_id: str, updated_at: datetime, profile: str, export_format: str, content: bytes):
+        """Store an artifact atomically and drop artifacts of older versions of the spec.
+
+        Renders can finish out of order; an artifact of a version older than one already stored
+        is not written, so a slow render never replaces the current version's artifacts.
+        """
+        version = self._version(updated_at)
+        if self._newest_version(spec_id) > version:
+            return
+        target = self.path(spec_id, updated_at, profile, export_format)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(content)
+        os.replace(tmp_path, target)
+        self.purge(spec_id, older_than=version)
+
+    def _artifacts(self, spec_id: str):
+        """(version, path) of every stored artifact of a spec"""
+        spec_dir = self.root / spec_id
+        if not spec_dir.is_dir():
+            return
+        for artifact in spec_dir.iterdir():
+            if not artifact.name.startswith('.tmp-'):
+                yield artifact.name.split('.', 1)[0], artifact
+
+    def _newest_version(self, spec_id: str) -> str:
+        # Versions are fixed-width timestamps, so they order as strings
+        return max((version for version, _ in self._artifacts(spec_id)), default='')
+
+    def purge(self, spec_id: str, older_than: Optional[str] = None):
+        """Delete artifacts of a spec, optionally only versions older than one (without one, the spec's directory goes too)"""
+        for version, artifact in list(self._artifacts(spec_id)):
+            if older_than and version >= older_than:
+                continue
+            try:
+                artifact.unlink()
+            except FileNotFoundError:
+                pass
+        if older_than is None:
+            try:
+                (self.root / spec_id).rmdir()
+            except OSError:
+                # Gone already, or a render of the spec is writing a temp file right now
+                pass
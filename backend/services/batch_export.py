@@ -0,0 +1,199 @@
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field
+from pathlib import Path
+import asyncio
+import glob
+import os
+import re
+import time
+import logging
+import orjson
+from constants import BATCH_EXPORT_CONFIG
+from services.export_pool import ExportPool
+from services.export_service import ExportService
+from services.single_flight import payload_digest
+
+logger = logging.getLogger(__name__)
+
+# Headless batch exports (python cli.py export): specs from JSON files or MongoDB are normalized in the
+# parent process, rendered on an ExportPool and written next to each other in one output directory.
+# Output names carry the export timestamp, so which spec content each file was rendered from is kept
+# in an index in the output directory; --skip-existing goes by that content hash, not by name.
+
+def expand_sources(sources: Iterable[str]) -> Iterator[Path]:
+    """Spec JSON files named by paths, directories (their *.json files) or glob patterns, each once"""
+    seen = set()
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            matches = sorted(path.glob('*.json'))
+        elif path.is_file():
+            matches = [path]
+        else:
+            matches = [Path(match) for match in sorted(glob.glob(source, recursive=True))]
+            if not matches:
+                logger.warning(f"No spec files match {source}")
+        for match in matches:
+            resolved = match.resolve()
+            if match.is_file() and resolved not in seen:
+                seen.add(resolved)
+                yield match
+
+async def read_spec_files(paths: Iterable[Path]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """(source, spec) for every spec in the files; a file holds one spec object or an array of them.
+    Unreadable files are yielded with the error in place of the spec so they are reported as failures."""
+    for path in paths:
+        try:
+            data = orjson.loads(await asyncio.to_thread(path.read_bytes))
+        except (OSError, orjson.JSONDecodeError) as e:
+            yield str(path), ValueError(f"Could not read spec file: {e}")
+            continue
+        specs = data if isinstance(data, list) else [data]
+        for index, spec in enumerate(specs):
+            yield (str(path) if len(specs) == 1 else f"{path}[{index}]"), spec
+
+async def read_spec_documents(collection, query: Dict[str, Any], limit: int = 0,
+                              batch_size: int = 50) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """(source, spec) for every stored spec matching query"""
+    cursor = collection.find(query, {"_id": 0}).sort("id", 1).batch_size(batch_size)
+    if limit:
+        cursor = cursor.limit(limit)
+    async for document in cursor:
+        yield f"mongo:{document.get('id')}", document
+
+def safe_filename(name: str) -> str:
+    """Filename without path separators or characters that are awkward on common filesystems"""
+    return re.sub(r'[^\w.-]+', '_', name).strip('_') or 'VFX_Spec'
+
+@dataclass
+class BatchResult:
+    specs: int = 0
+    files: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    failures: List[Tuple[str, str]] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "specs": self.specs,
+            "failed": len(self.failures),
+            "files": self.files,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "specsPerSecond": round(self.specs / self.seconds, 2) if self.seconds else None,
+            "megabytesPerSecond": round(self.bytes / 1e6 / self.seconds, 2) if self.seconds else None
+        }
+
+class BatchExporter:
+    """Renders a stream of specs across a process pool, keeping a bounded number of specs in flight"""
+
+    def __init__(self, export_service: ExportService, export_pool: ExportPool, out_dir: Path,
+                 formats: List[str], profile: Optional[str] = None, overwrite: bool = True):
+        export_service.validate_formats(formats)
+        self.export_service = export_service
+        self.export_pool = export_pool
+        self.out_dir = out_dir
+        self.formats = formats
+        self.profile = export_service.get_profile(profile)['name']
+        self.overwrite = overwrite
+        self._claimed = set()
+        self.index_path = out_dir / BATCH_EXPORT_CONFIG["index_file"]
+        # "<content hash>:<profile>:<format>" -> output file name, and the reverse
+        self.index: Dict[str, str] = {}
+        self._index_keys: Dict[str, str] = {}
+
+    def _load_index(self):
+        try:
+            self.index = orjson.loads(self.index_path.read_bytes()).get("outputs", {})
+        except FileNotFoundError:
+            self.index = {}
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable export index {self.index_path}: {str(e)}")
+            self.index = {}
+        self._index_keys = {name: key for key, name in self.index.items()}
+
+    def _record(self, key: str, name: str):
+        # A file overwritten with other content (same name in deterministic mode) no longer holds the old one
+        previous = self._index_keys.get(name)
+        if previous is not None and previous != key:
+            self.index.pop(previous, None)
+        self.index[key] = name
+        self._index_keys[name] = key
+
+    def _save_index(self):
+        # Replaced atomically, so an interrupted run never leaves a half-written index
+        temp = self.index_path.with_name(f".{self.index_path.name}.tmp")
+        temp.write_bytes(orjson.dumps({"version": 1, "outputs": self.index}, option=orjson.OPT_INDENT_2))
+        os.replace(temp, self.index_path)
+
+    async def run(self, specs: AsyncIterator[Tuple[str, Dict[str, Any]]],
+                  on_done=None) -> BatchResult:
+        """Export every spec; on_done(source, paths, error) is called as each one finishes"""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(self._load_index)
+        result = BatchResult()
+        # Enough queued work to keep every worker busy without loading the whole batch into memory
+        window = asyncio.Semaphore(self.export_pool.max_workers * 2)
+        tasks = set()
+        started = time.perf_counter()
+
+        async def export(source: str, spec: Dict[str, Any]):
+            try:
+                if isinstance(spec, Exception):
+                    raise spec
+                paths = await self._export_one(spec)
+                result.specs += 1
+                result.files += len(paths)
+                result.bytes += sum(size for _, size in paths)
+                error = None
+            except Exception as e:
+                result.failures.append((source, str(e)))
+                paths, error = [], str(e)
+            finally:
+                window.release()
+            if on_done:
+                on_done(source, [path for path, _ in paths], error)
+
+        try:
+            async for source, spec in specs:
+                await window.acquire()
+                task = asyncio.create_task(export(source, spec))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        finally:
+            await asyncio.to_thread(self._save_index)
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def _target(self, spec: Dict[str, Any], export_format: str) -> Path:
+        """Output path for one format of a spec; specs that would share a name get a numeric suffix"""
+        name = safe_filename(self.export_service.export_filename(spec, export_format))
+        stem, suffix = name.rsplit('.', 1)
+        candidate, counter = name, 1
+        while candidate in self._claimed:
+            counter += 1
+            candidate = f"{stem}_{counter}.{suffix}"
+        self._claimed.add(candidate)
+        return self.out_dir / candidate
+
+    async def _export_one(self, spec: Dict[str, Any]) -> List[Tuple[Path, int]]:
+        digest = payload_digest(spec)
+        keys = {export_format: f"{digest}:{self.profile}:{export_format}" for export_format in self.formats}
+        formats = [export_format for export_format in self.formats
+                   if self.overwrite or not self._exported(keys[export_format])]
+        if not formats:
+            return []
+        targets = {export_format: self._target(spec, export_format) for export_format in formats}
+        contents = await self.export_pool.render_many(self.export_service.normalize(spec), formats, self.profile)
+        written = []
+        for export_format, content in contents.items():
+            await asyncio.to_thread(targets[export_format].write_bytes, content)
+            self._record(keys[export_format], targets[export_format].name)
+            written.append((targets[export_format], len(content)))
+        return written
+
+    def _exported(self, key: str) -> bool:
+        """Whether this content was already exported to a file that is still in the output directory"""
+        name = self.index.get(key)
+        return name is not None and (self.out_dir / name).is_file()
@@ -0,0 +1,144 @@
+from typing import Any, Callable, Dict, Hashable, Optional
+from collections import OrderedDict
+import asyncio
+import threading
+import time
+import logging
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import OperationFailure, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire after a fixed time-to-live"""
+
+    def __init__(self, max_size: int, ttl: float, name: str = "cache"):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.name = name
+        # key -> (expires at, value)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry (refreshing its LRU position) or default"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys: Hashable):
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(key, _MISSING) is not _MISSING:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, hit rate and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl
+            }
+
+class CollectionWatcher:
+    """Reports writes made to a collection by other API processes.
+
+    Uses a change stream when the deployment supports one (replica sets / sharded clusters) and
+    otherwise polls a cheap fingerprint of the collection (document count + newest timestamp).
+    on_change receives the changed document's `id`, or None when the change can't be pinned to
+    a single document (deletes, missed events, fingerprint changes) and everything should go.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection, on_change: Callable[[Optional[str]], None],
+                 timestamp_field: str, poll_interval: float):
+        self.collection = collection
+        self.on_change = on_change
+        self.timestamp_field = timestamp_field
+        self.poll_interval = poll_interval
+        self.mode: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self._watch()
+            except OperationFailure as e:
+                logger.info(f"Change streams unavailable for {self.collection.name} ({e.code}), polling instead")
+                await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Events may have been missed while the stream was down
+                logger.warning(f"Change stream for {self.collection.name} interrupted: {str(e)}")
+                self.on_change(None)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _watch(self):
+        async with self.collection.watch(full_document='updateLookup') as stream:
+            self.mode = "change_stream"
+            async for change in stream:
+                document = change.get('fullDocument') or {}
+                self.on_change(document.get('id'))
+
+    async def _poll(self):
+        self.mode = "polling"
+        last = None
+        while True:
+            try:
+                current = await self._fingerprint()
+            except PyMongoError as e:
+                logger.warning(f"Polling {self.collection.name} failed: {str(e)}")
+            else:
+                if last is not None and current != last:
+                    self.on_change(None)
+                last = current
+            await asyncio.sleep(self.poll_interval)
+
+    async def _fingerprint(self) -> tuple:
+        result = await self.collection.aggregate([
+            {"$group": {"_id": None, "count": {"$sum": 1}, "latest": {"$max": f"${self.timestamp_field}"}}}
+        ]).to_list(length=1)
+        return (result[0]["count"], result[0]["latest"]) if result else (0, None)
@@ -0,0 +1,280 @@
+from typing import Any, Dict, List, Optional, Tuple, Type, get_args
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import base64
+import binascii
+import hashlib
+import logging
+from pydantic import BaseModel
+from models.vfx_spec import VFXSpec, Logo
+
+logger = logging.getLogger(__name__)
+
+# Document layout shared by the PDF and DOCX exporters. Field labels, field order and the group
+# each field belongs to come from the models (see spec_field in models/vfx_spec.py).
+# groups: (group key, group title, show title as a PDF subsection)
+# item_title/item_label: heading for each entry of a list section (e.g. one per camera)
+SECTION_LAYOUT = [
+    {
+        "key": "projectInfo",
+        "title": "Project Information",
+        "color": "#2b6cb0",
+        "groups": [
+            ("basic", "Basic Information", False),
+            ("client", "Client Information", False),
+            ("production", "Production Team", False),
+            ("post", "Post-Production", False),
+            ("vfx", "VFX Team", False),
+            ("links", "Reference Links", False)
+        ]
+    },
+    {
+        "key": "cameraFormats",
+        "title": "Camera Formats",
+        "color": "#38a169",
+        "item_title": "Camera Configuration {index}: {label}",
+        "item_label": "cameraId",
+        "groups": [
+            ("camera", None, False)
+        ]
+    },
+    {
+        "key": "vfxPulls",
+        "title": "VFX Pulls Specifications",
+        "color": "#805ad5",
+        "groups": [
+            ("technical", "Technical Specifications", True),
+            ("naming", "Naming Conventions", True),
+            ("links", "Reference Links", False)
+        ]
+    },
+    {
+        "key": "mediaReview",
+        "title": "Media Review Specifications",
+        "color": "#319795",
+        "groups": [
+            ("media", None, False),
+            ("links", "Reference Links", False)
+        ]
+    },
+    {
+        "key": "vfxDeliveries",
+        "title": "VFX Deliveries Specifications",
+        "color": "#ed8936",
+        "groups": [
+            ("deliveries", None, False)
+        ]
+    }
+]
+
+@dataclass(frozen=True)
+class FieldSpec:
+    name: str
+    label: str
+
+@dataclass(frozen=True)
+class GroupSpec:
+    key: str
+    title: Optional[str]
+    subsection: bool
+    fields: Tuple[FieldSpec, ...]
+    logo: Optional[FieldSpec] = None
+
+@dataclass(frozen=True)
+class SectionSpec:
+    key: str
+    title: str
+    color: str
+    repeated: bool
+    groups: Tuple[GroupSpec, ...]
+    item_title: Optional[str] = None
+    item_label: Optional[str] = None
+
+@dataclass
+class LogoBlock:
+    label: str
+    data: bytes
+    digest: str
+
+@dataclass
+class GroupBlock:
+    key: str
+    title: Optional[str]
+    subsection: bool
+    rows: List[Tuple[str, str]]
+    logo: Optional[LogoBlock] = None
+
+    def cache_input(self) -> list:
+        """Everything that affects how this group renders, cheap to hash (logos by digest)"""
+        return [self.key, self.title, self.rows, self.logo.digest if self.logo else None]
+
+@dataclass
+class SectionBlock:
+    key: str
+    title: str
+    color: str
+    repeated: bool
+    groups: List[GroupBlock]
+
+@dataclass
+class LetterheadBlock:
+    company_name: Optional[str] = None
+    contacts: List[str] = field(default_factory=list)
+    logo: Optional[LogoBlock] = None
+
+@dataclass
+class DocumentIR:
+    """Normalized, renderer-independent representation of a VFX specification document"""
+    spec_key: str
+    generated_at: datetime
+    letterhead: LetterheadBlock
+    sections: List[SectionBlock]
+    # generated_at comes from the spec itself and the output must be reproducible
+    deterministic: bool = False
+
+def _model_for(annotation: Any) -> Type[BaseModel]:
+    """Unwrap Optional[...] / List[...] annotations down to the model class"""
+    while not (isinstance(annotation, type) and issubclass(annotation, BaseModel)):
+        annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+    return annotation
+
+def _is_logo(annotation: Any) -> bool:
+    return Logo in get_args(annotation) or annotation is Logo
+
+def compile_schema() -> Tuple[SectionSpec, ...]:
+    """Compile SECTION_LAYOUT and the model field metadata into the section schema"""
+    sections = []
+    for layout in SECTION_LAYOUT:
+        spec_field = VFXSpec.model_fields[layout["key"]]
+        model = _model_for(spec_field.annotation)
+        grouped: Dict[str, List[Tuple[str, Any]]] = {}
+        for name, model_field in model.model_fields.items():
+            extra = model_field.json_schema_extra or {}
+            if "group" in extra:
+                grouped.setdefault(extra["group"], []).append((name, model_field))
+
+        groups = []
+        for group_key, group_title, subsection in layout["groups"]:
+            fields, logo = [], None
+            for name, model_field in grouped.pop(group_key, []):
+                if _is_logo(model_field.annotation):
+                    logo = FieldSpec(name, model_field.title)
+                else:
+                    fields.append(FieldSpec(name, model_field.title))
+            groups.append(GroupSpec(group_key, group_title, subsection, tuple(fields), logo))
+        if grouped:
+            raise ValueError(f"{model.__name__} fields reference unknown document groups: {', '.join(grouped)}")
+
+        repeated = getattr(spec_field.annotation, '__origin__', None) is list
+        sections.append(SectionSpec(layout["key"], layout["title"], layout["color"], repeated, tuple(groups),
+                                    layout.get("item_title"), layout.get("item_label")))
+    return tuple(sections)
+
+DOCUMENT_SCHEMA = compile_schema()
+
+def should_include_field(value: Any) -> bool:
+    """Check if field should be included (not empty)"""
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return value.strip() != ''
+    if isinstance(value, (list, dict)):
+        return len(value) > 0
+    return True
+
+def decode_logo(value: Any, label: str) -> Optional[LogoBlock]:
+    """Decode a logo (Logo dict or legacy data URL string) into image bytes"""
+    data_url = value.get('dataUrl') if isinstance(value, dict) else value
+    if not isinstance(data_url, str) or not data_url.startswith('data:image'):
+        return None
+    try:
+        image_data = base64.b64decode(data_url.split(',')[1])
+    except (IndexError, binascii.Error) as e:
+        logger.error(f"Error processing logo '{label}': {str(e)}")
+        return None
+    return LogoBlock(label, image_data, hashlib.blake2b(image_data, digest_size=16).hexdigest())
+
+def _build_groups(section: SectionSpec, values: Dict[str, Any]) -> List[GroupBlock]:
+    groups = []
+    for group in section.groups:
+        rows = [(spec.label, str(values[spec.name])) for spec in group.fields
+                if should_include_field(values.get(spec.name))]
+        logo = decode_logo(values.get(group.logo.name), group.logo.label) if group.logo else None
+        groups.append(GroupBlock(group.key, group.title, group.subsection, rows, logo))
+    return groups
+
+def spec_key(data: Dict[str, Any]) -> str:
+    """Identify the spec a payload belongs to (stored specs carry an id, drafts fall back to the title)"""
+    if data.get('id'):
+        return str(data['id'])
+    project_info = data.get('projectInfo') or {}
+    return str(project_info.get('projectTitle') or project_info.get('projectCodeName') or '__draft__')
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    """Naive UTC datetime from a datetime or ISO 8601 string (dates only count as midnight)"""
+    if isinstance(value, str) and value.strip():
+        try:
+            value = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+def document_timestamp(data: Dict[str, Any], fallback: datetime) -> datetime:
+    """When a spec payload last changed: updatedAt, then createdAt, then the project date, then fallback"""
+    for value in (data.get('updatedAt'), data.get('createdAt'), (data.get('projectInfo') or {}).get('projectDate')):
+        timestamp = _parse_timestamp(value)
+        if timestamp is not None:
+            return timestamp
+    return fallback
+
+def date_lines(generated_at: datetime, deterministic: bool, kind: str = "Document") -> Tuple[str, str]:
+    """(title line, footer line) dating an export. Deterministic exports are dated by the spec itself,
+    so they show it as the spec's date rather than as the time the file was generated."""
+    if deterministic:
+        date = generated_at.strftime('%B %d, %Y')
+        if generated_at.time() != datetime.min.time():
+            date += generated_at.strftime(' at %H:%M UTC')
+        return f"Specification Date: {date}", f"Specification dated {date} • VFX Specifications Exchange System"
+    generated = generated_at.strftime('%B %d, %Y at %H:%M UTC')
+    return (f"{kind} Generated: {generated}",
+            f"This {kind.lower()} was generated automatically on {generated} • VFX Specifications Exchange System")
+
+def normalize_spec(data: Dict[str, Any], generated_at: Optional[datetime] = None,
+                   deterministic: bool = False) -> DocumentIR:
+    """Walk a spec payload once and produce the document IR consumed by both exporters"""
+    letterhead_info = data.get('letterheadInfo') or {}
+    letterhead = LetterheadBlock(
+        company_name=letterhead_info.get('userCompanyName') or None,
+        contacts=[letterhead_info[key] for key in ('email', 'website', 'address') if letterhead_info.get(key)],
+        logo=decode_logo(letterhead_info.get('logo'), 'Logo')
+    )
+
+    sections = []
+    for section in DOCUMENT_SCHEMA:
+        values = data.get(section.key) or ({} if not section.repeated else [])
+        if section.repeated:
+            groups = []
+            for i, item in enumerate(values, 1):
+                if not any(should_include_field(item.get(name)) for name in item):
+                    continue
+                for group in _build_groups(section, item):
+                    group.key = f"{group.key}.{i}"
+                    group.title = section.item_title.format(index=i, label=item.get(section.item_label, 'Unknown'))
+                    groups.append(group)
+            if not values:
+                continue
+        else:
+            if not any(should_include_field(values.get(name)) for name in values):
+                continue
+            groups = _build_groups(section, values)
+        sections.append(SectionBlock(section.key, section.title, section.color, section.repeated, groups))
+
+    return DocumentIR(
+        spec_key=spec_key(data),
+        generated_at=generated_at or datetime.now(),
+        letterhead=letterhead,
+        sections=sections,
+        deterministic=deterministic
+    )
@@ -0,0 +1,239 @@
+from typing import Dict, Any, Optional
+import io
+import time
+import zipfile
+from datetime import datetime
+import logging
+from docx import Document
+from docx.shared import Inches, Pt, RGBColor
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.enum.table import WD_TABLE_ALIGNMENT
+from docx.oxml import parse_xml
+from services.document_schema import DocumentIR, date_lines
+from services.export_images import prepare_image_data, POINTS_PER_INCH
+
+logger = logging.getLogger(__name__)
+
+def stable_zip(content: bytes, timestamp: datetime) -> bytes:
+    """Rewrite a zip package with every entry dated timestamp instead of the time it was written"""
+    date_time = max(timestamp, datetime(1980, 1, 1)).timetuple()[:6]  # zip dates start in 1980
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(content)) as source, zipfile.ZipFile(output, 'w') as target:
+        for entry in source.infolist():
+            info = zipfile.ZipInfo(entry.filename, date_time)
+            info.compress_type = entry.compress_type
+            info.external_attr = entry.external_attr
+            target.writestr(info, source.read(entry))
+    return output.getvalue()
+
+class DocxRenderer:
+    """python-docx rendering of the document IR (loaded on first DOCX export)"""
+
+    def render(self, document: DocumentIR, export_profile: Dict[str, Any]) -> bytes:
+        """Render the document IR to DOCX"""
+        try:
+            logger.info(f"Generating enhanced professional DOCX export (profile: {export_profile['name']})")
+            started = time.perf_counter()
+            
+            doc = Document()
+            # Package metadata follows the document, not the clock
+            doc.core_properties.created = document.generated_at
+            doc.core_properties.modified = document.generated_at
+            
+            # Enhanced document styles
+            style = doc.styles['Normal']
+            style.font.name = 'Calibri'
+            style.font.size = Pt(11)
+            
+            # Add custom styles for professional appearance
+            heading_style = doc.styles['Heading 1']
+            heading_style.font.name = 'Calibri'
+            heading_style.font.size = Pt(16)
+            heading_style.font.color.rgb = RGBColor(26, 54, 93)  # Dark blue
+            
+            # ENHANCED HEADER SECTION
+            letterhead = document.letterhead
+            
+            # Company information with enhanced styling
+            if letterhead.company_name:
+                company_para = doc.add_paragraph()
+                company_run = company_para.add_run(letterhead.company_name)
+                company_run.font.name = 'Calibri'
+                company_run.font.size = Pt(20)
+                company_run.font.bold = True
+                company_run.font.color.rgb = RGBColor(26, 54, 93)
+                company_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                
+                # Contact information
+                for info in letterhead.contacts:
+                    contact_para = doc.add_paragraph(info)
+                    contact_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                    contact_run = contact_para.runs[0]
+                    contact_run.font.size = Pt(11)
+                    contact_run.font.color.rgb = RGBColor(74, 85, 104)
+                
+                doc.add_paragraph()  # Empty line
+            
+            # Main logo if available
+            if letterhead.logo:
+                try:
+                    image_data = prepare_image_data(letterhead.logo.data, 3*POINTS_PER_INCH, profile=export_profile)
+                    
+                    # Add logo to document
+                    logo_para = doc.add_paragraph()
+                    logo_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                    logo_run = logo_para.add_run()
+                    logo_run.add_picture(io.BytesIO(image_data), width=Inches(3))
+                    doc.add_paragraph()  # Empty line
+                except Exception as e:
+                    logger.warning(f"Could not add main logo to DOCX: {str(e)}")
+            
+            # ENHANCED TITLE SECTION
+            title = doc.add_heading('IMAGE FORMAT EXCHANGE SPECS', 0)
+            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            title_run = title.runs[0]
+            title_run.font.color.rgb = RGBColor(26, 54, 93)
+            
+            # Professional subtitle
+            subtitle = doc.add_paragraph('Technical Consistency Across Processes')
+            subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            subtitle_run = subtitle.runs[0]
+            subtitle_run.font.italic = True
+            subtitle_run.font.color.rgb = RGBColor(74, 85, 104)
+            
+            # Enhanced date
+            date_line, footer_line = date_lines(document.generated_at, document.deterministic)
+            date_para = doc.add_paragraph(date_line)
+            date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            date_run = date_para.runs[0]
+            date_run.font.size = Pt(10)
+            date_run.font.color.rgb = RGBColor(113, 128, 150)
+            date_run.font.italic = True
+            
+            doc.add_paragraph()  # Empty line
+            
+            # Add horizontal line separator
+            separator_para = doc.add_paragraph()
+            separator_run = separator_para.add_run('_' * 80)
+            separator_run.font.color.rgb = RGBColor(49, 130, 206)
+            separator_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            
+            doc.add_paragraph()  # Empty line
+            
+            # SPECIFICATION SECTIONS
+            for section in document.sections:
+                section_heading = doc.add_heading(section.title, level=1)
+                section_run = section_heading.runs[0]
+                section_run.font.color.rgb = RGBColor.from_string(section.color.lstrip('#').upper())
+                
+                for group in section.groups:
+                    if section.repeated:
+                        item_heading = doc.add_heading(group.title, level=2)
+                        item_run = item_heading.runs[0]
+                        item_run.font.color.rgb = RGBColor(26, 54, 93)
+                        self._add_enhanced_docx_table(doc, group.rows)
+                        continue
+                    
+                    if group.rows:
+                        self._add_enhanced_docx_table(doc, group.rows, group.title)
+                        
+                        # Add the group logo if available
+                        if group.logo:
+                            self._add_logo_to_docx(doc, group.logo.data, group.logo.label, export_profile)
+            
+            # PROFESSIONAL FOOTER
+            doc.add_paragraph()
+            footer_para = doc.add_paragraph()
+            footer_run = footer_para.add_run('_' * 80)
+            footer_run.font.color.rgb = RGBColor(43, 108, 176)
+            footer_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            
+            footer_text = doc.add_paragraph(footer_line)
+            footer_text.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            footer_text_run = footer_text.runs[0]
+            footer_text_run.font.size = Pt(9)
+            footer_text_run.font.color.rgb = RGBColor(113, 128, 150)
+            footer_text_run.font.italic = True
+            
+            # Save to buffer
+            buffer = io.BytesIO()
+            doc.save(buffer)
+            docx_content = stable_zip(buffer.getvalue(), document.generated_at)
+            logger.info(f"Generated DOCX (profile: {export_profile['name']}): {len(docx_content)} bytes in {time.perf_counter() - started:.3f}s")
+            return docx_content
+            
+        except Exception as e:
+            logger.error(f"Error generating DOCX: {str(e)}")
+            raise
+
+    def _add_enhanced_docx_table(self, doc, data, subtitle=None):
+        """Add an enhanced table to DOCX with professional styling"""
+        if not data:
+            return
+        
+        if subtitle:
+            subtitle_para = doc.add_paragraph(subtitle)
+            subtitle_run = subtitle_para.runs[0]
+            subtitle_run.font.bold = True
+            subtitle_run.font.size = Pt(12)
+            subtitle_run.font.color.rgb = RGBColor(45, 55, 72)
+        
+        # Create table
+        table = doc.add_table(rows=len(data), cols=2)
+        table.style = 'Table Grid'
+        table.alignment = WD_TABLE_ALIGNMENT.LEFT
+        
+        # Style the table
+        for i, (label, value) in enumerate(data):
+            row = table.rows[i]
+            label_cell = row.cells[0]
+            value_cell = row.cells[1]
+            
+            # Label cell styling
+            label_para = label_cell.paragraphs[0]
+            label_run = label_para.add_run(label)
+            label_run.font.bold = True
+            label_run.font.size = Pt(10)
+            label_run.font.color.rgb = RGBColor(45, 55, 72)
+            
+            # Value cell styling
+            value_para = value_cell.paragraphs[0]
+            value_run = value_para.add_run(str(value))
+            value_run.font.size = Pt(10)
+            value_run.font.color.rgb = RGBColor(45, 55, 72)
+            
+            # Alternating row colors
+            if i % 2 == 0:
+                # Light background for even rows
+                shading_elm_1 = parse_xml(r'<w:shd xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" w:val="clear" w:color="auto" w:fill="F8F9FA"/>')
+                label_cell._tc.get_or_add_tcPr().append(shading_elm_1)
+                shading_elm_2 = parse_xml(r'<w:shd xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" w:val="clear" w:color="auto" w:fill="F8F9FA"/>')
+                value_cell._tc.get_or_add_tcPr().append(shading_elm_2)
+        
+        doc.add_paragraph()  # Empty line after table
+
+    def _add_logo_to_docx(self, doc, image_data: bytes, caption, profile: Optional[Dict[str, Any]] = None):
+        """Add a logo to DOCX document with caption"""
+        try:
+            image_buffer = io.BytesIO(prepare_image_data(image_data, 2*POINTS_PER_INCH, profile=profile))
+            
+            # Add logo to document
+            logo_para = doc.add_paragraph()
+            logo_run = logo_para.add_run()
+            logo_run.add_picture(image_buffer, width=Inches(2))
+            
+            # Add caption
+            caption_para = doc.add_paragraph(caption)
+            caption_run = caption_para.runs[0]
+            caption_run.font.size = Pt(9)
+            caption_run.font.italic = True
+            caption_run.font.color.rgb = RGBColor(113, 128, 150)
+            
+            doc.add_paragraph()  # Empty line
+        except Exception as e:
+            logger.warning(f"Could not add logo to DOCX: {str(e)}")
+            # Add text indicating logo was not added
+            error_para = doc.add_paragraph(f"[{caption} - Could not display image]")
+            error_run = error_para.runs[0]
+            error_run.font.size = Pt(9)
+            error_run.font.color.rgb = RGBColor(185, 28, 28)
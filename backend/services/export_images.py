@@ -0,0 +1,43 @@
+from typing import Dict, Any, Optional
+import io
+import PIL.Image
+
+# Box sizes are given in PDF points
+POINTS_PER_INCH = 72.0
+
+def prepare_image_data(image_data: bytes, box_width: float, box_height: Optional[float] = None,
+                       profile: Optional[Dict[str, Any]] = None) -> bytes:
+    """Downsample and re-encode image bytes for the printed box size of the export profile"""
+    if not profile:
+        return image_data
+
+    image = PIL.Image.open(io.BytesIO(image_data))
+    source_format = image.format
+    if box_height is None:
+        box_height = box_width * image.height / image.width
+
+    resized = False
+    target_dpi = profile.get('image_dpi')
+    if target_dpi:
+        target_size = (max(1, int(box_width / POINTS_PER_INCH * target_dpi)), max(1, int(box_height / POINTS_PER_INCH * target_dpi)))
+        if image.width > target_size[0] or image.height > target_size[1]:
+            image.thumbnail(target_size, PIL.Image.Resampling.LANCZOS)
+            resized = True
+
+    target_format = profile.get('image_format', 'PNG')
+    if not resized and source_format == target_format:
+        # Already in the right encoding at an acceptable size - avoid a lossy round trip
+        return image_data
+
+    output = io.BytesIO()
+    if target_format == 'JPEG':
+        if image.mode != 'RGB':
+            # JPEG has no alpha channel, flatten transparent logos onto white
+            image = image.convert('RGBA')
+            background = PIL.Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.split()[3])
+            image = background
+        image.save(output, format='JPEG', quality=profile.get('jpeg_quality') or 85, optimize=True)
+    else:
+        image.save(output, format='PNG', optimize=True)
+    return output.getvalue()
@@ -0,0 +1,150 @@
+from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import multiprocessing
+import os
+import signal
+import threading
+import logging
+from services.document_schema import DocumentIR
+from services.export_service import ExportService
+
+logger = logging.getLogger(__name__)
+
+# Per-process ExportService, created once when a worker starts
+_worker_service: Optional[ExportService] = None
+
+def _init_worker(warm_workers, cache_stats, warm_up: bool):
+    global _worker_service
+    # Ctrl-C reaches the whole process group; the parent shuts the pool down, workers just wait for it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_service = ExportService()
+    # Sections are cached where they are rendered: publish this worker's counters to the parent
+    with cache_stats.get_lock():
+        slot = cache_stats[0]
+        cache_stats[0] += 1
+    if slot < (len(cache_stats) - 1) // 3:
+        _worker_service.section_cache.share(cache_stats, 1 + slot * 3)
+    # Parse the brand fonts before the first task, even when the full warm-up is disabled
+    from services.fonts import register_fonts
+    register_fonts()
+    if warm_up:
+        # Runs before the worker accepts any task, so no export ever lands on a cold worker
+        try:
+            _worker_service.warmup()
+        except Exception as e:
+            logger.error(f"Export worker {os.getpid()} failed to warm up: {str(e)}")
+            return
+    with warm_workers.get_lock():
+        warm_workers.value += 1
+
+def _ping() -> int:
+    return os.getpid()
+
+def _render(document: DocumentIR, export_format: str, profile: Optional[str]) -> bytes:
+    return _worker_service.render(document, export_format, profile)
+
+class ExportPool:
+    """Process pool that renders normalized documents off the event loop"""
+
+    def __init__(self, max_workers: Optional[int] = None, warm_up: bool = False):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.warm_up_workers = warm_up
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._warm_workers = None
+        # Next free slot, then hits, misses and cached specs of each worker's section cache
+        self._cache_stats = None
+        self._lock = threading.Lock()
+        self._warm_up_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the worker processes (spawned, so workers never inherit the event loop or Mongo client)"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._start()
+
+    def _start(self):
+        mp_context = multiprocessing.get_context('spawn')
+        self._warm_workers = mp_context.Value('i', 0)
+        self._cache_stats = mp_context.Array('q', 1 + 3 * self.max_workers)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(self._warm_workers, self._cache_stats, self.warm_up_workers)
+        )
+        logger.info(f"Started export pool with {self.max_workers} workers")
+
+    def _restart(self, broken: ProcessPoolExecutor) -> bool:
+        """Replace an executor that lost a worker; concurrent callers that saw the same failure restart it once"""
+        with self._lock:
+            if self._executor is not broken:
+                return False
+            logger.error("Export worker died abruptly, restarting the export pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._start()
+            return True
+
+    @property
+    def warm_workers(self) -> int:
+        """Workers that finished initializing (including warm-up when enabled)"""
+        return self._warm_workers.value if self._warm_workers is not None else 0
+
+    @property
+    def ready(self) -> bool:
+        return self.warm_workers >= self.max_workers
+
+    def section_cache_stats(self) -> Dict[str, int]:
+        """PDF section cache counters summed over the worker processes, since the pool started"""
+        stats = {"hits": 0, "misses": 0, "specs": 0, "workers": 0}
+        if self._cache_stats is not None:
+            with self._cache_stats.get_lock():
+                values = self._cache_stats[:]
+            stats["workers"] = min(values[0], self.max_workers)
+            for offset in range(1, len(values), 3):
+                stats["hits"] += values[offset]
+                stats["misses"] += values[offset + 1]
+                stats["specs"] += values[offset + 2]
+        return stats
+
+    async def warm_up(self, timeout: float = 120):
+        """Spawn every worker now instead of on first use and wait until each has warmed itself up"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        # Spawned pools start a process per task while none is idle, so one task per worker starts them all
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _ping) for _ in range(self.max_workers)))
+        # The first warm worker may have answered every ping; wait for the others to finish initializing
+        deadline = loop.time() + timeout
+        while not self.ready and loop.time() < deadline:
+            await asyncio.sleep(0.1)
+        if self.ready:
+            logger.info(f"Export pool warm: {self.warm_workers} workers")
+        else:
+            logger.warning(f"Export pool warm-up incomplete: {self.warm_workers}/{self.max_workers} workers")
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def render(self, document: DocumentIR, export_format: str, profile: Optional[str] = None) -> bytes:
+        """Render one format on a worker process. A worker that dies (out of memory, crash in a native
+        library) breaks the whole executor, so the pool is rebuilt and the render retried once."""
+        self.start()
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            return await loop.run_in_executor(executor, _render, document, export_format, profile)
+        except BrokenProcessPool:
+            if self._restart(executor) and self.warm_up_workers:
+                # Bring the replacement workers back to ready instead of waiting for traffic to spawn them
+                self._warm_up_task = loop.create_task(self.warm_up())
+        return await loop.run_in_executor(self._executor, _render, document, export_format, profile)
+
+    async def render_many(self, document: DocumentIR, formats: List[str], profile: Optional[str] = None) -> Dict[str, bytes]:
+        """Render several formats of the same document concurrently"""
+        contents = await asyncio.gather(*(self.render(document, export_format, profile) for export_format in formats))
+        return dict(zip(formats, contents))
@@ -0,0 +1,129 @@
+from typing import Any, Callable, Dict, List, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+import os
+import threading
+import time
+import logging
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib.fonts import addMapping
+from constants import FONT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Brand fonts for PDF exports. TTFs are parsed and registered with ReportLab once per process and the
+# parsed TTFont objects are shared by every export; ReportLab keeps the per-document subsetting state
+# on the font (keyed weakly by document), so sharing them across exports and threads is safe.
+
+@dataclass(frozen=True)
+class FontSet:
+    regular: str
+    bold: str
+    italic: str
+    bold_italic: str
+
+HELVETICA = FontSet('Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique', 'Helvetica-BoldOblique')
+
+_lock = threading.Lock()
+_font_set: Optional[FontSet] = None
+# TTF path -> parsed font
+_parsed: Dict[str, TTFont] = {}
+
+class SubsetCache:
+    """Memoizes TTFontFace.makeSubset: exports that use the same characters embed identical subsets"""
+
+    def __init__(self, make_subset: Callable[[List[int]], bytes], max_size: int):
+        self._make_subset = make_subset
+        self.max_size = max_size
+        self._subsets: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, subset: List[int]) -> bytes:
+        key = tuple(subset)
+        with self._lock:
+            data = self._subsets.get(key)
+            if data is not None:
+                self._subsets.move_to_end(key)
+                self.hits += 1
+                return data
+        data = self._make_subset(subset)
+        with self._lock:
+            self.misses += 1
+            self._subsets[key] = data
+            while len(self._subsets) > self.max_size:
+                self._subsets.popitem(last=False)
+        return data
+
+def font_directory() -> Path:
+    """Where the brand TTFs live (EXPORT_FONT_DIR overrides the configured backend-relative directory)"""
+    directory = os.environ.get('EXPORT_FONT_DIR')
+    if directory:
+        return Path(directory)
+    return Path(__file__).resolve().parent.parent / FONT_CONFIG["directory"]
+
+def load_font(name: str, path: Path) -> TTFont:
+    """Parse a TTF once per process and register it under name"""
+    key = str(path)
+    font = _parsed.get(key)
+    if font is None:
+        font = TTFont(name, key)
+        if FONT_CONFIG["subset_cache_size"]:
+            font.face.makeSubset = SubsetCache(font.face.makeSubset, FONT_CONFIG["subset_cache_size"])
+        _parsed[key] = font
+    pdfmetrics.registerFont(font)
+    return font
+
+def register_fonts() -> FontSet:
+    """Register the brand font family, falling back to Helvetica when its regular/bold faces are missing"""
+    global _font_set
+    if _font_set is not None:
+        return _font_set
+    with _lock:
+        if _font_set is None:
+            _font_set = _register_family()
+    return _font_set
+
+def _register_family() -> FontSet:
+    family = FONT_CONFIG["family"]
+    directory = font_directory()
+    paths = {style: directory / filename for style, filename in FONT_CONFIG["faces"].items()}
+    if not (paths['regular'].is_file() and paths['bold'].is_file()):
+        logger.info(f"{family} fonts not found in {directory}, PDF exports use Helvetica")
+        return HELVETICA
+
+    started = time.perf_counter()
+    names = {}
+    try:
+        # Missing italic faces fall back to the upright ones
+        for style, name, fallback in (('regular', family, None), ('bold', f"{family}-Bold", None),
+                                      ('italic', f"{family}-Italic", 'regular'),
+                                      ('bold_italic', f"{family}-BoldItalic", 'bold')):
+            if paths.get(style) and paths[style].is_file():
+                load_font(name, paths[style])
+                names[style] = name
+            else:
+                names[style] = names[fallback]
+    except Exception as e:
+        logger.error(f"Could not register {family} fonts, PDF exports use Helvetica: {str(e)}")
+        return HELVETICA
+
+    # Lets <b>/<i> markup inside paragraphs pick the right face
+    addMapping(family, 0, 0, names['regular'])
+    addMapping(family, 1, 0, names['bold'])
+    addMapping(family, 0, 1, names['italic'])
+    addMapping(family, 1, 1, names['bold_italic'])
+    logger.info(f"Registered {family} fonts from {directory} in {time.perf_counter() - started:.3f}s")
+    return FontSet(names['regular'], names['bold'], names['italic'], names['bold_italic'])
+
+def font_stats() -> Dict[str, Any]:
+    """Parsed fonts and subset cache counters for this process"""
+    fonts = {}
+    for path, font in _parsed.items():
+        cache = font.face.makeSubset
+        fonts[font.fontName] = {"path": path, **({"subset_hits": cache.hits, "subset_misses": cache.misses}
+                                                 if isinstance(cache, SubsetCache) else {})}
+    return {"family": (_font_set or HELVETICA).regular, "fonts": fonts}
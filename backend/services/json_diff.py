@@ -0,0 +1,53 @@
+from typing import Any, Dict, List
+import copy
+
+# A diff is a list of operations, each addressing a value by its path of dict keys / list indices:
+#   {"op": "set", "path": [...], "value": ...}   set or replace the value at path
+#   {"op": "del", "path": [...]}                 remove the dict key at path
+# Unchanged subtrees produce no operations, so an edit that doesn't touch a logo never stores it.
+
+def diff(old: Any, new: Any, path: List[Any] = None) -> List[Dict[str, Any]]:
+    """Compute the operations that turn old into new"""
+    path = path or []
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "del", "path": path + [key]})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "set", "path": path + [key], "value": value})
+            else:
+                ops.extend(diff(old[key], value, path + [key]))
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+            ops.extend(diff(old_item, new_item, path + [index]))
+        return ops
+    # Scalars, type changes and lists that grew or shrank are replaced wholesale
+    return [{"op": "set", "path": path, "value": new}]
+
+def apply(document: Any, ops: List[Dict[str, Any]]) -> Any:
+    """Return a copy of document with the operations applied"""
+    return patch(copy.deepcopy(document), ops)
+
+def patch(document: Any, ops: List[Dict[str, Any]]) -> Any:
+    """Apply the operations to document in place (returns the document, which a root "set" replaces)"""
+    for op in ops:
+        path = op["path"]
+        if not path:
+            document = copy.deepcopy(op["value"])
+            continue
+        parent = document
+        for key in path[:-1]:
+            parent = parent[key]
+        if op["op"] == "set":
+            parent[path[-1]] = copy.deepcopy(op["value"])
+        elif op["op"] == "del":
+            del parent[path[-1]]
+        else:
+            raise ValueError(f"Unknown diff operation: {op['op']}")
+    return document
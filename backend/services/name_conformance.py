@@ -0,0 +1,206 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+import os
+import re
+import logging
+from constants import NAME_CONFORMANCE_CONFIG
+from services.naming import NamingConvention, NamingEngine
+
+logger = logging.getLogger(__name__)
+
+# Checks delivered filenames against a spec's naming convention: a regex compiled from the convention
+# parses each name, names that don't match are explained field by field, and frames of matching names
+# are grouped into sequences so missing frames show up as gaps. Frame files of one sequence differ only
+# in the frame number, so the parse of each (name, extension) is cached and most files cost a dict lookup.
+
+# Parsed (name, extension) pairs kept before the cache is cleared
+_PARSE_CACHE_SIZE = 100000
+
+class FilenameParser:
+    """Parses <name>.<frame>.<ext> filenames of one convention (vfxPulls or vfxDeliveries) of a spec.
+    The expected extension comes from the spec's file format unless one is given."""
+
+    def __init__(self, spec: Dict[str, Any], section: str = 'vfxDeliveries', extension: Optional[str] = None):
+        self.convention = convention = NamingConvention(section)
+        engine = NamingEngine(spec, section)
+        self.padding = engine.padding
+        self.extension = extension.lstrip('.').lower() if extension else engine.extension
+        section_data = spec.get(section) or {}
+        # Fields every delivered name must repeat from the spec (show, vendor)
+        self.expected: Dict[str, str] = {field: str(section_data[field]).strip() for field in convention.fixed
+                                         if str(section_data.get(field) or '').strip()}
+        tokens = []
+        for fields, droppable in convention.tokens:
+            token = ''.join(f"(?P<{field}>{convention.patterns[field].pattern})"
+                            + ('' if field in convention.required else '?') for field in fields)
+            tokens.append((token, droppable))
+        # Separators belong to the token after them, so a dropped optional token takes its "_" with it
+        pattern = tokens[0][0] + ''.join(f"(?:_{token})?" if droppable else f"_{token}" for token, droppable in tokens[1:])
+        self.pattern = re.compile(pattern)
+        self._cache: Dict[Tuple[str, str], Tuple[Optional[Dict[str, str]], List[str]]] = {}
+
+    def parse(self, filename: str) -> Tuple[Optional[Dict[str, str]], Optional[int], List[str]]:
+        """(fields, frame number, errors) for a filename; fields is None when the name doesn't parse"""
+        parts = filename.rsplit('.', 2)
+        if len(parts) != 3:
+            name, extension = parts[0], parts[-1] if len(parts) > 1 else ''
+            fields, errors = self._parse_name(name, extension)
+            return fields, None, errors + ["frame: no frame number (expected <name>.<frame>.<ext>)"]
+        name, frame, extension = parts
+        cached = self._cache.get((name, extension))
+        if cached is None:
+            if len(self._cache) >= _PARSE_CACHE_SIZE:
+                self._cache.clear()
+            cached = self._cache[(name, extension)] = self._parse_name(name, extension)
+        fields, errors = cached
+        if frame.isdigit() and (len(frame) == self.padding or (len(frame) > self.padding and frame[0] != '0')):
+            return fields, int(frame), errors
+        if frame.isdigit():
+            return fields, int(frame), errors + [f"frame: '{frame}' is not padded to {self.padding} digits"]
+        return fields, None, errors + [f"frame: '{frame}' is not a frame number"]
+
+    def _parse_name(self, name: str, extension: str) -> Tuple[Optional[Dict[str, str]], List[str]]:
+        errors = []
+        if extension != self.extension:
+            errors.append(f"extension: expected '{self.extension}', got '{extension}'")
+        match = self.pattern.fullmatch(name)
+        if match is None:
+            return None, errors + self.explain(name)
+        fields = {field: value for field, value in match.groupdict().items() if value}
+        for field, expected in self.expected.items():
+            if fields.get(field) != expected:
+                errors.append(f"{field}: expected '{expected}', got '{fields.get(field, '')}'")
+        return fields, errors
+
+    def explain(self, name: str) -> List[str]:
+        """Field-by-field reasons a name doesn't match the convention"""
+        convention = self.convention
+        values = name.split('_')
+        required = sum(1 for _, droppable in convention.tokens if not droppable)
+        if not required <= len(values) <= len(convention.tokens):
+            layout = '_'.join('+'.join(fields) + ('?' if droppable else '') for fields, droppable in convention.tokens)
+            return [f"name: expected {layout} ({required}-{len(convention.tokens)} '_'-separated parts), "
+                    f"got {len(values)} parts"]
+        # Like the regex, the leftmost optional tokens are filled first
+        spare = len(values) - required
+        errors, values = [], iter(values)
+        for fields, droppable in convention.tokens:
+            if droppable:
+                if not spare:
+                    continue
+                spare -= 1
+            value = next(values)
+            if len(fields) == 1:
+                if not convention.patterns[fields[0]].fullmatch(value):
+                    errors.append(f"{fields[0]}: '{value}' does not match {convention.patterns[fields[0]].pattern}")
+            elif not re.fullmatch(''.join(f"(?:{convention.patterns[field].pattern})"
+                                          + ('' if field in convention.required else '?') for field in fields), value):
+                errors.append(f"{'+'.join(fields)}: '{value}' does not match "
+                              + ' + '.join(convention.patterns[field].pattern for field in fields))
+        return errors or [f"name: '{name}' does not match the naming convention"]
+
+def _scan_directory(directory: str) -> Tuple[str, List[str], List[str]]:
+    files, directories = [], []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # d_type from the directory listing: no stat per file
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                else:
+                    files.append(entry.name)
+    except OSError as e:
+        logger.warning(f"Could not list {directory}: {str(e)}")
+    return directory, files, directories
+
+def scan_tree(root: Path, workers: int = NAME_CONFORMANCE_CONFIG["scan_workers"]) -> Iterator[Tuple[str, List[str]]]:
+    """(directory, file names) for every directory under root, listed on a thread pool as they finish.
+    Directory listing is syscall-bound and releases the GIL, so threads list many directories at once
+    (which matters most on network storage)."""
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        pending = {executor.submit(_scan_directory, str(root))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                directory, files, directories = future.result()
+                pending.update(executor.submit(_scan_directory, subdirectory) for subdirectory in directories)
+                yield directory, files
+
+def group_paths(paths: Iterable[str]) -> Iterator[Tuple[str, List[str]]]:
+    """(directory, file names) for a stream of file paths, batching consecutive paths of a directory"""
+    current, names = None, []
+    for path in paths:
+        directory, name = os.path.split(path.strip())
+        if not name:
+            continue
+        if directory != current and names:
+            yield current, names
+            names = []
+        current = directory
+        names.append(name)
+    if names:
+        yield current, names
+
+class ConformanceCheck:
+    """Accumulates parse results and frame sequences across directories"""
+
+    def __init__(self, parser: FilenameParser, max_reported_gaps: int = NAME_CONFORMANCE_CONFIG["max_reported_gaps"]):
+        self.parser = parser
+        self.max_reported_gaps = max_reported_gaps
+        self.checked = 0
+        self.mismatched = 0
+        # (directory, name, extension) -> frame numbers
+        self._frames: Dict[Tuple[str, str, str], List[int]] = defaultdict(list)
+
+    def check(self, directory: str, names: List[str]) -> List[Dict[str, Any]]:
+        """Check one directory's files; returns the mismatches"""
+        parse, frames, mismatches = self.parser.parse, self._frames, []
+        for filename in names:
+            fields, frame, errors = parse(filename)
+            if errors:
+                mismatches.append({"path": os.path.join(directory, filename) if directory else filename,
+                                   "fields": fields, "errors": errors})
+            if fields is not None and frame is not None:
+                name, _, extension = filename.rsplit('.', 2)
+                frames[(directory, name, extension)].append(frame)
+        self.checked += len(names)
+        self.mismatched += len(mismatches)
+        return mismatches
+
+    def sequences(self) -> List[Dict[str, Any]]:
+        """Every frame sequence found, with its frame range, duplicates and missing frames"""
+        padding, sequences = self.parser.padding, []
+        for (directory, name, extension), frames in sorted(self._frames.items()):
+            frames.sort()
+            gaps, gap_count, missing, previous = [], 0, 0, frames[0]
+            for frame in frames[1:]:
+                if frame > previous + 1:
+                    gap_count += 1
+                    missing += frame - previous - 1
+                    if gap_count <= self.max_reported_gaps:
+                        gaps.append([previous + 1, frame - 1])
+                previous = frame
+            unique = len(frames) - sum(1 for a, b in zip(frames, frames[1:]) if a == b)
+            sequences.append({
+                "directory": directory,
+                "pattern": f"{name}.%0{padding}d.{extension}",
+                "first": frames[0],
+                "last": frames[-1],
+                "frames": unique,
+                "missing": missing,
+                "gapCount": gap_count,
+                "gaps": gaps
+            })
+        return sequences
+
+    def report(self) -> Dict[str, Any]:
+        sequences = self.sequences()
+        return {
+            "convention": self.parser.convention.section,
+            "checked": self.checked,
+            "mismatched": self.mismatched,
+            "sequences": sequences,
+            "incompleteSequences": sum(1 for sequence in sequences if sequence["missing"])
+        }
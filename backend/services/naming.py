@@ -0,0 +1,260 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from pathlib import Path
+import csv
+import multiprocessing
+import io
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from operator import itemgetter
+import orjson
+from constants import FILE_FORMAT_EXTENSIONS, NAMING_CONVENTIONS, NAMING_FIELD_PATTERNS, SHOT_LIST_COLUMNS
+
+# Pulls/deliveries naming: a convention from NAMING_CONVENTIONS is compiled once into a formatter and
+# per-field validators, then applied to every row of a shot list. Spec values (show, episode, ...) are
+# the defaults each row overrides, and frame ranges come from the row's frameIn/frameOut widened by the
+# spec's frameHandles.
+
+_PADDING_HASHES = re.compile(r'#+')
+_PADDING_PRINTF = re.compile(r'%0?(\d+)d')
+_PADDING_DIGITS = re.compile(r'\D*(\d{1,2})\b.*')
+
+def frame_padding(value: Optional[str]) -> Tuple[int, str]:
+    """Digits and filename frame token for a framePadding value: hashes are kept as written, printf
+    tokens become zero-padded ('%4d' pads with spaces, which no frame file does: '%04d'), free text
+    such as '8 digits' becomes hashes; 4 when unset"""
+    value = (value or '').strip()
+    if not value:
+        return 4, '####'
+    if _PADDING_HASHES.fullmatch(value):
+        return len(value), value
+    match = _PADDING_PRINTF.fullmatch(value) or _PADDING_DIGITS.fullmatch(value)
+    if match and 0 < int(match.group(1)) <= 12:
+        digits = int(match.group(1))
+        return digits, f"%0{digits}d" if match.re is _PADDING_PRINTF else '#' * digits
+    raise ValueError(f"Unsupported frame padding: {value}")
+
+def file_extension(file_format: Optional[str]) -> str:
+    """Extension for a fileFormat option such as 'OpenEXR (.exr)'"""
+    if file_format:
+        for marker, extension in FILE_FORMAT_EXTENSIONS:
+            if marker in file_format:
+                return extension
+    return 'exr'
+
+# Joins a row's values for whole-row validation; no field pattern accepts it
+_SEPARATOR = '\x1f'
+
+def _text(value: Any) -> str:
+    return '' if value is None else str(value).strip()
+
+class NamingConvention:
+    """One section's naming convention compiled into a formatter and validators.
+
+    Field values travel as a list in self.fields order. Every layout of present/dropped optional
+    tokens gets its own cached str.format template, and a whole row is validated with a single
+    regex match; the per-field patterns only run to explain a row that failed.
+    """
+
+    def __init__(self, section: str):
+        if section not in NAMING_CONVENTIONS:
+            raise ValueError(f"Unknown naming convention: {section}. Supported: {', '.join(NAMING_CONVENTIONS)}")
+        convention = NAMING_CONVENTIONS[section]
+        optional = set(convention["optional"])
+        self.section = section
+        self.defaults: Dict[str, str] = convention["defaults"]
+        self.fields: List[str] = [field for fields in convention["parts"] for field in fields]
+        self.required: List[str] = [field for field in self.fields if field not in optional]
+        self.fixed: List[str] = list(convention.get("fixed", []))
+        # (fields, token may be dropped) per filename token
+        self.tokens: List[Tuple[Tuple[str, ...], bool]] = [
+            (tuple(fields), all(field in optional for field in fields)) for fields in convention["parts"]]
+        self._parts: List[Tuple[Tuple[int, ...], bool]] = [
+            (tuple(self.fields.index(field) for field in fields), droppable) for fields, droppable in self.tokens]
+        droppable_indexes = [index for indexes, droppable in self._parts if droppable for index in indexes]
+        self._droppable_values = (itemgetter(*droppable_indexes) if len(droppable_indexes) > 1
+                                  else lambda values: tuple(values[index] for index in droppable_indexes))
+        self._droppable_indexes = droppable_indexes
+        self._templates: Dict[Tuple[bool, ...], str] = {}
+
+        self.patterns: Dict[str, re.Pattern] = {
+            field: re.compile(NAMING_FIELD_PATTERNS.get(field, NAMING_FIELD_PATTERNS["default"])) for field in self.fields}
+        self._row_pattern = re.compile(_SEPARATOR.join(
+            f"(?:{pattern.pattern})" + ('' if field in self.required else '?') for field, pattern in self.patterns.items()))
+
+    def _template(self, values: List[str]) -> str:
+        # Which droppable fields are set decides the template
+        layout = tuple(map(bool, self._droppable_values(values)))
+        template = self._templates.get(layout)
+        if template is None:
+            present = {index for index, is_set in zip(self._droppable_indexes, layout) if is_set}
+            tokens = [''.join(f"{{{index}}}" for index in indexes) for indexes, droppable in self._parts
+                      if not droppable or present.intersection(indexes)]
+            template = self._templates[layout] = '_'.join(tokens)
+        return template
+
+    def format(self, values: List[str]) -> str:
+        """Base name (without frame number and extension) for field values in self.fields order"""
+        return self._template(values).format(*values)
+
+    def validate(self, values: List[str]) -> List[str]:
+        if self._row_pattern.fullmatch(_SEPARATOR.join(values)):
+            return []
+        errors = []
+        for field, value in zip(self.fields, values):
+            if not value:
+                if field in self.required:
+                    errors.append(f"{field}: missing")
+            elif not self.patterns[field].fullmatch(value):
+                errors.append(f"{field}: '{value}' does not match {self.patterns[field].pattern}")
+        return errors
+
+class NamingEngine:
+    """Filenames and frame sequence patterns for a spec's pulls or deliveries"""
+
+    def __init__(self, spec: Dict[str, Any], section: str = 'vfxPulls', defaults: Optional[Dict[str, str]] = None):
+        self.convention = NamingConvention(section)
+        section_data = spec.get(section) or {}
+        pulls = spec.get('vfxPulls') or {}
+        defaults = defaults or {}
+        self.base: List[str] = [_text(section_data.get(field)) or defaults.get(field, '')
+                                for field in self.convention.fields]
+        # Deliveries have no frame or file format settings of their own and follow the pulls
+        self.padding, self.frame_token = frame_padding(section_data.get('framePadding') or pulls.get('framePadding'))
+        self.handles = int(section_data.get('frameHandles') or pulls.get('frameHandles') or 0)
+        self.extension = file_extension(section_data.get('fileFormat') or pulls.get('fileFormat'))
+
+    def values(self, row: Dict[str, Any]) -> List[str]:
+        """Field values for a row, in convention order; empty row values fall back to the spec's"""
+        return [(value.strip() if value.__class__ is str else _text(value)) or base
+                for value, base in zip(map(row.get, self.convention.fields), self.base)]
+
+    def filename(self, row: Optional[Dict[str, Any]] = None) -> str:
+        """Sequence filename with the spec's frame token, e.g. AAA_101_0010_PL01_v001.####.exr"""
+        return f"{self.convention.format(self.values(row or {}))}.{self.frame_token}.{self.extension}"
+
+    def generate(self, rows: Iterable[Dict[str, Any]], start: int = 1) -> Iterator[Dict[str, Any]]:
+        """One result per shot-list row, streamed: filename, printf pattern, frame range and errors.
+        Rows with errors get no filename or pattern."""
+        # The per-row steps of values(), NamingConvention.format() and validate() inlined: this loop
+        # runs for every shot of shot lists that run into the hundreds of thousands
+        convention = self.convention
+        fields, base_values, template_for = convention.fields, self.base, convention._template
+        row_match, explain = convention._row_pattern.fullmatch, convention.validate
+        padding, handles, extension = self.padding, self.handles, self.extension
+        frame_suffix = f".{self.frame_token}.{extension}"
+        printf_suffix = f".%0{padding}d.{extension}"
+        for number, row in enumerate(rows, start):
+            values = [(value.strip() if value.__class__ is str else _text(value)) or base
+                      for value, base in zip(map(row.get, fields), base_values)]
+            base = template_for(values).format(*values)
+            errors = [] if row_match(_SEPARATOR.join(values)) else explain(values)
+            first = last = None
+            frame_in, frame_out = row.get('frameIn'), row.get('frameOut')
+            if frame_in not in (None, '') and frame_out not in (None, ''):
+                try:
+                    cut_in, cut_out = int(frame_in), int(frame_out)
+                except ValueError:
+                    errors.append(f"frames: '{frame_in}'-'{frame_out}' are not frame numbers")
+                else:
+                    first, last = cut_in - handles, cut_out + handles
+                    if cut_in > cut_out:
+                        errors.append(f"frames: frameIn {cut_in} is after frameOut {cut_out}")
+                    elif cut_in < 0:
+                        errors.append(f"frameIn: {cut_in} is negative")
+                    elif first < 0:
+                        errors.append(f"frameIn: {cut_in} leaves no room for {handles} frame handles (first frame {first})")
+                    elif len(str(last)) > padding:
+                        errors.append(f"frames: {last} needs more than {padding} digits")
+            if errors:
+                yield {"row": number, "filename": None, "pattern": None, "first": first, "last": last, "errors": errors}
+            else:
+                yield {"row": number, "filename": base + frame_suffix, "pattern": base + printf_suffix,
+                       "first": first, "last": last, "errors": errors}
+
+def read_shot_list(path: Path) -> Iterator[Dict[str, Any]]:
+    """Rows of a CSV (header row) or NDJSON (.ndjson/.jsonl) shot list, streamed, with column aliases resolved"""
+    if path.suffix.lower() in ('.ndjson', '.jsonl'):
+        with path.open('rb') as f:
+            for line in f:
+                if line.strip():
+                    yield _columns(orjson.loads(line))
+    else:
+        with path.open(newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = [SHOT_LIST_COLUMNS.get(column.strip(), column.strip()) for column in next(reader, [])]
+            for row in reader:
+                if row:
+                    yield dict(zip(header, row))
+
+def _columns(row: Dict[str, Any]) -> Dict[str, Any]:
+    if SHOT_LIST_COLUMNS.keys().isdisjoint(row):
+        return row
+    return {SHOT_LIST_COLUMNS.get(column, column): value for column, value in row.items()}
+
+def _format_results(results: Iterable[Dict[str, Any]], as_json: bool, invalid_only: bool) -> Tuple[bytes, int, int]:
+    """Output lines for results (NDJSON, or filename + frame range with errors after a tab), row and invalid counts"""
+    lines, count, invalid = [], 0, 0
+    for result in results:
+        count += 1
+        if result["errors"]:
+            invalid += 1
+        elif invalid_only:
+            continue
+        if as_json:
+            lines.append(orjson.dumps(result))
+        else:
+            line = result["filename"] or f"row {result['row']}"
+            if result["first"] is not None:
+                line += f" {result['first']}-{result['last']}"
+            if result["errors"]:
+                line += "\t" + "; ".join(result["errors"])
+            lines.append(line.encode())
+    return b"".join(line + b"\n" for line in lines), count, invalid
+
+# Per-process engine for parallel generation, built once when a worker starts
+_worker_engine: Optional[NamingEngine] = None
+
+def _init_worker(spec: Dict[str, Any], section: str):
+    global _worker_engine
+    _worker_engine = NamingEngine(spec, section)
+
+def _format_chunk(rows: List[Dict[str, Any]], start: int, as_json: bool, invalid_only: bool) -> Tuple[bytes, int, int]:
+    return _format_results(_worker_engine.generate(rows, start), as_json, invalid_only)
+
+def write_names(spec: Dict[str, Any], section: str, rows: Iterable[Dict[str, Any]], output: io.BufferedIOBase,
+                as_json: bool = False, invalid_only: bool = False, workers: int = 1,
+                chunk_size: int = 20000) -> Tuple[int, int]:
+    """Generate names for a stream of shot-list rows and write them to output in row order.
+
+    Rows are cut into chunks; with workers > 1 the chunks are generated and serialized on a process
+    pool (a bounded number in flight, so memory stays flat however long the shot list is).
+    Returns (rows, invalid rows).
+    """
+    engine = NamingEngine(spec, section)
+    rows = iter(rows)
+    chunks = iter(lambda: list(islice(rows, chunk_size)), [])
+    count = invalid = 0
+    if workers <= 1:
+        for number, chunk in enumerate(chunks):
+            data, chunk_count, chunk_invalid = _format_results(
+                engine.generate(chunk, number * chunk_size + 1), as_json, invalid_only)
+            output.write(data)
+            count, invalid = count + chunk_count, invalid + chunk_invalid
+        return count, invalid
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_worker, initargs=(spec, section)) as executor:
+        pending = deque()
+        for number, chunk in enumerate(chunks):
+            pending.append(executor.submit(_format_chunk, chunk, number * chunk_size + 1, as_json, invalid_only))
+            while len(pending) >= workers * 2 or (pending and pending[0].done()):
+                data, chunk_count, chunk_invalid = pending.popleft().result()
+                output.write(data)
+                count, invalid = count + chunk_count, invalid + chunk_invalid
+        while pending:
+            data, chunk_count, chunk_invalid = pending.popleft().result()
+            output.write(data)
+            count, invalid = count + chunk_count, invalid + chunk_invalid
+    return count, invalid
@@ -0,0 +1,443 @@
+from typing import Dict, Any, Optional
+import io
+import time
+import logging
+from xml.sax.saxutils import escape
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, KeepTogether, HRFlowable
+from reportlab.lib.units import inch
+from services.section_cache import SectionCache
+from services.document_schema import DocumentIR, SectionBlock, GroupBlock, LetterheadBlock, date_lines
+from services.export_images import prepare_image_data
+from services.fonts import register_fonts
+from services.report import Report
+
+logger = logging.getLogger(__name__)
+
+class PdfRenderer:
+    """ReportLab rendering of the document IR and of generic reports (loaded on first PDF export)"""
+
+    def __init__(self, section_cache: SectionCache):
+        self.fonts = register_fonts()
+        self.styles = getSampleStyleSheet()
+        self.custom_styles = self._create_custom_styles()
+        self.section_cache = section_cache
+
+    def _create_custom_styles(self):
+        """Create custom styles for PDF generation with enhanced styling"""
+        custom_styles = {}
+        
+        # Enhanced title style with gradient-like effect
+        custom_styles['title'] = ParagraphStyle(
+            'CustomTitle',
+            parent=self.styles['Heading1'],
+            fontSize=26,
+            spaceAfter=20,
+            spaceBefore=10,
+            textColor=colors.HexColor('#1a365d'),  # Dark blue
+            alignment=1,  # Center alignment
+            fontName=self.fonts.bold,
+            borderWidth=2,
+            borderPadding=12,
+            borderColor=colors.HexColor('#3182ce'),
+            backColor=colors.HexColor('#f7fafc')  # Light background
+        )
+        
+        # Professional subtitle style
+        custom_styles['subtitle'] = ParagraphStyle(
+            'CustomSubtitle',
+            parent=self.styles['Normal'],
+            fontSize=14,
+            spaceAfter=25,
+            textColor=colors.HexColor('#4a5568'),  # Medium gray
+            alignment=1,
+            fontName=self.fonts.italic,
+            borderWidth=1,
+            borderPadding=8,
+            borderColor=colors.HexColor('#e2e8f0'),
+            backColor=colors.HexColor('#ffffff')
+        )
+        
+        # Enhanced section header with professional gradient effect
+        custom_styles['section'] = ParagraphStyle(
+            'CustomSection',
+            parent=self.styles['Heading2'],
+            fontSize=16,
+            spaceBefore=30,
+            spaceAfter=15,
+            textColor=colors.white,
+            leftIndent=15,
+            fontName=self.fonts.bold,
+            borderWidth=2,
+            borderPadding=12,
+            borderColor=colors.HexColor('#2d3748')
+        )
+        
+        # Enhanced subsection style
+        custom_styles['subsection'] = ParagraphStyle(
+            'CustomSubsection',
+            parent=self.styles['Heading3'],
+            fontSize=14,
+            spaceBefore=20,
+            spaceAfter=12,
+            textColor=colors.HexColor('#2d3748'),
+            leftIndent=10,
+            fontName=self.fonts.bold,
+            borderWidth=1,
+            borderPadding=8,
+            borderColor=colors.HexColor('#cbd5e0'),
+            backColor=colors.HexColor('#f7fafc')
+        )
+        
+        # Professional body text with subtle styling
+        custom_styles['body'] = ParagraphStyle(
+            'CustomBody',
+            parent=self.styles['Normal'],
+            fontSize=11,
+            spaceAfter=8,
+            leftIndent=25,
+            fontName=self.fonts.regular,
+            textColor=colors.HexColor('#2d3748')
+        )
+        
+        # Company info style
+        custom_styles['company'] = ParagraphStyle(
+            'CompanyInfo',
+            fontSize=20,
+            textColor=colors.HexColor('#1a365d'),
+            fontName=self.fonts.bold,
+            alignment=1,
+            spaceBefore=10,
+            spaceAfter=5
+        )
+        
+        # Contact info style
+        custom_styles['contact'] = ParagraphStyle(
+            'ContactInfo',
+            fontSize=11,
+            textColor=colors.HexColor('#4a5568'),
+            fontName=self.fonts.regular,
+            alignment=1,
+            spaceAfter=3
+        )
+        
+        # Date style with enhanced formatting
+        custom_styles['date'] = ParagraphStyle(
+            'DateStyle',
+            fontSize=11,
+            textColor=colors.HexColor('#718096'),
+            alignment=1,
+            fontName=self.fonts.italic,
+            borderWidth=1,
+            borderPadding=6,
+            borderColor=colors.HexColor('#e2e8f0'),
+            backColor=colors.HexColor('#f7fafc')
+        )
+        
+        return custom_styles
+
+    def _create_section_header(self, title, bg_color):
+        """Create a styled section header with enhanced background and borders"""
+        header_style = ParagraphStyle(
+            'SectionHeader',
+            fontSize=16,
+            spaceBefore=30,
+            spaceAfter=15,
+            textColor=colors.white,
+            leftIndent=15,
+            fontName=self.fonts.bold,
+            backColor=bg_color,
+            borderPadding=12,
+            borderWidth=2,
+            borderColor=colors.HexColor('#2d3748')
+        )
+        return Paragraph(title, header_style)
+
+    def _create_enhanced_divider_line(self, color=None, thickness=2):
+        """Create an enhanced horizontal divider line with professional styling"""
+        if color is None:
+            color = colors.HexColor('#3182ce')
+        return HRFlowable(width="100%", thickness=thickness, color=color, spaceBefore=10, spaceAfter=10)
+
+    def _create_decorative_border(self):
+        """Create a decorative border element"""
+        return HRFlowable(width="100%", thickness=3, color=colors.HexColor('#e2e8f0'), spaceBefore=5, spaceAfter=5)
+
+    def _get_logo_image(self, image_data: bytes, height=1*inch, width=2*inch,
+                        profile: Optional[Dict[str, Any]] = None) -> Optional[Image]:
+        """Convert decoded logo bytes to ReportLab Image with custom sizing"""
+        try:
+            image_buffer = io.BytesIO(prepare_image_data(image_data, width, height, profile))
+            
+            # Create ReportLab Image with custom dimensions
+            img = Image(image_buffer)
+            img.drawHeight = height
+            img.drawWidth = width
+            img.hAlign = 'CENTER'
+            return img
+        except Exception as e:
+            logger.error(f"Error processing logo: {str(e)}")
+        return None
+
+    def _create_styled_table(self, data, col_widths, bg_color=None, has_logos=False):
+        """Create a styled table with enhanced formatting and logo support"""
+        if not data:
+            return None
+            
+        table = Table(data, colWidths=col_widths)
+        
+        # Enhanced table styling with professional appearance
+        table_style = [
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), self.fonts.bold),
+            ('FONTNAME', (1, 0), (1, -1), self.fonts.regular),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 12),
+            ('LEFTPADDING', (0, 0), (-1, -1), 15),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#cbd5e0')),
+            ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
+            ('LINEBELOW', (0, 0), (-1, 0), 2, colors.HexColor('#3182ce')),  # Professional header line
+        ]
+        
+        # Add special styling for logo columns if present
+        if has_logos and len(col_widths) > 2:
+            table_style.extend([
+                ('ALIGN', (2, 0), (2, -1), 'CENTER'),
+                ('VALIGN', (2, 0), (2, -1), 'MIDDLE'),
+                ('FONTSIZE', (2, 0), (2, -1), 8),
+            ])
+        
+        # Apply background color to header if specified
+        if bg_color:
+            table_style.append(('BACKGROUND', (0, 0), (-1, 0), bg_color))
+        
+        table.setStyle(TableStyle(table_style))
+        return table
+
+    def render(self, document: DocumentIR, export_profile: Dict[str, Any]) -> bytes:
+        """Render the document IR to PDF"""
+        try:
+            logger.info(f"Generating enhanced professional styled PDF export (profile: {export_profile['name']})")
+            started = time.perf_counter()
+            
+            buffer = io.BytesIO()
+            doc = SimpleDocTemplate(
+                buffer, 
+                pagesize=A4, 
+                topMargin=0.75*inch, 
+                bottomMargin=0.75*inch,
+                leftMargin=0.75*inch,
+                rightMargin=0.75*inch,
+                pageCompression=1 if export_profile['page_compression'] else 0,
+                # Deterministic mode: fixed CreationDate and a content-derived /ID, so the file depends only on the document
+                invariant=1 if document.deterministic else 0
+            )
+            story = self._build_pdf_story(document, export_profile)
+            
+            # Build PDF with enhanced error handling
+            doc.build(story)
+            pdf_content = buffer.getvalue()
+            logger.info(f"Generated PDF (profile: {export_profile['name']}): {len(pdf_content)} bytes in {time.perf_counter() - started:.3f}s")
+            return pdf_content
+            
+        except Exception as e:
+            logger.error(f"Error generating PDF: {str(e)}")
+            raise
+
+    def _build_pdf_story(self, document: DocumentIR, export_profile: Dict[str, Any]) -> list:
+        """Assemble the PDF story, rebuilding only the sections whose input changed since the last export"""
+        used_sections = []
+
+        def cached(name, section_input, build):
+            used_sections.append(name)
+            return self.section_cache.get_or_build(document.spec_key, name, [export_profile['name'], section_input], build)
+
+        date_line, footer_line = date_lines(document.generated_at, document.deterministic)
+        letterhead = document.letterhead
+        
+        # ENHANCED HEADER SECTION WITH PROFESSIONAL STYLING
+        story = cached('letterhead', [letterhead.company_name, letterhead.contacts, letterhead.logo.digest if letterhead.logo else None],
+                       lambda: self._build_pdf_letterhead(letterhead, export_profile))
+        story += cached('title', date_line, lambda: self._build_pdf_title(date_line))
+        
+        for section in document.sections:
+            section_header = self._create_section_header(section.title.upper(), colors.HexColor(section.color))
+            story.append(KeepTogether([section_header]))
+            story.append(Spacer(1, 15))
+            
+            for group in section.groups:
+                story += cached(f'{section.key}.{group.key}', group.cache_input(),
+                                lambda section=section, group=group: self._build_pdf_group(section, group, export_profile))
+            
+            # Add decorative separator
+            story.append(self._create_decorative_border())
+            story.append(Spacer(1, 15))
+        
+        # PROFESSIONAL FOOTER
+        story += self._build_pdf_footer(footer_line)
+
+        self.section_cache.retain(document.spec_key, used_sections)
+        return story
+
+    def _build_pdf_letterhead(self, letterhead: LetterheadBlock, export_profile: Dict[str, Any]) -> list:
+        """Build the letterhead flowables: main logo, company name and contact details"""
+        header_elements = []
+        
+        # Main logo placement (top center or left)
+        if letterhead.logo:
+            logo_img = self._get_logo_image(letterhead.logo.data, height=1.2*inch, width=2.4*inch, profile=export_profile)
+            if logo_img:
+                header_elements.append(logo_img)
+                header_elements.append(Spacer(1, 15))
+        
+        # Company information with enhanced styling
+        if letterhead.company_name:
+            header_elements.append(Paragraph(letterhead.company_name, self.custom_styles['company']))
+            
+            # Contact information
+            for info in letterhead.contacts:
+                header_elements.append(Paragraph(info, self.custom_styles['contact']))
+            
+            header_elements.append(Spacer(1, 20))
+        return header_elements
+
+    def _build_pdf_title(self, date_line: str) -> list:
+        """Build the document title, subtitle and generation date"""
+        return [
+            # ENHANCED TITLE SECTION WITH BORDERS
+            Paragraph("IMAGE FORMAT EXCHANGE SPECS", self.custom_styles['title']),
+            # Professional subtitle with enhanced styling
+            Paragraph("Technical Consistency Across Processes", self.custom_styles['subtitle']),
+            Spacer(1, 15),
+            # Enhanced date with professional styling
+            Paragraph(date_line, self.custom_styles['date']),
+            # Professional divider with enhanced styling
+            Spacer(1, 25),
+            self._create_enhanced_divider_line(colors.HexColor('#3182ce'), 3),
+            Spacer(1, 30)
+        ]
+
+    def _build_pdf_group(self, section: SectionBlock, group: GroupBlock, export_profile: Dict[str, Any]) -> list:
+        """Build the flowables for one group of fields (a project information table, a camera, ...)"""
+        elements = []
+        if section.repeated:
+            # Enhanced subsection header for each entry (e.g. camera configuration)
+            subsection_style = ParagraphStyle(
+                'CameraSubsection',
+                fontSize=13,
+                spaceBefore=15,
+                spaceAfter=10,
+                textColor=colors.HexColor('#1a365d'),
+                fontName=self.fonts.bold,
+                borderWidth=1,
+                borderPadding=8,
+                borderColor=colors.HexColor(section.color),
+                backColor=colors.HexColor('#f0fff4')
+            )
+            elements.append(Paragraph(group.title, subsection_style))
+        
+        if not group.rows:
+            return elements
+        
+        if group.subsection:
+            elements.append(Paragraph(group.title, self.custom_styles['subsection']))
+        
+        # Project information uses a wider label column and more spacing
+        project_layout = section.key == 'projectInfo'
+        col_widths = [2.5*inch, 3.5*inch] if project_layout else [2.2*inch, 3.8*inch]
+        rows = [[f"{label}:", value] for label, value in group.rows]
+        
+        table = None
+        if group.logo:
+            logo_img = self._get_logo_image(group.logo.data, height=0.8*inch, width=1.2*inch, profile=export_profile)
+            if logo_img:
+                table = self._create_styled_table(rows + [[f"{group.logo.label}:", '', logo_img]],
+                                                  [2*inch, 2.5*inch, 1.5*inch], has_logos=True)
+        if table is None:
+            table = self._create_styled_table(rows, col_widths)
+        
+        elements.append(table)
+        elements.append(Spacer(1, 20 if project_layout else 15))
+        return elements
+
+    def _build_pdf_footer(self, footer_line: str) -> list:
+        """Build the document footer"""
+        footer_style = ParagraphStyle(
+            'FooterStyle',
+            fontSize=9,
+            textColor=colors.HexColor('#718096'),
+            alignment=1,
+            fontName=self.fonts.italic,
+            spaceBefore=10
+        )
+        return [
+            Spacer(1, 30),
+            self._create_enhanced_divider_line(colors.HexColor('#2b6cb0'), 3),
+            # Footer with document info
+            Paragraph(footer_line, footer_style)
+        ]
+
+    def render_report(self, report: Report, export_profile: Dict[str, Any]) -> bytes:
+        """Render a generic tabular report (change summary, conformance report, ...) to PDF"""
+        try:
+            started = time.perf_counter()
+            buffer = io.BytesIO()
+            doc = SimpleDocTemplate(
+                buffer,
+                pagesize=A4,
+                topMargin=0.75*inch,
+                bottomMargin=0.75*inch,
+                leftMargin=0.75*inch,
+                rightMargin=0.75*inch,
+                pageCompression=1 if export_profile['page_compression'] else 0,
+                invariant=1 if report.deterministic else 0,
+                title=report.title
+            )
+            date_line, footer_line = date_lines(report.generated_at, report.deterministic, "Report")
+            cell_style = ParagraphStyle('ReportCell', fontSize=9, leading=11, fontName=self.fonts.regular,
+                                        textColor=colors.HexColor('#2d3748'))
+            head_style = ParagraphStyle('ReportHead', parent=cell_style, fontName=self.fonts.bold, textColor=colors.white)
+
+            story = [Paragraph(escape(report.title), self.custom_styles['title'])]
+            if report.subtitle:
+                story.append(Paragraph(escape(report.subtitle), self.custom_styles['subtitle']))
+            story.append(Paragraph(date_line, self.custom_styles['date']))
+            story.append(Spacer(1, 20))
+            if report.summary:
+                summary = [[f"{label}:", Paragraph(escape(str(value)), cell_style)] for label, value in report.summary]
+                story.append(self._create_styled_table(summary, [2.2*inch, 3.8*inch]))
+                story.append(Spacer(1, 15))
+
+            width = doc.width
+            for table in report.tables:
+                story.append(KeepTogether([self._create_section_header(escape(table.title.upper()), colors.HexColor(table.color))]))
+                weights = table.weights or [1] * len(table.columns)
+                col_widths = [width * weight / sum(weights) for weight in weights]
+                data = [[Paragraph(escape(column), head_style) for column in table.columns]]
+                data += [[Paragraph(escape('' if cell is None else str(cell)), cell_style) for cell in row] for row in table.rows]
+                pdf_table = Table(data, colWidths=col_widths, repeatRows=1)
+                pdf_table.setStyle(TableStyle([
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(table.color)),
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#cbd5e0')),
+                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
+                    ('TOPPADDING', (0, 0), (-1, -1), 5),
+                    ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+                ]))
+                story.append(pdf_table)
+                story.append(Spacer(1, 15))
+
+            story += self._build_pdf_footer(footer_line)
+            doc.build(story)
+            pdf_content = buffer.getvalue()
+            logger.info(f"Generated report PDF '{report.title}': {len(pdf_content)} bytes in {time.perf_counter() - started:.3f}s")
+            return pdf_content
+
+        except Exception as e:
+            logger.error(f"Error generating report PDF: {str(e)}")
+            raise
@@ -0,0 +1,304 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+import mmap
+import os
+import re
+import struct
+from constants import PLATE_COLOR_PRIMARIES, PLATE_SCAN_CONFIG
+from services.name_conformance import scan_tree
+from services.naming import file_extension
+from services.report import Report, ReportTable
+
+# Header-only plate scanner: OpenEXR and DPX headers are parsed straight from a memory map of each
+# file, so only the header pages are ever read and no pixels are decoded. Files are scanned on a
+# thread pool (opening and mapping are syscalls that release the GIL) and checked against the
+# spec's vfxPulls technical fields.
+
+EXR_MAGIC = b'\x76\x2f\x31\x01'
+EXR_COMPRESSION = ['NONE', 'RLE', 'ZIPS', 'ZIP', 'PIZ', 'PXR24', 'B44', 'B44A', 'DWAA', 'DWAB', 'HTJ2K256', 'HTJ2K32']
+EXR_PIXEL_TYPES = {0: ('int', 32), 1: ('float', 16), 2: ('float', 32)}
+# Spec compression options that EXR headers name differently
+COMPRESSION_ALIASES = {'ZIP1': 'ZIPS', 'ZIP16': 'ZIP', 'NONE': 'NONE'}
+
+DPX_MAGIC = {b'SDPX': '>', b'XPDS': '<'}
+DPX_DESCRIPTORS = {1: 'R', 2: 'G', 3: 'B', 4: 'A', 6: 'Y', 50: 'RGB', 51: 'RGBA', 52: 'ABGR', 100: 'CbYCrY',
+                   101: 'CbYACrYA', 102: 'CbYCr', 103: 'CbYCrA'}
+# Transfer/colorimetric codes of SMPTE 268
+DPX_CHARACTERISTICS = {0: 'User defined', 1: 'Printing density', 2: 'Linear', 3: 'Logarithmic',
+                       4: 'Unspecified video', 5: 'SMPTE 274M', 6: 'Rec. 709', 7: 'Rec. 601 B/G', 8: 'Rec. 601 M',
+                       9: 'NTSC', 10: 'PAL', 11: 'Z linear', 12: 'Z homogeneous', 13: 'ADX', 14: 'Rec. 2020',
+                       15: 'Rec. 2020', 16: 'xvYCC', 17: 'Rec. 2100'}
+
+# CIE xy of red, green, blue and white for EXR chromaticities attributes
+_PRIMARIES = {
+    'ACES AP0': (0.7347, 0.2653, 0.0, 1.0, 0.0001, -0.077, 0.32168, 0.33767),
+    'ACES AP1': (0.713, 0.293, 0.165, 0.830, 0.128, 0.044, 0.32168, 0.33767),
+    'Rec. 709': (0.64, 0.33, 0.30, 0.60, 0.15, 0.06, 0.3127, 0.3290),
+    'Rec. 2020': (0.708, 0.292, 0.170, 0.797, 0.131, 0.046, 0.3127, 0.3290),
+    'P3-D65': (0.680, 0.320, 0.265, 0.690, 0.150, 0.060, 0.3127, 0.3290)
+}
+
+@dataclass
+class PlateHeader:
+    path: str
+    format: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    compression: Optional[str] = None
+    # Channel name -> (sample kind, bits)
+    channels: Dict[str, Tuple[str, int]] = field(default_factory=dict)
+    primaries: Optional[str] = None
+    transfer: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def bit_depth(self) -> Optional[Tuple[str, int]]:
+        depths = set(self.channels.values())
+        return depths.pop() if len(depths) == 1 else None
+
+def _primaries_name(values: Tuple[float, ...]) -> str:
+    for name, reference in _PRIMARIES.items():
+        if all(abs(a - b) < 0.002 for a, b in zip(values, reference)):
+            return name
+    return 'custom (' + ', '.join(f"{value:.4f}" for value in values) + ')'
+
+def _read_exr(data: mmap.mmap, header: PlateHeader):
+    version = struct.unpack_from('<I', data, 4)[0]
+    if version & 0x1000:
+        header.format = 'OpenEXR (multi-part, first part)'
+    else:
+        header.format = 'OpenEXR (tiled)' if version & 0x200 else 'OpenEXR'
+    limit = min(len(data), PLATE_SCAN_CONFIG["max_header_bytes"])
+    offset = 8
+    while True:
+        end = data.find(b'\0', offset, limit)
+        if end < 0:
+            raise ValueError("truncated EXR header")
+        if end == offset:
+            return
+        name = data[offset:end].decode('latin-1')
+        type_end = data.find(b'\0', end + 1, limit)
+        if type_end < 0:
+            raise ValueError("truncated EXR header")
+        attribute_type = data[end + 1:type_end]
+        size = struct.unpack_from('<i', data, type_end + 1)[0]
+        start = type_end + 5
+        if size < 0 or start + size > limit:
+            raise ValueError(f"corrupt EXR attribute {name}")
+        if name == 'dataWindow' and attribute_type == b'box2i':
+            x_min, y_min, x_max, y_max = struct.unpack_from('<4i', data, start)
+            header.width, header.height = x_max - x_min + 1, y_max - y_min + 1
+        elif name == 'compression' and attribute_type == b'compression':
+            code = data[start]
+            header.compression = EXR_COMPRESSION[code] if code < len(EXR_COMPRESSION) else f"unknown ({code})"
+        elif name == 'channels' and attribute_type == b'chlist':
+            position, channels_end = start, start + size - 1
+            while position < channels_end:
+                name_end = data.find(b'\0', position, channels_end)
+                if name_end < 0:
+                    break
+                pixel_type = struct.unpack_from('<i', data, name_end + 1)[0]
+                header.channels[data[position:name_end].decode('latin-1')] = EXR_PIXEL_TYPES.get(pixel_type, ('unknown', 0))
+                position = name_end + 17
+        elif name == 'chromaticities' and attribute_type == b'chromaticities':
+            header.primaries = _primaries_name(struct.unpack_from('<8f', data, start))
+        elif name == 'acesImageContainerFlag' and attribute_type == b'int' and struct.unpack_from('<i', data, start)[0] == 1:
+            header.primaries = header.primaries or 'ACES AP0'
+        offset = start + size
+
+def _read_dpx(data: mmap.mmap, header: PlateHeader, order: str):
+    if len(data) < 812:
+        raise ValueError("truncated DPX header")
+    header.format = 'DPX'
+    header.width, header.height = struct.unpack_from(f'{order}II', data, 772)
+    descriptor, transfer, colorimetric, bit_size = struct.unpack_from('4B', data, 800)
+    encoding = struct.unpack_from(f'{order}H', data, 806)[0]
+    header.compression = 'NONE' if encoding == 0 else 'RLE' if encoding == 1 else f"unknown ({encoding})"
+    # 32/64-bit DPX samples are IEEE floats, smaller ones integers
+    depth = ('float', bit_size) if bit_size in (32, 64) else ('int', bit_size)
+    header.channels = {channel: depth for channel in DPX_DESCRIPTORS.get(descriptor, f"?{descriptor}")}
+    header.transfer = DPX_CHARACTERISTICS.get(transfer, f"code {transfer}")
+    primaries = DPX_CHARACTERISTICS.get(colorimetric)
+    header.primaries = primaries if primaries in _PRIMARIES else None
+
+def read_header(path: str) -> PlateHeader:
+    """Plate properties from an EXR or DPX header; errors are reported on the header, not raised"""
+    header = PlateHeader(path)
+    try:
+        with open(path, 'rb') as f:
+            # Mapping is lazy: only the pages the parser touches are read from disk
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                magic = data[:4]
+                if magic == EXR_MAGIC:
+                    _read_exr(data, header)
+                elif magic in DPX_MAGIC:
+                    _read_dpx(data, header, DPX_MAGIC[magic])
+                else:
+                    header.error = "not an OpenEXR or DPX file"
+    except (OSError, ValueError, struct.error, IndexError) as e:
+        header.error = str(e) or e.__class__.__name__
+    return header
+
+def plate_files(paths: Iterable[Path], workers: int = PLATE_SCAN_CONFIG["workers"]) -> Iterator[str]:
+    """EXR/DPX files named directly or found under directories"""
+    extensions = tuple(PLATE_SCAN_CONFIG["extensions"])
+    for path in paths:
+        if path.is_dir():
+            for directory, names in scan_tree(path, workers):
+                for name in sorted(names):
+                    if name.lower().endswith(extensions):
+                        yield os.path.join(directory, name)
+        else:
+            yield str(path)
+
+def scan_headers(files: Iterable[str], workers: int = PLATE_SCAN_CONFIG["workers"]) -> Iterator[PlateHeader]:
+    """Headers of every file, read on a thread pool, in input order (with a bounded number in flight)"""
+    workers = max(workers, 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for path in files:
+            pending.append(executor.submit(read_header, path))
+            if len(pending) >= workers * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _resolution(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    match = re.match(r'\s*(\d+)\s*[xX×]\s*(\d+)', value or '')
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+def _bit_depth(value: Optional[str]) -> Optional[Tuple[str, int]]:
+    match = re.match(r'\s*(\d+)-bit', value or '')
+    if not match:
+        return None
+    return ('float' if re.search(r'float|half', value, re.I) else 'int', int(match.group(1)))
+
+def _spec_primaries(value: Optional[str]) -> Optional[str]:
+    for name in sorted(PLATE_COLOR_PRIMARIES, key=len, reverse=True):
+        if (value or '').strip().startswith(name):
+            return PLATE_COLOR_PRIMARIES[name]
+    return None
+
+def _describe_depth(depth: Optional[Tuple[str, int]]) -> str:
+    if depth is None:
+        return 'mixed'
+    kind, bits = depth
+    return f"{bits}-bit {'half float' if (kind, bits) == ('float', 16) else kind}"
+
+def _common_root(directories: List[str]) -> str:
+    """Deepest directory containing all of them ('' when there is none, e.g. on different drives)"""
+    try:
+        return os.path.commonpath([os.path.abspath(directory) for directory in directories]) if directories else ''
+    except ValueError:
+        return ''
+
+class PlateConformance:
+    """Checks plate headers against a spec's vfxPulls fields and summarizes them per directory"""
+
+    def __init__(self, spec: Dict[str, Any], max_examples: int = PLATE_SCAN_CONFIG["max_issue_examples"]):
+        pulls = spec.get('vfxPulls') or {}
+        self.spec = spec
+        self.pulls = pulls
+        self.max_examples = max_examples
+        self.expected = {
+            'format': file_extension(pulls.get('fileFormat')) if pulls.get('fileFormat') else None,
+            'resolution': _resolution(pulls.get('resolution')),
+            'compression': (pulls.get('compression') or '').strip().upper() or None,
+            'bitDepth': _bit_depth(pulls.get('bitDepth')),
+            'primaries': _spec_primaries(pulls.get('colorSpace'))
+        }
+        self.scanned = 0
+        self.failed_files = 0
+        # (check, expected, found) -> [count, example paths]
+        self.issues: Dict[Tuple[str, str, str], List[Any]] = {}
+        # (directory, properties) -> [files, first name, last name]
+        self.groups: Dict[Tuple[str, Tuple[str, ...]], List[Any]] = {}
+
+    def check(self, header: PlateHeader) -> List[Tuple[str, str, str]]:
+        """(check, expected, found) for every way the plate deviates from the spec"""
+        if header.error:
+            return [('readable', 'EXR/DPX header', header.error)]
+        expected, issues = self.expected, []
+        extension = 'exr' if header.format.startswith('OpenEXR') else 'dpx'
+        if expected['format'] and expected['format'] != extension:
+            issues.append(('fileFormat', self.pulls.get('fileFormat'), header.format))
+        if expected['resolution'] and expected['resolution'] != (header.width, header.height):
+            issues.append(('resolution', '{} x {}'.format(*expected['resolution']), f"{header.width} x {header.height}"))
+        if expected['compression'] and header.compression != COMPRESSION_ALIASES.get(expected['compression'], expected['compression']):
+            issues.append(('compression', self.pulls.get('compression'), header.compression))
+        if expected['bitDepth'] and header.bit_depth != expected['bitDepth']:
+            found = _describe_depth(header.bit_depth) if header.bit_depth else ', '.join(
+                f"{channel}: {_describe_depth(depth)}" for channel, depth in header.channels.items())
+            issues.append(('bitDepth', self.pulls.get('bitDepth'), found))
+        # Headers without chromaticities are not held against the plate
+        if expected['primaries'] and header.primaries and header.primaries != expected['primaries']:
+            issues.append(('colorSpace', f"{self.pulls.get('colorSpace')} ({expected['primaries']})", header.primaries))
+        return issues
+
+    def add(self, header: PlateHeader) -> List[Tuple[str, str, str]]:
+        issues = self.check(header)
+        self.scanned += 1
+        if issues:
+            self.failed_files += 1
+        for issue in issues:
+            entry = self.issues.setdefault(issue, [0, []])
+            entry[0] += 1
+            if len(entry[1]) < self.max_examples:
+                entry[1].append(header.path)
+        directory, name = os.path.split(header.path)
+        properties = (header.format or '-', f"{header.width} x {header.height}" if header.width else '-',
+                      header.compression or '-', _describe_depth(header.bit_depth) if header.channels else '-',
+                      ','.join(header.channels) or '-', header.primaries or header.transfer or '-',
+                      'FAIL' if issues else 'OK')
+        group = self.groups.get((directory, properties))
+        if group is None:
+            self.groups[(directory, properties)] = [1, name, name]
+        else:
+            group[0] += 1
+            group[2] = name
+        return issues
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "scanned": self.scanned,
+            "conforming": self.scanned - self.failed_files,
+            "failed": self.failed_files,
+            "expected": {check: self.pulls.get(key) for check, key in (
+                ("fileFormat", "fileFormat"), ("resolution", "resolution"), ("compression", "compression"),
+                ("bitDepth", "bitDepth"), ("colorSpace", "colorSpace"))},
+            "issues": [{"check": check, "expected": expected, "found": found, "files": count, "examples": examples}
+                       for (check, expected, found), (count, examples) in self.issues.items()],
+            "groups": [{"directory": directory, "files": count, "first": first, "last": last,
+                        **dict(zip(("format", "resolution", "compression", "bitDepth", "channels", "color", "result"),
+                                   properties))}
+                       for (directory, properties), (count, first, last) in sorted(self.groups.items())]
+        }
+
+    def report(self, seconds: Optional[float] = None) -> Report:
+        """Conformance report for ExportService.render_report_pdf"""
+        summary = self.summary()
+        project = (self.spec.get('projectInfo') or {}).get('projectTitle') or 'Untitled'
+        directories = [group["directory"] for group in summary["groups"]]
+        root = _common_root(directories)
+        details = [("Project", project), ("Location", root or '.'), ("Plates scanned", str(summary["scanned"])),
+                   ("Conforming", str(summary["conforming"])), ("Not conforming", str(summary["failed"]))]
+        if seconds is not None:
+            details.append(("Scan time", f"{seconds:.2f}s"))
+        details += [(f"Expected {check}", value) for check, value in summary["expected"].items() if value]
+        tables = []
+        if summary["issues"]:
+            tables.append(ReportTable("Issues", ["Check", "Expected", "Found", "Files", "Examples"],
+                                      [[issue["check"], str(issue["expected"]), str(issue["found"]), str(issue["files"]),
+                                        ", ".join(os.path.basename(path) for path in issue["examples"])]
+                                       for issue in summary["issues"]],
+                                      weights=[1.2, 2, 2, 0.8, 3], color="#c53030"))
+        tables.append(ReportTable("Plates", ["Directory", "Files", "Format", "Resolution", "Compression",
+                                             "Samples", "Color", "Result"],
+                                  [[os.path.relpath(group["directory"], root) if root else group["directory"], str(group["files"]), group["format"], group["resolution"],
+                                    group["compression"], f"{group['bitDepth']} ({group['channels']})", group["color"],
+                                    group["result"]] for group in summary["groups"]],
+                                  weights=[1.6, 0.8, 1.3, 1.5, 1.9, 2.0, 1.6, 1.0]))
+        return Report(title="PLATE CONFORMANCE REPORT", subtitle=project, summary=details, tables=tables)
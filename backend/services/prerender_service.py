@@ -0,0 +1,60 @@
+from typing import Optional, Set, Tuple
+import asyncio
+import logging
+from models.vfx_spec import VFXSpec
+from services.artifact_store import ArtifactStore
+from services.export_pool import ExportPool
+from services.export_service import ExportService, SUPPORTED_FORMATS
+from services.single_flight import SingleFlight
+from constants import DEFAULT_EXPORT_PROFILE
+
+logger = logging.getLogger(__name__)
+
+class PrerenderService:
+    """Renders stored specs ahead of download and serves the artifacts by spec version"""
+
+    def __init__(self, export_service: ExportService, export_pool: ExportPool, store: ArtifactStore, enabled: bool = False):
+        self.export_service = export_service
+        self.export_pool = export_pool
+        self.store = store
+        self.enabled = enabled
+        self._tasks: Set[asyncio.Task] = set()
+        # Renders in progress, keyed by (spec id, updatedAt, profile, format)
+        self.in_flight = SingleFlight()
+
+    def enqueue(self, spec: VFXSpec):
+        """Schedule a background pre-render of every export format (no-op unless enabled)"""
+        if not self.enabled:
+            return
+        task = asyncio.create_task(self._prerender(spec))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _prerender(self, spec: VFXSpec):
+        try:
+            await asyncio.gather(*(self.get_or_render(spec, export_format)
+                                   for export_format in SUPPORTED_FORMATS))
+            logger.info(f"Pre-rendered exports for spec {spec.id} ({spec.updatedAt.isoformat()})")
+        except Exception as e:
+            logger.error(f"Error pre-rendering spec {spec.id}: {str(e)}")
+
+    async def discard(self, spec_id: str):
+        """Delete every stored artifact of a spec, once renders of it that are still running have finished"""
+        await self.in_flight.wait(lambda key: key[0] == spec_id)
+        await asyncio.to_thread(self.store.purge, spec_id)
+
+    async def get_or_render(self, spec: VFXSpec, export_format: str, profile: Optional[str] = None) -> Tuple[bytes, bool]:
+        """Return (content, was_prerendered) for the spec's current version, rendering on demand if stale"""
+        profile = profile or DEFAULT_EXPORT_PROFILE
+        content = self.store.get(spec.id, spec.updatedAt, profile, export_format)
+        if content is not None:
+            return content, True
+
+        key = (spec.id, spec.updatedAt, profile, export_format)
+        return await self.in_flight.do(key, lambda: self._render(spec, export_format, profile)), False
+
+    async def _render(self, spec: VFXSpec, export_format: str, profile: str) -> bytes:
+        document = self.export_service.normalize(spec.dict())
+        content = await self.export_pool.render(document, export_format, profile)
+        await asyncio.to_thread(self.store.put, spec.id, spec.updatedAt, profile, export_format, content)
+        return content
@@ -0,0 +1,26 @@
+from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime
+
+# Generic tabular report rendered by ExportService.render_report_pdf (change summaries,
+# conformance reports, ...). Everything is plain text; the renderer handles escaping and wrapping.
+
+@dataclass
+class ReportTable:
+    title: str
+    columns: List[str]
+    rows: List[List[str]]
+    # Relative column widths (defaults to equal widths)
+    weights: Optional[List[float]] = None
+    color: str = "#2b6cb0"
+
+@dataclass
+class Report:
+    title: str
+    subtitle: Optional[str] = None
+    # Key/value rows shown under the title
+    summary: List[Tuple[str, str]] = field(default_factory=list)
+    tables: List[ReportTable] = field(default_factory=list)
+    generated_at: datetime = field(default_factory=datetime.utcnow)
+    # Render reproducibly (fixed PDF CreationDate and /ID)
+    deterministic: bool = False
@@ -0,0 +1,119 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+import logging
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError
+from services import json_diff
+from constants import REVISION_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class RevisionService:
+    """Append-only spec history: JSON diffs between successive versions plus periodic full snapshots.
+
+    Revision 1 is the spec as created. Revision numbers come from the spec document's own revision
+    counter, incremented by the write itself, so concurrent writes can never swap places in the
+    history. Each later revision stores the diff from the previous one, except every
+    snapshot_every-th revision, which stores the whole document so rebuilding any revision replays
+    a bounded number of diffs.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection = db.vfx_spec_revisions
+
+    async def ensure_indexes(self):
+        await self.collection.create_index([("specId", ASCENDING), ("revision", DESCENDING)], unique=True)
+
+    async def record(self, spec_id: str, revision: int, before: Optional[Dict[str, Any]], after: Dict[str, Any]):
+        """Store the revision allocated by a write (before is None for a newly created spec)"""
+        base = None
+        if before is not None:
+            base = before.get("revision")
+            if base is None:
+                # The spec predates its history: keep the pre-edit state as revision 0
+                base = 0
+                try:
+                    await self._insert(spec_id, base, None, before)
+                except DuplicateKeyError:
+                    pass
+        # A diff is only replayable on top of the revision it was taken from
+        await self._insert(spec_id, revision, before if base == revision - 1 else None, after)
+        await self._apply_retention(spec_id, revision)
+
+    async def _insert(self, spec_id: str, revision: int, before: Optional[Dict[str, Any]], after: Dict[str, Any]):
+        entry = {
+            "specId": spec_id,
+            "revision": revision,
+            "recordedAt": datetime.utcnow(),
+            "documentVersion": (after.get("projectInfo") or {}).get("documentVersion")
+        }
+        if before is None or (revision - 1) % REVISION_CONFIG["snapshot_every"] == 0:
+            entry.update(kind="snapshot", snapshot=after)
+        else:
+            ops = json_diff.diff(before, after)
+            entry.update(kind="diff", ops=ops, changes=len(ops))
+        await self.collection.insert_one(entry)
+
+    async def list_revisions(self, spec_id: str) -> List[Dict[str, Any]]:
+        """Revision metadata, newest first (no document bodies)"""
+        cursor = self.collection.find({"specId": spec_id}, {"_id": 0, "snapshot": 0, "ops": 0}) \
+            .sort("revision", DESCENDING)
+        return await cursor.to_list(length=None)
+
+    async def get_revision(self, spec_id: str, revision: int) -> Optional[Dict[str, Any]]:
+        """Rebuild the spec document as it was at a revision"""
+        base = await self.collection.find_one(
+            {"specId": spec_id, "kind": "snapshot", "revision": {"$lte": revision}},
+            {"_id": 0}, sort=[("revision", DESCENDING)]
+        )
+        if base is None:
+            return None
+
+        document, current = base["snapshot"], base["revision"]
+        cursor = self.collection.find(
+            {"specId": spec_id, "revision": {"$gt": current, "$lte": revision}},
+            {"_id": 0, "revision": 1, "kind": 1, "ops": 1, "snapshot": 1}
+        ).sort("revision", ASCENDING)
+        async for entry in cursor:
+            if entry["kind"] == "snapshot":
+                document = entry["snapshot"]
+            elif entry["revision"] != current + 1:
+                # The revision this diff applies to was never recorded
+                return None
+            else:
+                document = json_diff.patch(document, entry["ops"])
+            current = entry["revision"]
+        return document if current == revision else None
+
+    async def _apply_retention(self, spec_id: str, latest: int):
+        """Prune old revisions, rebasing the oldest kept revision onto a full snapshot"""
+        cutoff = 0
+        if REVISION_CONFIG["max_revisions"]:
+            cutoff = max(cutoff, latest - REVISION_CONFIG["max_revisions"] + 1)
+        if REVISION_CONFIG["max_age_days"]:
+            oldest_kept = await self.collection.find_one(
+                {"specId": spec_id,
+                 "recordedAt": {"$gte": datetime.utcnow() - timedelta(days=REVISION_CONFIG["max_age_days"])}},
+                {"_id": 0, "revision": 1}, sort=[("revision", ASCENDING)]
+            )
+            cutoff = max(cutoff, oldest_kept["revision"] if oldest_kept else latest)
+
+        oldest = await self.collection.find_one({"specId": spec_id}, {"_id": 0, "revision": 1},
+                                                sort=[("revision", ASCENDING)])
+        if oldest is None or oldest["revision"] >= cutoff:
+            return
+
+        entry = await self.collection.find_one({"specId": spec_id, "revision": cutoff}, {"_id": 0, "kind": 1})
+        if entry and entry["kind"] != "snapshot":
+            document = await self.get_revision(spec_id, cutoff)
+            await self.collection.update_one(
+                {"specId": spec_id, "revision": cutoff},
+                {"$set": {"kind": "snapshot", "snapshot": document}, "$unset": {"ops": "", "changes": ""}}
+            )
+        result = await self.collection.delete_many({"specId": spec_id, "revision": {"$lt": cutoff}})
+        logger.info(f"Pruned {result.deleted_count} revisions of spec {spec_id} (keeping {cutoff}-{latest})")
+
+    async def purge(self, spec_id: str):
+        """Drop a spec's whole history"""
+        await self.collection.delete_many({"specId": spec_id})
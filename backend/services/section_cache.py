@@ -0,0 +1,92 @@
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+from collections import OrderedDict
+import copy
+import hashlib
+import json
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SectionCache:
+    """Per-spec cache of built PDF section flowables, keyed by a hash of each section's input"""
+
+    def __init__(self, max_specs: int = 64):
+        self.max_specs = max_specs
+        # spec key -> {section name: (input digest, flowables)}
+        self._specs: "OrderedDict[str, Dict[str, Tuple[str, List[Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # (shared array, offset) the counters are mirrored to, for caches living in pool workers
+        self._shared = None
+
+    @staticmethod
+    def digest(section_input: Any) -> str:
+        """Hash a section's input into a stable digest"""
+        encoded = json.dumps(section_input, sort_keys=True, separators=(',', ':'), default=str).encode()
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    def get_or_build(self, spec_key: str, section: str, section_input: Any,
+                     build: Callable[[], List[Any]]) -> List[Any]:
+        """Return the flowables for a section, rebuilding them only when the section input changed"""
+        digest = self.digest(section_input)
+        with self._lock:
+            sections = self._specs.get(spec_key)
+            if sections is not None:
+                self._specs.move_to_end(spec_key)
+                cached = sections.get(section)
+                if cached and cached[0] == digest:
+                    self.hits += 1
+                    self._publish()
+                    return self._copy(cached[1])
+
+        flowables = build()
+
+        with self._lock:
+            self.misses += 1
+            sections = self._specs.setdefault(spec_key, {})
+            sections[section] = (digest, flowables)
+            self._specs.move_to_end(spec_key)
+            while len(self._specs) > self.max_specs:
+                self._specs.popitem(last=False)
+            self._publish()
+        return self._copy(flowables)
+
+    def retain(self, spec_key: str, sections: Iterable[str]):
+        """Drop cached sections that are no longer part of the spec (e.g. a removed camera)"""
+        keep = set(sections)
+        with self._lock:
+            cached = self._specs.get(spec_key)
+            if cached:
+                for section in [name for name in cached if name not in keep]:
+                    del cached[section]
+
+    def discard(self, spec_key: str):
+        """Forget every cached section of a spec"""
+        with self._lock:
+            self._specs.pop(spec_key, None)
+            self._publish()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "specs": len(self._specs)}
+
+    def share(self, array, offset: int):
+        """Mirror hits, misses and size into array[offset:offset + 3] (a multiprocessing Array), so
+        another process can read the counters of this cache"""
+        with self._lock:
+            self._shared = (array, offset)
+            self._publish()
+
+    def _publish(self):
+        # Called with the lock held
+        if self._shared is not None:
+            array, offset = self._shared
+            array[offset:offset + 3] = [self.hits, self.misses, len(self._specs)]
+
+    @staticmethod
+    def _copy(flowables: List[Any]) -> List[Any]:
+        # Layout stores wrap results on the flowable instances, so hand out shallow copies
+        return [copy.copy(flowable) for flowable in flowables]
@@ -0,0 +1,50 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+import asyncio
+import hashlib
+import orjson
+
+T = TypeVar("T")
+
+def payload_digest(payload: Any) -> str:
+    """Canonical hash of a JSON payload: key order and formatting don't change it"""
+    return hashlib.blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution whose result they all share.
+
+    Only in-flight work is shared: once the call finishes its key is released and the next call
+    runs again (caching finished results is the caller's business). The call runs as its own task,
+    so a caller that disconnects does not cancel the work the others are waiting on.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Retrieved here so an error nobody is left waiting for isn't reported as unhandled
+            task.exception()
+
+    async def wait(self, match: Callable[[Hashable], bool]):
+        """Wait for every in-flight call whose key matches, ignoring their results"""
+        tasks = [task for key, task in self._inflight.items() if match(key)]
+        if tasks:
+            await asyncio.gather(*(asyncio.shield(task) for task in tasks), return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {"executions": self.executions, "coalesced": self.coalesced, "in_flight": len(self._inflight)}
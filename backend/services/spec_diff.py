@@ -0,0 +1,137 @@
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import re
+import orjson
+from models.vfx_spec import VFXSpec
+from services.document_schema import DOCUMENT_SCHEMA, should_include_field
+from services.report import Report, ReportTable
+
+# Field-level comparison of two spec documents, for "what changed between v1.2 and v1.3".
+# Each change: {"section", "path", "label", "change": added|removed|modified, "before", "after"}
+
+# Bookkeeping fields that change on every save (or, for camera entries, on reordering)
+IGNORED_FIELDS = {"id", "revision", "createdAt", "updatedAt"}
+
+# List sections whose entries are matched by a key field instead of by position
+KEYED_LISTS = {"cameraFormats": "cameraId"}
+
+SECTION_TITLES = {"name": "Name", "letterheadInfo": "Letterhead",
+                  **{section.key: section.title for section in DOCUMENT_SCHEMA}}
+SECTION_COLORS = {section.key: section.color for section in DOCUMENT_SCHEMA}
+
+def _humanize(name: str) -> str:
+    return re.sub(r'(?<!^)(?=[A-Z])', ' ', name).title()
+
+def _field_labels() -> Dict[str, Dict[str, str]]:
+    """section -> field -> label, from the model field titles (humanized name when untitled)"""
+    labels = {}
+    for section, model_field in VFXSpec.model_fields.items():
+        annotation = model_field.annotation
+        model = getattr(annotation, '__args__', (annotation,))[0]
+        if hasattr(model, 'model_fields'):
+            labels[section] = {name: sub_field.title or _humanize(name)
+                               for name, sub_field in model.model_fields.items()}
+    return labels
+
+FIELD_LABELS = _field_labels()
+
+def digest(value: Any) -> str:
+    """Stable hash of a JSON subtree"""
+    return hashlib.blake2b(orjson.dumps(value, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+def _same(before: Any, after: Any) -> bool:
+    if isinstance(before, (dict, list)) or isinstance(after, (dict, list)):
+        return digest(before) == digest(after)
+    return before == after
+
+def display_value(value: Any) -> Any:
+    """Value as shown in a change report: logos are summarized instead of shipping image data"""
+    if isinstance(value, dict) and 'dataUrl' in value:
+        return f"Image {value.get('width')}x{value.get('height')} ({digest(value.get('dataUrl'))[:8]})"
+    return value
+
+def _change(section: str, path: str, label: str, before: Any, after: Any) -> Optional[Dict[str, Any]]:
+    had, has = should_include_field(before), should_include_field(after)
+    if not had and not has:
+        return None
+    kind = "added" if not had else "removed" if not has else "modified"
+    return {"section": section, "path": path, "label": label, "change": kind,
+            "before": display_value(before) if had else None, "after": display_value(after) if has else None}
+
+def _diff_fields(section: str, path: str, labels: Dict[str, str], old: Dict[str, Any], new: Dict[str, Any],
+                 label_prefix: str = "") -> List[Dict[str, Any]]:
+    changes = []
+    names = list(labels) + [name for name in {**old, **new} if name not in labels]
+    for name in names:
+        before, after = old.get(name), new.get(name)
+        if name in IGNORED_FIELDS or _same(before, after):
+            continue
+        change = _change(section, f"{path}.{name}", label_prefix + labels.get(name, name), before, after)
+        if change:
+            changes.append(change)
+    return changes
+
+def _keyed(items: List[Dict[str, Any]], key_field: str) -> Dict[str, Dict[str, Any]]:
+    """Index list entries by key field, falling back to position for missing or duplicate keys"""
+    keyed = {}
+    for index, item in enumerate(items, 1):
+        key = item.get(key_field)
+        if not key or key in keyed:
+            key = f"#{index}"
+        keyed[key] = item
+    return keyed
+
+def diff_specs(a: Dict[str, Any], b: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Structural diff of two specs, skipping every subtree whose hash is unchanged"""
+    changes = []
+    sections = list(SECTION_TITLES) + [key for key in {**a, **b} if key not in SECTION_TITLES]
+    for section in sections:
+        if section in IGNORED_FIELDS:
+            continue
+        old, new = a.get(section), b.get(section)
+        if _same(old, new):
+            continue
+
+        labels = FIELD_LABELS.get(section, {})
+        if section in KEYED_LISTS:
+            old_items = _keyed(old or [], KEYED_LISTS[section])
+            new_items = _keyed(new or [], KEYED_LISTS[section])
+            for key in list(old_items) + [key for key in new_items if key not in old_items]:
+                before, after = old_items.get(key, {}), new_items.get(key, {})
+                if not _same(before, after):
+                    changes += _diff_fields(section, f"{section}[{key}]", labels, before, after, f"{key} - ")
+        elif isinstance(old or {}, dict) and isinstance(new or {}, dict):
+            changes += _diff_fields(section, section, labels, old or {}, new or {})
+        else:
+            change = _change(section, section, SECTION_TITLES.get(section, section), old, new)
+            if change:
+                changes.append(change)
+    return changes
+
+def summarize(changes: List[Dict[str, Any]]) -> Dict[str, int]:
+    summary = {"added": 0, "removed": 0, "modified": 0}
+    for change in changes:
+        summary[change["change"]] += 1
+    return summary
+
+def change_report(changes: List[Dict[str, Any]], a_label: str, b_label: str,
+                  details: List[Tuple[str, str]]) -> Report:
+    """Lay out a change summary as a report, one table per section"""
+    tables = []
+    for section in dict.fromkeys(change["section"] for change in changes):
+        rows = [[change["label"], change["change"], _text(change["before"]), _text(change["after"])]
+                for change in changes if change["section"] == section]
+        tables.append(ReportTable(SECTION_TITLES.get(section, section), ["Field", "Change", "Before", "After"], rows,
+                                  weights=[3, 1.3, 3, 3], color=SECTION_COLORS.get(section, "#4a5568")))
+    counts = summarize(changes)
+    summary = details + [("Changes", f"{len(changes)} ({counts['modified']} modified, "
+                                     f"{counts['added']} added, {counts['removed']} removed)")]
+    return Report(title="SPECIFICATION CHANGE SUMMARY", subtitle=f"{a_label} vs. {b_label}",
+                  summary=summary, tables=tables)
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    return str(value)
@@ -0,0 +1,56 @@
+from typing import Any, Optional
+import gzip
+import hashlib
+import logging
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+from middleware.compression import parse_accept_encoding
+
+logger = logging.getLogger(__name__)
+
+class StaticPayload:
+    """A JSON payload serialized, gzipped and hashed once, then served with ETag revalidation"""
+
+    # Unversioned URL: clients may reuse it for a day but must revalidate after that
+    CACHE_CONTROL = "public, max-age=86400"
+    # Versioned URL: the content behind it never changes
+    IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+    def __init__(self, data: Any):
+        self.body = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+        self.gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        self.version = hashlib.blake2b(self.body, digest_size=8).hexdigest()
+        # Each encoding is its own representation, so each gets its own strong validator
+        self.etag = f'"{self.version}"'
+        self.gzip_etag = f'"{self.version}-gz"'
+        logger.info(f"Precompiled payload {self.version}: {len(self.body)} bytes, {len(self.gzip_body)} gzipped")
+
+    def not_modified(self, request: Request, etag: str) -> bool:
+        """Check If-None-Match against the ETag of the representation being served"""
+        header = request.headers.get('if-none-match')
+        if not header:
+            return False
+        tags = [tag.strip() for tag in header.split(',')]
+        return '*' in tags or any(tag.removeprefix('W/') == etag for tag in tags)
+
+    @staticmethod
+    def accepts_gzip(request: Request) -> bool:
+        accepted = parse_accept_encoding(request.headers.get('accept-encoding', ''))
+        return accepted.get('gzip', accepted.get('*', 0)) > 0
+
+    def respond(self, request: Request, cache_control: Optional[str] = None) -> Response:
+        """Return 304 when the client already has this version, otherwise the (gzipped if accepted) body"""
+        gzipped = self.accepts_gzip(request)
+        headers = {
+            "ETag": self.gzip_etag if gzipped else self.etag,
+            "Cache-Control": cache_control or self.CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+            "X-Payload-Version": self.version
+        }
+        if self.not_modified(request, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        if gzipped:
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=self.gzip_body, media_type="application/json", headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
@@ -0,0 +1,98 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from pydantic import TypeAdapter, ValidationError
+from models.vfx_spec import VFXSpecCreate
+from constants import TEMPLATE_MAX_DEPTH
+
+# Templates can extend a parent template: the child's data holds only its overrides and the
+# materialized template is the deep merge of every ancestor's data, root first.
+
+# Built once: constructing the adapter compiles the VFXSpecCreate validator
+SPEC_DATA_ADAPTER = TypeAdapter(VFXSpecCreate)
+
+class TemplateValidationError(ValueError):
+    """Template data that would not produce a valid spec"""
+
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__(f"Invalid template data: {'; '.join(errors)}")
+
+def validate_template_data(data: Dict[str, Any]):
+    """Check template data against the spec creation schema, raising TemplateValidationError"""
+    try:
+        SPEC_DATA_ADAPTER.validate_python(data)
+    except ValidationError as e:
+        raise TemplateValidationError([
+            f"{'.'.join(str(part) for part in error['loc']) or 'data'}: {error['msg']}" for error in e.errors()
+        ])
+
+def deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge override into base without mutating either.
+
+    Nested objects merge key by key; lists and scalars replace the inherited value. A None in the
+    override means "not set here" and keeps the inherited value.
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        if value is None:
+            continue
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+async def resolve_chain(template_id: str, load: Callable[[str], Awaitable[Optional[Dict[str, Any]]]],
+                        parent_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Load a template and its ancestors, root first.
+
+    parent_id overrides the stored parent of the first template (to validate a re-parenting before
+    it is saved). Raises ValueError on missing ancestors, cycles and overly deep chains.
+    """
+    chain, seen = [], []
+    current_id: Optional[str] = template_id
+    while current_id:
+        if current_id in seen:
+            raise ValueError(f"Template inheritance cycle: {' -> '.join(seen + [current_id])}")
+        if len(seen) >= TEMPLATE_MAX_DEPTH:
+            raise ValueError(f"Template inheritance is deeper than {TEMPLATE_MAX_DEPTH} levels")
+        template = await load(current_id)
+        if template is None:
+            if not seen:
+                return []
+            raise ValueError(f"Parent template '{current_id}' of '{seen[-1]}' not found")
+        seen.append(current_id)
+        chain.append(template)
+        current_id = parent_id if len(seen) == 1 and parent_id is not None else template.get('parentId')
+    chain.reverse()
+    return chain
+
+def materialize(chain: List[Dict[str, Any]]) -> Dict[str, Any]:
+    data: Dict[str, Any] = {}
+    for template in chain:
+        data = deep_merge(data, template.get('data') or {})
+    return data
+
+async def revalidate_templates(collection, batch_size: int = 200) -> AsyncIterator[Tuple[Dict[str, Any], List[str]]]:
+    """Re-check every stored template, reading batch_size documents per round trip.
+
+    Yields (template, errors) for each template; errors is empty when the template is valid.
+    """
+    parents: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    async def load(template_id: str) -> Optional[Dict[str, Any]]:
+        if template_id not in parents:
+            parents[template_id] = await collection.find_one({"id": template_id}, {"_id": 0})
+        return parents[template_id]
+
+    cursor = collection.find({}, {"_id": 0}).sort("createdAt", 1).batch_size(batch_size)
+    async for template in cursor:
+        errors: List[str] = []
+        try:
+            validate_template_data(template.get('data') or {})
+            if template.get('parentId'):
+                validate_template_data(materialize(await resolve_chain(template['id'], load)))
+        except TemplateValidationError as e:
+            errors = e.errors
+        except ValueError as e:
+            errors = [str(e)]
+        yield template, errors
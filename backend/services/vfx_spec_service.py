@@ -1,16 +1,84 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from models.vfx_spec import VFXSpec, VFXSpecCreate, VFXSpecUpdate, Template, TemplateCreate
+from pymongo import ASCENDING, DESCENDING, TEXT, ReturnDocument
+from models.vfx_spec import VFXSpec, VFXSpecCreate, VFXSpecUpdate, Template, TemplateCreate, TemplateUpdate
+from services import template_inheritance
+from services.cache import TTLCache, CollectionWatcher
+from constants import CACHE_CONFIG, SEARCH_TEXT_FIELDS, SEARCH_FACETS, REVISION_CONFIG
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
 class VFXSpecService:
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncIOMotorDatabase, prerender_service=None, revision_service=None):
         self.db = db
         self.collection = db.vfx_specs
         self.templates_collection = db.templates
+        # Optional PrerenderService notified after every spec write
+        self.prerender_service = prerender_service
+        # Optional RevisionService recording the history of every spec write
+        self.revision_service = revision_service
+        # Read caches of stored documents; entries are shared, so callers must not mutate them
+        self.spec_cache = TTLCache(name="specs", **CACHE_CONFIG["specs"])
+        self.template_cache = TTLCache(name="templates", **CACHE_CONFIG["templates"])
+        # Materialized templates keyed by the (id, version, updatedAt) of every template in the chain,
+        # so any ancestor edit produces a new key; entries never go stale, the TTL only bounds memory
+        self.materialized_cache = TTLCache(name="materialized_templates", **CACHE_CONFIG["templates"])
+        self._watchers = [
+            CollectionWatcher(self.collection, self._on_spec_changed, "updatedAt", CACHE_CONFIG["poll_interval"]),
+            CollectionWatcher(self.templates_collection, self._on_template_changed, "updatedAt",
+                              CACHE_CONFIG["poll_interval"])
+        ]
+
+    def start_cache_invalidation(self):
+        """Start listening for writes made by other API processes"""
+        for watcher in self._watchers:
+            watcher.start()
+
+    async def stop_cache_invalidation(self):
+        for watcher in self._watchers:
+            await watcher.stop()
+
+    def _on_spec_changed(self, spec_id: Optional[str]):
+        if spec_id:
+            self.spec_cache.invalidate(spec_id)
+        else:
+            self.spec_cache.clear()
+
+    def _on_template_changed(self, template_id: Optional[str]):
+        # Any template write changes the cached template list too
+        self.template_cache.clear()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Cache metrics plus how each collection is being watched"""
+        return {
+            "specs": self.spec_cache.stats(),
+            "templates": self.template_cache.stats(),
+            "materialized_templates": self.materialized_cache.stats(),
+            "invalidation": {watcher.collection.name: watcher.mode for watcher in self._watchers}
+        }
+
+    async def ensure_indexes(self):
+        """Create the lookup, text search and facet indexes (no-op when they already exist)"""
+        try:
+            await self.collection.create_index("id")
+            await self.collection.create_index([("createdAt", DESCENDING)])
+            await self.collection.create_index(
+                [(path, TEXT) for path in SEARCH_TEXT_FIELDS],
+                weights=SEARCH_TEXT_FIELDS,
+                name="spec_text_search"
+            )
+            # Facet filters narrow by value, results are listed newest first
+            for path in SEARCH_FACETS.values():
+                await self.collection.create_index([(path, ASCENDING), ("createdAt", DESCENDING)])
+            await self.templates_collection.create_index("id")
+            await self.templates_collection.create_index("parentId")
+            if self.revision_service:
+                await self.revision_service.ensure_indexes()
+        except Exception as e:
+            logger.error(f"Error creating indexes: {str(e)}")
+            raise
 
     async def create_spec(self, spec_data: VFXSpecCreate) -> VFXSpec:
         """Create a new VFX specification"""
@@ -30,8 +98,13 @@ class VFXSpecService:
                 }]
             
             # Insert the spec with its UUID as the id field
-            result = await self.collection.insert_one(spec.dict())
+            spec_document = spec.dict()
+            result = await self.collection.insert_one(spec_document)
             # Don't overwrite the UUID - keep the original spec.id
+            spec_document.pop('_id', None)
+            await self._record_revision(spec.id, spec.revision, None, spec_document)
+            if self.prerender_service:
+                self.prerender_service.enqueue(spec)
             return spec
         except Exception as e:
             logger.error(f"Error creating VFX spec: {str(e)}")
@@ -39,43 +112,118 @@ class VFXSpecService:
 
     async def get_spec(self, spec_id: str) -> Optional[VFXSpec]:
         """Get a VFX specification by ID"""
+        spec_data = await self.get_spec_document(spec_id)
+        return VFXSpec(**spec_data) if spec_data else None
+
+    async def get_all_specs(self, limit: int = 50) -> List[VFXSpec]:
+        """Get all VFX specifications"""
+        return [VFXSpec(**spec_data) for spec_data in await self.get_all_spec_documents(limit)]
+
+    async def get_spec_document(self, spec_id: str) -> Optional[Dict[str, Any]]:
+        """Get a VFX specification as its stored document, without model validation.
+
+        Documents are only ever written from validated VFXSpec models, so read paths that
+        just serialize the spec back to the client can trust them as-is.
+        """
+        spec_data = self.spec_cache.get(spec_id)
+        if spec_data is not None:
+            return spec_data
         try:
-            spec_data = await self.collection.find_one({"id": spec_id})
-            if spec_data:
-                spec_data['_id'] = str(spec_data['_id'])
-                return VFXSpec(**spec_data)
-            return None
+            spec_data = await self.collection.find_one({"id": spec_id}, {"_id": 0})
         except Exception as e:
             logger.error(f"Error getting VFX spec: {str(e)}")
             raise
+        if spec_data is not None:
+            self.spec_cache.set(spec_id, spec_data)
+        return spec_data
 
-    async def get_all_specs(self, limit: int = 50) -> List[VFXSpec]:
-        """Get all VFX specifications"""
+    async def get_all_spec_documents(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Get all VFX specifications as stored documents, without model validation"""
         try:
-            specs = []
-            cursor = self.collection.find().limit(limit).sort("createdAt", -1)
-            async for spec_data in cursor:
-                spec_data['_id'] = str(spec_data['_id'])
-                specs.append(VFXSpec(**spec_data))
-            return specs
+            cursor = self.collection.find({}, {"_id": 0}).limit(limit).sort("createdAt", -1)
+            return await cursor.to_list(length=limit)
         except Exception as e:
             logger.error(f"Error getting VFX specs: {str(e)}")
             raise
 
+    async def search_specs(self, query: Optional[str] = None, filters: Optional[Dict[str, List[str]]] = None,
+                           limit: int = 50, skip: int = 0) -> Dict[str, Any]:
+        """Full-text search plus facet filters; results, total and facet counts come from one aggregation.
+
+        Facet counts are disjunctive: each facet is counted with every filter except its own, so the
+        other values of a filtered facet keep the counts they would have if selected instead.
+        """
+        filter_matches = {facet: {SEARCH_FACETS[facet]: {"$in": values}}
+                          for facet, values in (filters or {}).items() if values}
+
+        def match_except(excluded: Optional[str] = None) -> List[Dict[str, Any]]:
+            conditions = [condition for facet, condition in filter_matches.items() if facet != excluded]
+            return [{"$match": {"$and": conditions}}] if conditions else []
+
+        if query:
+            ranked = [{"$sort": {"score": {"$meta": "textScore"}, "createdAt": -1}}]
+        else:
+            ranked = [{"$sort": {"createdAt": -1}}]
+
+        facets: Dict[str, List[Dict[str, Any]]] = {}
+        for facet, path in SEARCH_FACETS.items():
+            facets[facet] = match_except(facet) + [
+                {"$project": {"value": f"${path}"}},
+                {"$unwind": "$value"},
+                {"$match": {"value": {"$nin": [None, ""]}}},
+                # Array paths (camera fields) count each spec once per distinct value
+                {"$group": {"_id": {"spec": "$_id", "value": "$value"}}},
+                {"$group": {"_id": "$_id.value", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}},
+                {"$project": {"_id": 0, "value": "$_id", "count": 1}}
+            ]
+
+        # Facet filters are applied per branch; the text search narrows every branch and must come first
+        pipeline = [
+            {"$match": {"$text": {"$search": query}} if query else {}},
+            {"$facet": {
+                "results": match_except() + ranked + [{"$skip": skip}, {"$limit": limit}, {"$project": {"_id": 0}}],
+                "total": match_except() + [{"$count": "count"}],
+                **facets
+            }}
+        ]
+        try:
+            result = (await self.collection.aggregate(pipeline).to_list(length=1))[0]
+        except Exception as e:
+            logger.error(f"Error searching VFX specs: {str(e)}")
+            raise
+
+        total = result.pop("total")
+        return {
+            "results": result.pop("results"),
+            "total": total[0]["count"] if total else 0,
+            "facets": result
+        }
+
     async def update_spec(self, spec_id: str, spec_data: VFXSpecUpdate) -> Optional[VFXSpec]:
         """Update a VFX specification"""
         try:
             update_data = spec_data.dict(exclude_unset=True)
             update_data['updatedAt'] = datetime.utcnow()
             
-            result = await self.collection.update_one(
+            # The pre-update document plus the $set fields is the new version, no re-read needed;
+            # the revision counter is bumped by the same write, so its number is the version's own
+            before = await self.collection.find_one_and_update(
                 {"id": spec_id},
-                {"$set": update_data}
+                {"$set": update_data, "$inc": {"revision": 1}},
+                projection={"_id": 0},
+                return_document=ReturnDocument.BEFORE
             )
+            self.spec_cache.invalidate(spec_id)
             
-            if result.modified_count > 0:
-                return await self.get_spec(spec_id)
-            return None
+            if before is None:
+                return None
+            after = {**before, **update_data, "revision": before.get("revision", 0) + 1}
+            await self._record_revision(spec_id, after["revision"], before, after)
+            spec = VFXSpec(**after)
+            if self.prerender_service:
+                self.prerender_service.enqueue(spec)
+            return spec
         except Exception as e:
             logger.error(f"Error updating VFX spec: {str(e)}")
             raise
@@ -84,16 +232,47 @@ class VFXSpecService:
         """Delete a VFX specification"""
         try:
             result = await self.collection.delete_one({"id": spec_id})
+            self.spec_cache.invalidate(spec_id)
+            if result.deleted_count and self.revision_service and not REVISION_CONFIG["keep_after_delete"]:
+                await self.revision_service.purge(spec_id)
+            if result.deleted_count and self.prerender_service:
+                await self._discard_artifacts(spec_id)
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting VFX spec: {str(e)}")
             raise
 
+    async def _discard_artifacts(self, spec_id: str):
+        # Like revisions: the spec is gone either way, a leftover artifact is logged rather than failing the request
+        try:
+            await self.prerender_service.discard(spec_id)
+        except Exception as e:
+            logger.error(f"Error deleting pre-rendered exports of VFX spec {spec_id}: {str(e)}")
+
+    async def _record_revision(self, spec_id: str, revision: int, before: Optional[Dict[str, Any]],
+                               after: Dict[str, Any]):
+        # The spec write already succeeded; a history failure is logged rather than failing the request
+        if not self.revision_service:
+            return
+        try:
+            await self.revision_service.record(spec_id, revision, before, after)
+        except Exception as e:
+            logger.error(f"Error recording revision for VFX spec {spec_id}: {str(e)}")
+
     async def create_template(self, template_data: TemplateCreate) -> Template:
         """Create a new template"""
+        template_inheritance.validate_template_data(template_data.data)
+        if template_data.parentId:
+            parents = await template_inheritance.resolve_chain(template_data.parentId, self.get_template_document)
+            if not parents:
+                raise ValueError(f"Parent template '{template_data.parentId}' not found")
+            # The overrides can be valid alone yet produce an invalid spec once merged
+            template_inheritance.validate_template_data(
+                template_inheritance.materialize(parents + [{"data": template_data.data}]))
         try:
             template = Template(**template_data.dict())
             result = await self.templates_collection.insert_one(template.dict())
+            self.template_cache.clear()
             # Don't overwrite the UUID - keep the original template.id
             return template
         except Exception as e:
@@ -102,33 +281,108 @@ class VFXSpecService:
 
     async def get_templates(self) -> List[Template]:
         """Get all templates"""
-        try:
-            templates = []
-            cursor = self.templates_collection.find().sort("createdAt", -1)
-            async for template_data in cursor:
-                template_data['_id'] = str(template_data['_id'])
-                templates.append(Template(**template_data))
+        return [Template(**template_data) for template_data in await self.get_template_documents()]
+
+    async def get_template(self, template_id: str) -> Optional[Template]:
+        """Get a template by ID"""
+        template_data = await self.get_template_document(template_id)
+        return Template(**template_data) if template_data else None
+
+    async def get_template_documents(self) -> List[Dict[str, Any]]:
+        """Get all templates as stored documents, without model validation"""
+        templates = self.template_cache.get("__all__")
+        if templates is not None:
             return templates
+        try:
+            cursor = self.templates_collection.find({}, {"_id": 0}).sort("createdAt", -1)
+            templates = await cursor.to_list(length=None)
         except Exception as e:
             logger.error(f"Error getting templates: {str(e)}")
             raise
+        self.template_cache.set("__all__", templates)
+        return templates
 
-    async def get_template(self, template_id: str) -> Optional[Template]:
-        """Get a template by ID"""
+    async def get_template_document(self, template_id: str) -> Optional[Dict[str, Any]]:
+        """Get a template as its stored document, without model validation"""
+        template_data = self.template_cache.get(template_id)
+        if template_data is not None:
+            return template_data
         try:
-            template_data = await self.templates_collection.find_one({"id": template_id})
-            if template_data:
-                template_data['_id'] = str(template_data['_id'])
-                return Template(**template_data)
-            return None
+            template_data = await self.templates_collection.find_one({"id": template_id}, {"_id": 0})
         except Exception as e:
             logger.error(f"Error getting template: {str(e)}")
             raise
+        if template_data is not None:
+            self.template_cache.set(template_id, template_data)
+        return template_data
+
+    async def update_template(self, template_id: str, template_data: TemplateUpdate) -> Optional[Template]:
+        """Update a template's name, data or parent, bumping its version"""
+        # parentId: null detaches the template; null name/data mean "unchanged"
+        update_data = {key: value for key, value in template_data.dict(exclude_unset=True).items()
+                       if value is not None or key == 'parentId'}
+        if 'data' in update_data:
+            template_inheritance.validate_template_data(update_data['data'])
+        if 'parentId' in update_data:
+            update_data['parentId'] = update_data['parentId'] or None
+        if 'parentId' in update_data or 'data' in update_data:
+            # Re-parenting must not introduce a cycle or point at a missing template, and the
+            # merged result must still be a valid spec
+            chain = await template_inheritance.resolve_chain(
+                template_id, self.get_template_document,
+                parent_id=update_data['parentId'] or '' if 'parentId' in update_data else None)
+            if chain:
+                chain[-1] = {**chain[-1], "data": update_data.get('data', chain[-1].get('data'))}
+                template_inheritance.validate_template_data(template_inheritance.materialize(chain))
+        update_data['updatedAt'] = datetime.utcnow()
+        try:
+            template_data = await self.templates_collection.find_one_and_update(
+                {"id": template_id},
+                {"$set": update_data, "$inc": {"version": 1}},
+                projection={"_id": 0},
+                return_document=ReturnDocument.AFTER
+            )
+            self.template_cache.clear()
+            return Template(**template_data) if template_data else None
+        except Exception as e:
+            logger.error(f"Error updating template: {str(e)}")
+            raise
+
+    async def materialize_template(self, template_id: str) -> Optional[Dict[str, Any]]:
+        """Resolve a template's inheritance chain into {id, name, chain, data}"""
+        chain = await template_inheritance.resolve_chain(template_id, self.get_template_document)
+        if not chain:
+            return None
+        # Legacy templates have no version until their first edit sets it to 1: updatedAt still tells them apart
+        key = tuple((template['id'], template.get('version', 0), str(template.get('updatedAt'))) for template in chain)
+        data = self.materialized_cache.get(key)
+        if data is None:
+            data = template_inheritance.materialize(chain)
+            self.materialized_cache.set(key, data)
+        return {
+            "id": template_id,
+            "name": chain[-1]['name'],
+            "chain": [template['id'] for template in chain],
+            "data": data
+        }
+
+    async def create_spec_from_template(self, template_id: str,
+                                        overrides: Optional[Dict[str, Any]] = None) -> Optional[VFXSpec]:
+        """Instantiate a new spec from a materialized template (plus optional overrides) without a client round trip"""
+        template = await self.materialize_template(template_id)
+        if template is None:
+            return None
+        data = template_inheritance.deep_merge(template['data'], overrides or {})
+        return await self.create_spec(VFXSpecCreate(**data))
 
     async def delete_template(self, template_id: str) -> bool:
         """Delete a template"""
+        children = await self.templates_collection.count_documents({"parentId": template_id})
+        if children:
+            raise ValueError(f"Template is the parent of {children} other template(s)")
         try:
             result = await self.templates_collection.delete_one({"id": template_id})
+            self.template_cache.clear()
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting template: {str(e)}")
@@ -0,0 +1,82 @@
+from typing import Any, Dict
+import base64
+import io
+
+# Synthetic spec rendered at startup so the first real export doesn't pay for font metrics,
+# stylesheets and image codecs. It fills every section and carries a logo large enough to be
+# downsampled, so the resize and PNG/JPEG encode paths run too.
+WARMUP_SPEC_ID = "__warmup__"
+
+def _warmup_logo() -> Dict[str, Any]:
+    import PIL.Image
+
+    image = PIL.Image.new('RGBA', (1200, 600), (49, 130, 206, 255))
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return {"dataUrl": "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode(),
+            "width": image.width, "height": image.height}
+
+def synthetic_spec() -> Dict[str, Any]:
+    logo = _warmup_logo()
+    return {
+        "id": WARMUP_SPEC_ID,
+        "letterheadInfo": {
+            "userCompanyName": "Warm-up Studio",
+            "email": "warmup@example.com",
+            "address": "1 Example Street",
+            "website": "https://example.com",
+            "logo": logo
+        },
+        "projectInfo": {
+            "documentVersion": "v1.0",
+            "projectDate": "2025-01-01",
+            "projectTitle": "Warm-up",
+            "projectCodeName": "WARMUP",
+            "projectFormat": "Feature Film",
+            "client": "Client",
+            "clientLogo": logo,
+            "director": "Director",
+            "vfxSupervisor": "VFX Supervisor",
+            "vfxVendor": "Vendor",
+            "projectFrameRate": "24fps",
+            "colorScience": "ACES 1.3",
+            "additionalNotes": "Synthetic spec used to warm up the exporters."
+        },
+        "cameraFormats": [{
+            "id": 1,
+            "cameraId": "A",
+            "sourceCamera": "ARRI Alexa 35",
+            "codec": "ARRIRAW",
+            "sensorMode": "4.6K 3:2 Open Gate",
+            "lensSqueezeeFactor": "1:1",
+            "colorSpace": "LogC4/AWG4"
+        }],
+        "vfxPulls": {
+            "fileFormat": "OpenEXR",
+            "compression": "PIZ",
+            "resolution": "4096 x 2160",
+            "colorSpace": "ACES2065-1",
+            "bitDepth": "16-bit half float",
+            "frameHandles": 8,
+            "framePadding": "####",
+            "showId": "WRM",
+            "sequence": "001",
+            "shotId": "0010",
+            "version": "v001"
+        },
+        "mediaReview": {
+            "container": "QuickTime",
+            "videoCodec": "ProRes 422 HQ",
+            "resolution": "1920 x 1080",
+            "frameRate": "24fps",
+            "colorSpace": "Rec.709"
+        },
+        "vfxDeliveries": {
+            "showId": "WRM",
+            "sequence": "001",
+            "shotId": "0010",
+            "task": "comp",
+            "vendorCodeName": "WRM",
+            "version": "v001"
+        }
+    }
@@ -0,0 +1,258 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from datetime import datetime, timezone
+from pathlib import Path
+import asyncio
+import os
+import time
+import logging
+import orjson
+from constants import WATCH_CONFIG
+from services.batch_export import safe_filename
+from services.export_pool import ExportPool
+from services.export_service import ExportService
+from services.single_flight import payload_digest
+
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+logger = logging.getLogger(__name__)
+
+# Watch-folder daemon: spec JSON files dropped into a directory are rendered into an output directory.
+# Changes come from inotify when available and from periodic directory scans otherwise; either way a
+# file is only read once its size and mtime have settled for the debounce period. Every processed
+# file's content hash is kept in an index in the output directory, so restarts and touched-but-unchanged
+# files don't render again.
+
+# (mtime_ns, size) of a file, or None when it's gone
+Signature = Optional[Tuple[int, int]]
+
+def _signature(path: Path) -> Signature:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _is_spec_file(name: str) -> bool:
+    # Writers that save via a hidden temp file + rename are picked up on the rename
+    return name.endswith('.json') and not name.startswith('.')
+
+def _write_atomic(path: Path, content: bytes):
+    """Replace path atomically so readers never see a half-written file"""
+    temp = path.with_name(f".{path.name}.tmp")
+    temp.write_bytes(content)
+    os.replace(temp, path)
+
+def _write_json(path: Path, data: Any):
+    _write_atomic(path, orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+class ContentIndex:
+    """Persistent record of the spec content each watched file was last rendered from"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        try:
+            self.entries = orjson.loads(path.read_bytes()).get("files", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable watch index {path}: {str(e)}")
+
+    def is_current(self, name: str, digest: str, formats: List[str], profile: str, out_dir: Path) -> bool:
+        entry = self.entries.get(name)
+        return (entry is not None and entry["hash"] == digest and entry["formats"] == formats
+                and entry["profile"] == profile and all((out_dir / output).is_file() for output in entry["outputs"]))
+
+    def record(self, name: str, digest: str, formats: List[str], profile: str, outputs: List[str]):
+        self.entries[name] = {"hash": digest, "formats": formats, "profile": profile,
+                              "outputs": outputs, "renderedAt": _now()}
+        self.dirty = True
+
+    def dump(self) -> bytes:
+        """Serialized index; taken on the event loop, so entries can't change while it's written out"""
+        self.dirty = False
+        return orjson.dumps({"version": 1, "files": self.entries}, option=orjson.OPT_INDENT_2)
+
+    async def save(self):
+        if self.dirty:
+            await asyncio.to_thread(_write_atomic, self.path, self.dump())
+
+class WatchFolder:
+    """Renders spec JSON files that appear or change in a directory (top level only)"""
+
+    def __init__(self, export_service: ExportService, export_pool: ExportPool, watch_dir: Path, out_dir: Path,
+                 formats: Optional[List[str]] = None, profile: Optional[str] = None,
+                 debounce: float = WATCH_CONFIG["debounce_seconds"],
+                 poll_interval: float = WATCH_CONFIG["poll_interval"], use_inotify: bool = True):
+        self.formats = list(formats or WATCH_CONFIG["formats"])
+        export_service.validate_formats(self.formats)
+        self.export_service = export_service
+        self.export_pool = export_pool
+        self.watch_dir = watch_dir
+        self.out_dir = out_dir
+        self.profile = export_service.get_profile(profile)['name']
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify and inotify_simple is not None
+        self.index = ContentIndex(out_dir / WATCH_CONFIG["index_file"])
+        # File name -> (last seen signature, monotonic time it was first seen with it)
+        self._pending: Dict[str, Tuple[Signature, float]] = {}
+        self._rendering: Set[str] = set()
+        # File name -> signature it had when last processed, rendered or not; files that still match
+        # aren't even read again (indexed files only count when their outputs are still there)
+        self._seen: Dict[str, Signature] = {
+            name: tuple(entry["signature"]) for name, entry in self.index.entries.items()
+            if entry.get("signature") and all((out_dir / output).is_file() for output in entry["outputs"])}
+        self._tasks: Set[asyncio.Task] = set()
+        self._slots = asyncio.Semaphore(export_pool.max_workers)
+        self._stopped = asyncio.Event()
+        self._changed = asyncio.Event()
+        self.stats = {"rendered": 0, "unchanged": 0, "failed": 0}
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self.use_inotify else "polling"
+
+    def stop(self):
+        self._stopped.set()
+        self._changed.set()
+
+    def _mark(self, names: Iterable[str]):
+        for name in names:
+            if _is_spec_file(name):
+                self._pending.setdefault(name, (None, time.monotonic()))
+        self._changed.set()
+
+    def _scan(self) -> List[str]:
+        with os.scandir(self.watch_dir) as entries:
+            return [entry.name for entry in entries if _is_spec_file(entry.name) and entry.is_file()]
+
+    async def run(self):
+        """Watch until stop() is called; files already in the directory are checked against the index first"""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        inotify = None
+        if self.use_inotify:
+            flags = inotify_simple.flags
+            inotify = inotify_simple.INotify()
+            # Watch before the initial scan so nothing written in between is missed
+            inotify.add_watch(self.watch_dir, flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.MODIFY)
+            loop.add_reader(inotify.fileno(), lambda: self._mark(event.name for event in inotify.read(timeout=0)))
+        logger.info(f"Watching {self.watch_dir} ({self.mode}), writing {'/'.join(self.formats)} to {self.out_dir}")
+        self._mark(self._scan())
+        next_scan = time.monotonic() + self.poll_interval
+        # The index is rewritten at most every index_save_interval while files keep coming, and as soon
+        # as the folder goes idle - not once per file, which is quadratic in the size of a big drop
+        next_save = time.monotonic() + WATCH_CONFIG["index_save_interval"]
+        try:
+            while not self._stopped.is_set():
+                wait = self.debounce if self._pending else None
+                if not self.use_inotify:
+                    wait = min(wait or self.poll_interval, max(next_scan - time.monotonic(), 0))
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                if not self.use_inotify and time.monotonic() >= next_scan:
+                    self._mark(self._changed_files())
+                    next_scan = time.monotonic() + self.poll_interval
+                self._start_settled()
+                if self.index.dirty and (not self._rendering or time.monotonic() >= next_save):
+                    await self.index.save()
+                    next_save = time.monotonic() + WATCH_CONFIG["index_save_interval"]
+        finally:
+            if inotify is not None:
+                loop.remove_reader(inotify.fileno())
+                inotify.close()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            await self.index.save()
+
+    def _changed_files(self) -> List[str]:
+        """Polling: files whose size or mtime no longer match what was last rendered or seen"""
+        return [name for name in self._scan() if name not in self._pending and name not in self._rendering
+                and self._seen.get(name) != _signature(self.watch_dir / name)]
+
+    def _start_settled(self):
+        """Start rendering every pending file whose signature held still for the debounce period"""
+        now = time.monotonic()
+        for name, (seen, since) in list(self._pending.items()):
+            if name in self._rendering:
+                continue
+            current = _signature(self.watch_dir / name)
+            if current is None:
+                del self._pending[name]
+            elif current != seen:
+                self._pending[name] = (current, now)
+            elif current == self._seen.get(name):
+                del self._pending[name]
+            elif now - since >= self.debounce:
+                del self._pending[name]
+                self._rendering.add(name)
+                task = asyncio.create_task(self._process(name, current))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, name: str, signature: Signature):
+        started = time.perf_counter()
+        self._seen[name] = signature
+        status = {"source": name, "hash": None, "formats": self.formats, "profile": self.profile, "outputs": []}
+        try:
+            async with self._slots:
+                data = await asyncio.to_thread((self.watch_dir / name).read_bytes)
+                spec = orjson.loads(data)
+                digest = payload_digest(spec)
+                status["hash"] = digest
+                if self.index.is_current(name, digest, self.formats, self.profile, self.out_dir):
+                    # Touched or rewritten with the same content: keep the existing outputs and status
+                    self.index.entries[name]["signature"] = list(signature)
+                    self.index.dirty = True
+                    self.stats["unchanged"] += 1
+                    status = None
+                else:
+                    contents = await self.export_pool.render_many(self.export_service.normalize(spec),
+                                                                  self.formats, self.profile)
+                    outputs = await asyncio.to_thread(self._write_outputs, name, spec, contents)
+                    self.index.record(name, digest, self.formats, self.profile, outputs)
+                    self.index.entries[name]["signature"] = list(signature)
+                    status.update({"state": "rendered", "outputs": outputs, "error": None})
+                    self.stats["rendered"] += 1
+                    logger.info(f"Rendered {name} -> {', '.join(outputs)}")
+        except Exception as e:
+            status.update({"state": "failed", "error": str(e)})
+            self.stats["failed"] += 1
+            logger.error(f"Error rendering watched spec {name}: {str(e)}")
+        finally:
+            self._rendering.discard(name)
+            # Changed again while rendering (and the index needs saving): the next pass picks it up
+            self._changed.set()
+        if status is not None:
+            status.update({"seconds": round(time.perf_counter() - started, 3), "updatedAt": _now()})
+            await asyncio.to_thread(_write_json, self.out_dir / f"{Path(name).stem}{WATCH_CONFIG['status_suffix']}",
+                                    status)
+
+    def _write_outputs(self, name: str, spec: Dict[str, Any], contents: Dict[str, bytes]) -> List[str]:
+        outputs = []
+        for export_format, content in contents.items():
+            output = safe_filename(self.export_service.export_filename(spec, export_format))
+            if self._owner(output) not in (None, name):
+                # Another watched file already renders to this name (same project title and timestamp)
+                stem, extension = output.rsplit('.', 1)
+                output = f"{stem}_{safe_filename(Path(name).stem)}.{extension}"
+            (self.out_dir / output).write_bytes(content)
+            outputs.append(output)
+        # Outputs of an earlier version of this spec that were named differently
+        previous = self.index.entries.get(name, {}).get("outputs", [])
+        for stale in set(previous) - set(outputs):
+            (self.out_dir / stale).unlink(missing_ok=True)
+        return outputs
+
+    def _owner(self, output: str) -> Optional[str]:
+        return next((name for name, entry in self.index.entries.items() if output in entry["outputs"]), None)
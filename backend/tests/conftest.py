@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import backend modules (services, constants, ...) the way server.py does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
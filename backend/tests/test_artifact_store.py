@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta
+
+from services.artifact_store import ArtifactStore
+
+OLD = datetime(2024, 5, 1, 12, 0, 0, 250000)
+NEW = OLD + timedelta(seconds=3)
+
+def test_put_replaces_older_versions(tmp_path):
+    store = ArtifactStore(tmp_path)
+    store.put("spec", OLD, "standard", "pdf", b"old")
+    store.put("spec", NEW, "standard", "pdf", b"new")
+    assert store.get("spec", OLD, "standard", "pdf") is None
+    assert store.get("spec", NEW, "standard", "pdf") == b"new"
+
+def test_render_of_an_older_version_finishing_last_is_dropped(tmp_path):
+    store = ArtifactStore(tmp_path)
+    store.put("spec", NEW, "standard", "pdf", b"new")
+    store.put("spec", OLD, "standard", "pdf", b"old")
+    assert store.get("spec", NEW, "standard", "pdf") == b"new"
+    assert store.get("spec", OLD, "standard", "pdf") is None
+
+def test_formats_of_the_same_version_are_kept(tmp_path):
+    store = ArtifactStore(tmp_path)
+    store.put("spec", NEW, "standard", "pdf", b"pdf")
+    store.put("spec", NEW, "standard", "docx", b"docx")
+    assert store.get("spec", NEW, "standard", "pdf") == b"pdf"
+
+def test_purge_removes_the_spec_directory(tmp_path):
+    store = ArtifactStore(tmp_path)
+    store.put("spec", NEW, "standard", "pdf", b"new")
+    store.purge("spec")
+    assert not (tmp_path / "spec").exists()
@@ -0,0 +1,48 @@
+import asyncio
+import zlib
+
+import pytest
+
+from constants import COMPRESSION_CONFIG
+from middleware.compression import COMPRESSORS, CompressionMiddleware
+
+def _decompressor(encoding):
+    if encoding == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+    if encoding == "br":
+        import brotli
+        return brotli.Decompressor().process
+    import zstandard
+    return zstandard.ZstdDecompressor().decompressobj().decompress
+
+def _stream(encoding, chunks):
+    """Body messages the client receives for an NDJSON response streamed as chunks"""
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/x-ndjson")]})
+        for index, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": index < len(chunks) - 1})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    scope = {"type": "http", "path": "/api/usage/stream",
+             "headers": [(b"accept-encoding", encoding.encode())]}
+    asyncio.run(CompressionMiddleware(app, COMPRESSION_CONFIG)(scope, receive, send))
+    assert dict(sent[0]["headers"])[b"content-encoding"] == encoding.encode()
+    return sent[1:]
+
+@pytest.mark.parametrize("encoding", sorted(COMPRESSORS))
+def test_streamed_chunks_are_decodable_as_they_arrive(encoding):
+    chunks = [b'{"line": %d, "status": "rendering"}\n' % index for index in range(5)]
+    messages = _stream(encoding, chunks)
+    decompress = _decompressor(encoding)
+    # Each line can be decoded from the bytes sent so far, before the stream ends
+    for chunk, message in zip(chunks, messages):
+        assert decompress(message["body"]) == chunk
+    assert not messages[-1].get("more_body")
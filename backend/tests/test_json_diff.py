@@ -0,0 +1,61 @@
+import copy
+
+import pytest
+
+from services import json_diff
+
+V1 = {
+    "projectInfo": {"projectTitle": "My Show", "documentVersion": "1.0", "projectDate": "2024-01-01"},
+    "cameraFormats": [{"cameraId": "A", "sensorMode": "4.6K"}, {"cameraId": "B", "sensorMode": "3.2K"}],
+    "vfxPulls": {"fileFormat": "OpenEXR (.exr)", "framePadding": "####", "frameHandles": 8}
+}
+
+def _edits():
+    """Successive versions of V1: a scalar edit, an added/removed key, a grown list and a type change"""
+    v2 = copy.deepcopy(V1)
+    v2["projectInfo"]["documentVersion"] = "1.1"
+    v3 = copy.deepcopy(v2)
+    del v3["projectInfo"]["projectDate"]
+    v3["projectInfo"]["projectCodeName"] = "SHOW"
+    v4 = copy.deepcopy(v3)
+    v4["cameraFormats"].append({"cameraId": "C", "sensorMode": "8K"})
+    v5 = copy.deepcopy(v4)
+    v5["vfxPulls"]["frameHandles"] = "8"
+    v5["vfxPulls"]["colorSpace"] = None
+    return [V1, v2, v3, v4, v5]
+
+def test_diff_apply_round_trip():
+    versions = _edits()
+    for old, new in zip(versions, versions[1:]):
+        before = copy.deepcopy(old)
+        ops = json_diff.diff(old, new)
+        assert ops
+        assert json_diff.apply(old, ops) == new
+        # apply() works on a copy
+        assert old == before
+
+def test_diff_of_equal_documents_is_empty():
+    assert json_diff.diff(V1, copy.deepcopy(V1)) == []
+
+def test_diff_touches_only_changed_paths():
+    new = copy.deepcopy(V1)
+    new["cameraFormats"][1]["sensorMode"] = "4.6K"
+    assert json_diff.diff(V1, new) == [{"op": "set", "path": ["cameraFormats", 1, "sensorMode"], "value": "4.6K"}]
+
+def test_root_replacement():
+    assert json_diff.apply({"a": 1}, json_diff.diff({"a": 1}, [1, 2])) == [1, 2]
+
+def test_rebuild_from_snapshot():
+    # Stored like RevisionService does: a full snapshot, then one diff per later revision
+    versions = _edits()
+    snapshot = copy.deepcopy(versions[0])
+    history = [json_diff.diff(old, new) for old, new in zip(versions, versions[1:])]
+    for revision in range(len(versions)):
+        document = copy.deepcopy(snapshot)
+        for ops in history[:revision]:
+            document = json_diff.patch(document, ops)
+        assert document == versions[revision]
+
+def test_unknown_operation_is_rejected():
+    with pytest.raises(ValueError, match="move"):
+        json_diff.patch({"a": 1}, [{"op": "move", "path": ["a"]}])
@@ -0,0 +1,87 @@
+from constants import NAMING_CONVENTIONS, NAMING_FIELD_PATTERNS
+from services.name_conformance import ConformanceCheck, FilenameParser, group_paths
+from services.naming import NamingConvention
+
+SPEC = {"vfxPulls": {"framePadding": "####"},
+        "vfxDeliveries": {"showId": "ABC", "vendorCodeName": "VEND", "fileFormat": "OpenEXR (.exr)"}}
+NAME = "ABC_101_0010_comp_VEND_v001"
+
+def test_convention_defaults_are_valid():
+    for section, convention in NAMING_CONVENTIONS.items():
+        compiled = NamingConvention(section)
+        assert compiled.validate([convention["defaults"].get(field, '') for field in compiled.fields]) == []
+    assert "identifier" in NAMING_CONVENTIONS["vfxPulls"]["defaults"]
+
+def test_parse_fields_and_frame():
+    fields, frame, errors = FilenameParser(SPEC).parse(f"{NAME}.1001.exr")
+    assert fields == {"showId": "ABC", "episode": "101", "shotId": "0010", "task": "comp",
+                      "vendorCodeName": "VEND", "version": "v001"}
+    assert (frame, errors) == (1001, [])
+
+def test_frame_padding_checks():
+    parser = FilenameParser(SPEC)
+    assert parser.parse(f"{NAME}.0001.exr")[1:] == (1, [])
+    # Frames past the padding are written unpadded
+    assert parser.parse(f"{NAME}.10001.exr")[1:] == (10001, [])
+    assert parser.parse(f"{NAME}.101.exr")[1:] == (101, ["frame: '101' is not padded to 4 digits"])
+    assert parser.parse(f"{NAME}.01001.exr")[1:] == (1001, ["frame: '01001' is not padded to 4 digits"])
+    assert parser.parse(f"{NAME}.10a1.exr")[1:] == (None, ["frame: '10a1' is not a frame number"])
+    assert parser.parse(f"{NAME}.exr")[2] == ["frame: no frame number (expected <name>.<frame>.<ext>)"]
+
+def test_fixed_fields_and_extension():
+    _, _, errors = FilenameParser(SPEC).parse("XYZ_101_0010_comp_VEND_v001.1001.dpx")
+    assert errors == ["extension: expected 'exr', got 'dpx'", "showId: expected 'ABC', got 'XYZ'"]
+
+def test_delivery_extension_follows_the_pulls_file_format():
+    spec = {"vfxPulls": {"framePadding": "####", "fileFormat": "DPX (.dpx)"},
+            "vfxDeliveries": {"showId": "ABC", "vendorCodeName": "VEND"}}
+    parser = FilenameParser(spec)
+    assert parser.extension == "dpx"
+    assert parser.parse("ABC_101_0010_comp_VEND_v001.1001.dpx")[2] == []
+    assert parser.parse("ABC_101_0010_comp_VEND_v001.1001.exr")[2] == ["extension: expected 'dpx', got 'exr'"]
+
+def test_extension_option_overrides_the_spec():
+    parser = FilenameParser(SPEC, extension=".TIFF")
+    assert parser.parse("ABC_101_0010_comp_VEND_v001.1001.tiff")[2] == []
+
+def test_explain_fills_leftmost_optional_token_first():
+    parser = FilenameParser(SPEC)
+    # One optional token present: it is read as the sequence, like the regex would
+    assert parser.explain("ABC_101_x!_0010_comp_VEND_v001") == [
+        f"sequence: 'x!' does not match {NAMING_FIELD_PATTERNS['default']}"]
+    assert parser.explain("ABC_101_001_x!_0010_comp_VEND_v001") == [
+        f"scene: 'x!' does not match {NAMING_FIELD_PATTERNS['default']}"]
+    assert parser.explain("ABC_101_0010_comp_VEND_v1") == [
+        f"version: 'v1' does not match {NAMING_FIELD_PATTERNS['version']}"]
+
+def test_explain_wrong_number_of_parts():
+    errors = FilenameParser(SPEC).explain("ABC_101_0010")
+    assert len(errors) == 1 and errors[0].startswith("name: expected ") and errors[0].endswith("got 3 parts")
+
+def test_explain_combined_token():
+    # plate + identifier share one token (PL01); a letters-only plate keeps them apart
+    parser = FilenameParser({"vfxPulls": {"showId": "ABC"}}, "vfxPulls")
+    fields, _, errors = parser.parse("ABC_101_0010_PL01_v001.1001.exr")
+    assert (fields["plate"], fields["identifier"], errors) == ("PL", "01", [])
+    assert parser.explain("ABC_101_0010_01_v001") == [
+        f"plate+identifier: '01' does not match {NAMING_FIELD_PATTERNS['plate']} + {NAMING_FIELD_PATTERNS['default']}"]
+
+def test_gaps_with_duplicate_frames():
+    check = ConformanceCheck(FilenameParser(SPEC))
+    frames = [1001, 1002, 1002, 1003, 1005, 1005, 1008]
+    mismatches = check.check("/deliveries/0010", [f"{NAME}.{frame}.exr" for frame in frames])
+    assert mismatches == []
+    sequence, = check.sequences()
+    assert sequence == {"directory": "/deliveries/0010", "pattern": f"{NAME}.%04d.exr", "first": 1001, "last": 1008,
+                        "frames": 5, "missing": 3, "gapCount": 2, "gaps": [[1004, 1004], [1006, 1007]]}
+
+def test_reported_gaps_are_capped():
+    check = ConformanceCheck(FilenameParser(SPEC), max_reported_gaps=2)
+    check.check("", [f"{NAME}.{frame:04d}.exr" for frame in range(1, 20, 2)])
+    sequence, = check.sequences()
+    assert (sequence["gapCount"], sequence["missing"], len(sequence["gaps"])) == (9, 9, 2)
+    assert check.report()["incompleteSequences"] == 1
+
+def test_group_paths_batches_by_directory():
+    paths = ["/a/x.1.exr", "/a/x.2.exr", "/b/y.1.exr", "/a/x.3.exr", "", "/c/"]
+    assert list(group_paths(paths)) == [("/a", ["x.1.exr", "x.2.exr"]), ("/b", ["y.1.exr"]), ("/a", ["x.3.exr"])]
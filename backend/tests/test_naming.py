@@ -0,0 +1,52 @@
+import pytest
+
+from services.naming import NamingEngine, frame_padding
+
+SPEC = {"vfxPulls": {"showId": "ABC", "episode": "101", "version": "v001", "framePadding": "####",
+                     "frameHandles": "8", "fileFormat": "OpenEXR (.exr)"}}
+
+@pytest.mark.parametrize("value, expected", [
+    ("4", (4, "####")),
+    ("04", (4, "####")),
+    ("%04d", (4, "%04d")),
+    # Space padding never names a frame file: normalized to zero padding
+    ("%4d", (4, "%04d")),
+    ("####", (4, "####")),
+    ("########", (8, "########")),
+    ("8 digits", (8, "########")),
+    (" %06d ", (6, "%06d")),
+    (None, (4, "####")),
+    ("", (4, "####")),
+])
+def test_frame_padding(value, expected):
+    assert frame_padding(value) == expected
+
+@pytest.mark.parametrize("value", ["%d", "%0d", "0", "lots", "%013d"])
+def test_frame_padding_rejects_unusable_values(value):
+    with pytest.raises(ValueError):
+        frame_padding(value)
+
+def _generate(*rows):
+    return list(NamingEngine(SPEC).generate(rows))
+
+def test_generate_widens_frames_by_handles():
+    result, = _generate({"shotId": "0010", "plate": "PL", "identifier": "01", "frameIn": "1001", "frameOut": "1050"})
+    assert result["filename"] == "ABC_101_0010_PL01_v001.####.exr"
+    assert result["pattern"] == "ABC_101_0010_PL01_v001.%04d.exr"
+    assert (result["first"], result["last"], result["errors"]) == (993, 1058, [])
+
+def test_invalid_rows_get_no_filename():
+    result, = _generate({"shotId": "", "plate": "PL01"})
+    assert result["filename"] is None and result["pattern"] is None
+    assert result["errors"] == ["shotId: missing", "plate: 'PL01' does not match [A-Za-z]+"]
+
+def test_handles_below_frame_zero_blame_frame_in():
+    result, = _generate({"shotId": "0010", "plate": "PL", "frameIn": "4", "frameOut": "50"})
+    assert result["filename"] is None
+    assert result["errors"] == ["frameIn: 4 leaves no room for 8 frame handles (first frame -4)"]
+
+def test_reversed_and_oversized_ranges():
+    reversed_range, oversized = _generate({"shotId": "0010", "plate": "PL", "frameIn": "60", "frameOut": "50"},
+                                          {"shotId": "0010", "plate": "PL", "frameIn": "1001", "frameOut": "9999"})
+    assert reversed_range["errors"] == ["frames: frameIn 60 is after frameOut 50"]
+    assert oversized["errors"] == ["frames: 10007 needs more than 4 digits"]
@@ -0,0 +1,112 @@
+import struct
+
+import pytest
+
+from services.plate_scanner import PlateConformance, read_header
+
+AP0 = (0.7347, 0.2653, 0.0, 1.0, 0.0001, -0.077, 0.32168, 0.33767)
+REC709 = (0.64, 0.33, 0.30, 0.60, 0.15, 0.06, 0.3127, 0.3290)
+
+def _attribute(name, attribute_type, payload):
+    return name.encode() + b'\0' + attribute_type.encode() + b'\0' + struct.pack('<i', len(payload)) + payload
+
+def exr_header(width=4096, height=2160, compression=3, pixel_type=1, channels='ABGR', primaries=AP0, version=2):
+    """Single-part scanline OpenEXR header (no pixel data follows)"""
+    chlist = b''.join(channel.encode() + b'\0' + struct.pack('<iB3xii', pixel_type, 0, 1, 1)
+                      for channel in channels) + b'\0'
+    attributes = [
+        _attribute('channels', 'chlist', chlist),
+        _attribute('compression', 'compression', bytes([compression])),
+        _attribute('dataWindow', 'box2i', struct.pack('<4i', 0, 0, width - 1, height - 1)),
+        _attribute('lineOrder', 'lineOrder', b'\0'),
+    ]
+    if primaries:
+        attributes.append(_attribute('chromaticities', 'chromaticities', struct.pack('<8f', *primaries)))
+    return b'\x76\x2f\x31\x01' + struct.pack('<I', version) + b''.join(attributes) + b'\0'
+
+def dpx_header(width=4096, height=2160, bits=10, order='>', descriptor=50, transfer=3, colorimetric=6, encoding=0):
+    """Generic DPX file + image header in either byte order"""
+    header = bytearray(2048)
+    header[0:4] = b'SDPX' if order == '>' else b'XPDS'
+    struct.pack_into(f'{order}II', header, 772, width, height)
+    struct.pack_into('4B', header, 800, descriptor, transfer, colorimetric, bits)
+    struct.pack_into(f'{order}H', header, 806, encoding)
+    return bytes(header)
+
+def _read(tmp_path, content, name='plate.1001.exr'):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return read_header(str(path))
+
+def test_exr_header(tmp_path):
+    header = _read(tmp_path, exr_header())
+    assert header.error is None
+    assert (header.format, header.width, header.height, header.compression) == ('OpenEXR', 4096, 2160, 'ZIP')
+    assert header.channels == {channel: ('float', 16) for channel in 'ABGR'}
+    assert header.bit_depth == ('float', 16)
+    assert header.primaries == 'ACES AP0'
+
+@pytest.mark.parametrize("compression, name", [(0, 'NONE'), (3, 'ZIP'), (2, 'ZIPS'), (4, 'PIZ'), (9, 'DWAB'), (200, 'unknown (200)')])
+def test_exr_compression(tmp_path, compression, name):
+    assert _read(tmp_path, exr_header(compression=compression)).compression == name
+
+def test_exr_mixed_channels_and_custom_primaries(tmp_path):
+    primaries = (0.7, 0.3, 0.2, 0.7, 0.1, 0.05, 0.3127, 0.3290)
+    header = _read(tmp_path, exr_header(pixel_type=2, channels='RGB', primaries=primaries, version=2 | 0x200))
+    assert header.format == 'OpenEXR (tiled)'
+    assert header.channels == {'R': ('float', 32), 'G': ('float', 32), 'B': ('float', 32)}
+    assert header.primaries.startswith('custom (0.7000, 0.3000')
+    assert _read(tmp_path, exr_header(primaries=REC709)).primaries == 'Rec. 709'
+    assert _read(tmp_path, exr_header(primaries=None)).primaries is None
+
+@pytest.mark.parametrize("order", ['>', '<'])
+def test_dpx_header_in_both_byte_orders(tmp_path, order):
+    header = _read(tmp_path, dpx_header(width=3840, height=2160, bits=10, order=order), 'plate.1001.dpx')
+    assert header.error is None
+    assert (header.format, header.width, header.height, header.compression) == ('DPX', 3840, 2160, 'NONE')
+    assert header.channels == {'R': ('int', 10), 'G': ('int', 10), 'B': ('int', 10)}
+    assert (header.transfer, header.primaries) == ('Logarithmic', 'Rec. 709')
+
+def test_dpx_float_and_rle(tmp_path):
+    header = _read(tmp_path, dpx_header(bits=32, descriptor=51, encoding=1, colorimetric=1), 'plate.1001.dpx')
+    assert header.bit_depth == ('float', 32) and list(header.channels) == ['R', 'G', 'B', 'A']
+    assert header.compression == 'RLE'
+    # Printing density names no primaries
+    assert header.primaries is None
+
+@pytest.mark.parametrize("content", [
+    b'',
+    b'\x76\x2f\x31\x01',
+    b'\x76\x2f\x31\x01\x02\0\0\0channels\0chl',
+    exr_header()[:-40],
+    dpx_header()[:500],
+    b'not an image at all',
+])
+def test_truncated_or_empty_files_report_errors(tmp_path, content):
+    header = _read(tmp_path, content)
+    assert header.error
+
+def test_missing_file(tmp_path):
+    assert read_header(str(tmp_path / 'missing.exr')).error
+
+def test_conformance_against_pulls(tmp_path):
+    conformance = PlateConformance({"vfxPulls": {"fileFormat": "OpenEXR (.exr)", "resolution": "4096 x 2160",
+                                                 "compression": "ZIP16", "bitDepth": "16-bit half float",
+                                                 "colorSpace": "ACES2065-1"}})
+    assert conformance.add(_read(tmp_path, exr_header(), 'ok.1001.exr')) == []
+    issues = conformance.add(_read(tmp_path, exr_header(width=3840, compression=4), 'bad.1001.exr'))
+    assert ('resolution', '4096 x 2160', '3840 x 2160') in issues
+    assert ('compression', 'ZIP16', 'PIZ') in issues
+    assert conformance.summary()["failed"] == 1
+
+def test_report_with_relative_and_absolute_roots(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'b').mkdir()
+    conformance = PlateConformance({"vfxPulls": {}})
+    conformance.add(read_header('a/plate.1001.exr'))
+    (tmp_path / 'b' / 'plate.1001.exr').write_bytes(exr_header())
+    conformance.add(read_header(str(tmp_path / 'b' / 'plate.1001.exr')))
+    report = conformance.report()
+    assert dict(report.summary)["Location"] == str(tmp_path)
+    assert sorted(row[0] for row in report.tables[-1].rows) == ['a', 'b']
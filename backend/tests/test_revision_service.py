@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from models.vfx_spec import VFXSpecCreate, VFXSpecUpdate, ProjectInfo
+from services.revision_service import RevisionService
+from services.vfx_spec_service import VFXSpecService
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+class PausingRevisionService(RevisionService):
+    """Holds the recording of chosen revisions until released, like a slow request"""
+
+    def __init__(self, db):
+        super().__init__(db)
+        self.paused = {}
+
+    async def record(self, spec_id, revision, before, after):
+        if revision in self.paused:
+            await self.paused[revision].wait()
+        await super().record(spec_id, revision, before, after)
+
+def _services():
+    db = mongomock_motor.AsyncMongoMockClient()["vfx_test"]
+    revisions = PausingRevisionService(db)
+    return VFXSpecService(db, revision_service=revisions), revisions
+
+def _update(title):
+    return VFXSpecUpdate(projectInfo=ProjectInfo(projectTitle=title))
+
+def test_interleaved_updates_rebuild_the_stored_spec():
+    async def scenario():
+        specs, revisions = _services()
+        await revisions.ensure_indexes()
+        spec = await specs.create_spec(VFXSpecCreate(projectInfo=ProjectInfo(projectTitle="v1")))
+
+        # A writes first but records its revision only after B has written and recorded
+        revisions.paused[2] = asyncio.Event()
+        update_a = asyncio.create_task(specs.update_spec(spec.id, _update("A")))
+        await asyncio.sleep(0)
+        await specs.update_spec(spec.id, _update("B"))
+        revisions.paused[2].set()
+        await update_a
+
+        stored = await specs.collection.find_one({"id": spec.id}, {"_id": 0})
+        assert stored["revision"] == 3
+        assert stored["projectInfo"]["projectTitle"] == "B"
+        assert await revisions.get_revision(spec.id, 3) == stored
+        assert (await revisions.get_revision(spec.id, 2))["projectInfo"]["projectTitle"] == "A"
+        assert [entry["revision"] for entry in await revisions.list_revisions(spec.id)] == [3, 2, 1]
+
+    asyncio.run(scenario())
+
+def test_spec_without_history_keeps_its_pre_edit_state():
+    async def scenario():
+        specs, revisions = _services()
+        await specs.collection.insert_one({"id": "legacy", "projectInfo": {"projectTitle": "old"}})
+
+        await specs.update_spec("legacy", _update("new"))
+
+        stored = await specs.collection.find_one({"id": "legacy"}, {"_id": 0})
+        assert (await revisions.get_revision("legacy", 0))["projectInfo"]["projectTitle"] == "old"
+        assert await revisions.get_revision("legacy", 1) == stored
+
+    asyncio.run(scenario())
+
+def test_diff_without_its_base_revision_is_not_replayed():
+    async def scenario():
+        specs, revisions = _services()
+        spec = await specs.create_spec(VFXSpecCreate())
+        await specs.update_spec(spec.id, _update("lost"))
+        await specs.update_spec(spec.id, _update("kept"))
+        await revisions.collection.delete_one({"specId": spec.id, "revision": 2})
+
+        assert await revisions.get_revision(spec.id, 3) is None
+
+    asyncio.run(scenario())
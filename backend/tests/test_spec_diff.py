@@ -0,0 +1,38 @@
+from services import spec_diff
+
+CAMERA_A = {"id": "1", "cameraId": "A", "sourceCamera": "ARRI Alexa 35", "sensorMode": "4.6K"}
+CAMERA_B = {"id": "2", "cameraId": "B", "sourceCamera": "Sony Venice 2", "sensorMode": "8.6K"}
+
+def _changes(old_cameras, new_cameras):
+    return spec_diff.diff_specs({"cameraFormats": old_cameras}, {"cameraFormats": new_cameras})
+
+def test_reordered_cameras_are_unchanged():
+    assert _changes([CAMERA_A, CAMERA_B], [CAMERA_B, CAMERA_A]) == []
+
+def test_cameras_matched_by_camera_id_across_reorder():
+    edited = {**CAMERA_A, "sensorMode": "3.3K"}
+    changes = _changes([CAMERA_A, CAMERA_B], [CAMERA_B, edited])
+    assert changes == [{"section": "cameraFormats", "path": "cameraFormats[A].sensorMode",
+                        "label": "A - Sensor Mode", "change": "modified", "before": "4.6K", "after": "3.3K"}]
+
+def test_added_and_removed_cameras():
+    camera_c = {"id": "3", "cameraId": "C", "sensorMode": "6K"}
+    changes = _changes([CAMERA_A, CAMERA_B], [camera_c, CAMERA_A])
+    assert {(change["path"], change["change"]) for change in changes} == {
+        ("cameraFormats[B].cameraId", "removed"),
+        ("cameraFormats[B].sourceCamera", "removed"),
+        ("cameraFormats[B].sensorMode", "removed"),
+        ("cameraFormats[C].cameraId", "added"),
+        ("cameraFormats[C].sensorMode", "added")
+    }
+
+def test_cameras_without_ids_fall_back_to_position():
+    changes = _changes([{"sensorMode": "4.6K"}], [{"sensorMode": "6K"}])
+    assert [change["path"] for change in changes] == ["cameraFormats[#1].sensorMode"]
+
+def test_bookkeeping_fields_are_ignored():
+    a = {"id": "x", "updatedAt": "2024-01-01T00:00:00", "projectInfo": {"projectTitle": "Show"}}
+    b = {"id": "x", "updatedAt": "2024-02-01T00:00:00", "projectInfo": {"projectTitle": "Show"}}
+    assert spec_diff.diff_specs(a, b) == []
+    assert spec_diff.summarize(spec_diff.diff_specs(a, {**b, "projectInfo": {}})) == {
+        "added": 0, "removed": 1, "modified": 0}
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from services.vfx_spec_service import VFXSpecService
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+SPECS = [
+    ("a", "24", "Arri Alexa 35"),
+    ("b", "24", "Sony Venice 2"),
+    ("c", "25", "Arri Alexa 35"),
+    ("d", "24", "RED V-Raptor"),
+]
+
+def _search(**kwargs):
+    async def scenario():
+        specs = VFXSpecService(mongomock_motor.AsyncMongoMockClient()["vfx_test"])
+        for index, (spec_id, frame_rate, camera) in enumerate(SPECS):
+            await specs.collection.insert_one({"id": spec_id, "createdAt": index,
+                                               "projectInfo": {"projectFrameRate": frame_rate},
+                                               "cameraFormats": [{"sourceCamera": camera}]})
+        return await specs.search_specs(**kwargs)
+    return asyncio.run(scenario())
+
+def _counts(result, facet):
+    return {entry["value"]: entry["count"] for entry in result["facets"][facet]}
+
+def test_selected_facet_keeps_counts_of_its_other_values():
+    result = _search(filters={"sourceCamera": ["Arri Alexa 35"]})
+    assert sorted(spec["id"] for spec in result["results"]) == ["a", "c"]
+    assert result["total"] == 2
+    # Its own facet ignores the selection, so the alternatives stay on offer
+    assert _counts(result, "sourceCamera") == {"Arri Alexa 35": 2, "Sony Venice 2": 1, "RED V-Raptor": 1}
+    # Other facets are narrowed by it
+    assert _counts(result, "projectFrameRate") == {"24": 1, "25": 1}
+
+def test_facets_are_narrowed_by_every_other_filter():
+    result = _search(filters={"sourceCamera": ["Arri Alexa 35"], "projectFrameRate": ["24"]})
+    assert [spec["id"] for spec in result["results"]] == ["a"]
+    assert _counts(result, "sourceCamera") == {"Arri Alexa 35": 1, "Sony Venice 2": 1, "RED V-Raptor": 1}
+    assert _counts(result, "projectFrameRate") == {"24": 1, "25": 1}
@@ -0,0 +1,38 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Cold-import budget for the API module, in milliseconds. Measured at ~550ms on a development
+# machine (FastAPI and Motor account for most of it); override on slower CI runners.
+IMPORT_TIME_BUDGET_MS = float(os.environ.get('IMPORT_TIME_BUDGET_MS', 1000))
+
+# Export renderers are loaded on first use or by the post-startup warmup, never at import time
+LAZY_PACKAGES = ('reportlab', 'docx', 'PIL')
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+def _import_profile():
+    """Run `python -X importtime -c "import server"` and return {module: cumulative microseconds}"""
+    env = {**os.environ, 'MONGO_URL': 'mongodb://localhost:27017', 'DB_NAME': 'import_time_test'}
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import server'],
+                            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    profile = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            profile[match.group(4)] = int(match.group(2))
+    return profile
+
+def test_server_import_skips_export_renderers():
+    profile = _import_profile()
+    loaded = sorted(module for module in profile if module.split('.')[0] in LAZY_PACKAGES)
+    assert not loaded, f"Imported at startup: {', '.join(loaded)}"
+
+def test_server_import_time_within_budget():
+    cumulative_ms = _import_profile()['server'] / 1000
+    assert cumulative_ms <= IMPORT_TIME_BUDGET_MS, \
+        f"import server took {cumulative_ms:.0f}ms (budget {IMPORT_TIME_BUDGET_MS:.0f}ms)"
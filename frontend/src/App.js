@@ -157,7 +157,7 @@ const VFXSpecsForm = () => {
   const handleLoadTemplate = async (templateId) => {
     try {
       setLoading(true);
-      const template = await templatesAPI.getById(templateId);
+      const template = await templatesAPI.getMaterialized(templateId);
       if (template) {
         setFormData(template.data);
         toast({
@@ -10,6 +10,11 @@ export const vfxSpecsAPI = {
     return response.data;
   },
   
+  createFromTemplate: async (templateId, overrides) => {
+    const response = await axios.post(`${API}/vfx-specs/from-template/${templateId}`, overrides);
+    return response.data;
+  },
+  
   getAll: async () => {
     const response = await axios.get(`${API}/vfx-specs`);
     return response.data;
@@ -33,8 +38,13 @@ export const vfxSpecsAPI = {
 
 // Templates API
 export const templatesAPI = {
-  create: async (name, data) => {
-    const response = await axios.post(`${API}/templates`, { name, data });
+  create: async (name, data, parentId) => {
+    const response = await axios.post(`${API}/templates`, { name, data, parentId });
+    return response.data;
+  },
+  
+  update: async (id, changes) => {
+    const response = await axios.put(`${API}/templates/${id}`, changes);
     return response.data;
   },
   
@@ -48,22 +58,39 @@ export const templatesAPI = {
     return response.data;
   },
   
+  // Template data with every parent template merged in
+  getMaterialized: async (id) => {
+    const response = await axios.get(`${API}/templates/${id}/materialized`);
+    return response.data;
+  },
+  
   delete: async (id) => {
     const response = await axios.delete(`${API}/templates/${id}`);
     return response.data;
   }
 };
 
+// Export payloads carry base64 logos and repetitive text; gzip them when the browser can
+const compressJSON = async (data) => {
+  const json = JSON.stringify(data);
+  if (typeof CompressionStream === 'undefined') {
+    return { body: json, headers: { 'Content-Type': 'application/json' } };
+  }
+  const stream = new Blob([json]).stream().pipeThrough(new CompressionStream('gzip'));
+  const body = await new Response(stream).blob();
+  return { body, headers: { 'Content-Type': 'application/json', 'Content-Encoding': 'gzip' } };
+};
+
 // Export API
 export const exportAPI = {
-  toPDF: async (data) => {
+  toPDF: async (data, profile) => {
     try {
       console.log('Starting PDF export...');
-      const response = await axios.post(`${API}/export/pdf`, data, {
+      const payload = await compressJSON(data);
+      const response = await axios.post(`${API}/export/pdf`, payload.body, {
+        params: profile ? { profile } : undefined,
         responseType: 'blob',
-        headers: {
-          'Content-Type': 'application/json',
-        }
+        headers: payload.headers
       });
       
       console.log('PDF response received:', response.status);
@@ -98,14 +125,14 @@ export const exportAPI = {
     }
   },
   
-  toDOCX: async (data) => {
+  toDOCX: async (data, profile) => {
     try {
       console.log('Starting DOCX export...');
-      const response = await axios.post(`${API}/export/docx`, data, {
+      const payload = await compressJSON(data);
+      const response = await axios.post(`${API}/export/docx`, payload.body, {
+        params: profile ? { profile } : undefined,
         responseType: 'blob',
-        headers: {
-          'Content-Type': 'application/json',
-        }
+        headers: payload.headers
       });
       
       console.log('DOCX response received:', response.status);
@@ -140,6 +167,43 @@ export const exportAPI = {
       console.error('DOCX export error:', error);
       throw error;
     }
+  },
+  
+  toBundle: async (data, formats = ['pdf', 'docx'], profile) => {
+    try {
+      console.log('Starting bundle export...');
+      const payload = await compressJSON({ spec: data, formats, profile });
+      const response = await axios.post(`${API}/export/bundle`, payload.body, {
+        responseType: 'blob',
+        headers: payload.headers
+      });
+      
+      // Create blob and download link
+      const blob = new Blob([response.data], { type: 'application/zip' });
+      const url = window.URL.createObjectURL(blob);
+      const link = document.createElement('a');
+      link.href = url;
+      
+      // Generate filename
+      const projectTitle = data.projectInfo?.projectTitle || 'VFX_Spec';
+      const timestamp = new Date().toISOString().slice(0, 19).replace(/[:-]/g, '');
+      const filename = `${projectTitle.replace(/[^a-zA-Z0-9]/g, '_')}_${timestamp}.zip`;
+      
+      link.setAttribute('download', filename);
+      link.style.display = 'none';
+      document.body.appendChild(link);
+      link.click();
+      
+      // Cleanup
+      document.body.removeChild(link);
+      window.URL.revokeObjectURL(url);
+      
+      console.log('Bundle download completed');
+      return true;
+    } catch (error) {
+      console.error('Bundle export error:', error);
+      throw error;
+    }
   }
 };
 